@@ -1,39 +1,104 @@
 from django.contrib import admin
+from django.core.cache import cache
+from django.db.models import Max, Min
 from .models import Property, Thermostat, Calendar, Schedule, TemperatureLog, UserProfile
 
+
+class ChangelistOnlyMixin:
+    """
+    Restrict the changelist SELECT to the columns it actually renders.
+    Change and delete views keep loading the full row.
+    """
+    list_only_fields = ()
+
+    def get_queryset(self, request):
+        queryset = super().get_queryset(request)
+        match = getattr(request, 'resolver_match', None)
+        if self.list_only_fields and match and match.url_name and match.url_name.endswith('_changelist'):
+            queryset = queryset.only(*self.list_only_fields)
+        return queryset
+
+
+class TimestampMonthListFilter(admin.SimpleListFilter):
+    """
+    Month navigation for TemperatureLog without date_hierarchy's per-page
+    aggregation queries. The month range is computed once and cached.
+    """
+    title = 'month'
+    parameter_name = 'month'
+    bounds_cache_key = 'admin:temperaturelog:timestamp_bounds'
+    bounds_cache_timeout = 300
+
+    def lookups(self, request, model_admin):
+        bounds = cache.get(self.bounds_cache_key)
+        if bounds is None:
+            bounds = TemperatureLog.objects.aggregate(first=Min('timestamp'), last=Max('timestamp'))
+            cache.set(self.bounds_cache_key, bounds, self.bounds_cache_timeout)
+        if not bounds['first']:
+            return []
+
+        months = []
+        year, month = bounds['last'].year, bounds['last'].month
+        while (year, month) >= (bounds['first'].year, bounds['first'].month):
+            months.append((f"{year}-{month:02d}", f"{year}-{month:02d}"))
+            year, month = (year, month - 1) if month > 1 else (year - 1, 12)
+        return months
+
+    def queryset(self, request, queryset):
+        if not self.value():
+            return queryset
+        try:
+            year, month = (int(part) for part in self.value().split('-'))
+        except ValueError:
+            return queryset
+        return queryset.filter(timestamp__year=year, timestamp__month=month)
+
+
 # Register models with the admin site
 @admin.register(Property)
 class PropertyAdmin(admin.ModelAdmin):
     list_display = ('name', 'address', 'city', 'state', 'user')
     search_fields = ('name', 'address', 'city')
     list_filter = ('state', 'country')
+    list_select_related = ('user',)
 
 @admin.register(Thermostat)
-class ThermostatAdmin(admin.ModelAdmin):
+class ThermostatAdmin(ChangelistOnlyMixin, admin.ModelAdmin):
     list_display = ('name', 'device_id', 'type', 'property', 'is_online', 'last_temperature')
     search_fields = ('name', 'device_id')
     list_filter = ('type', 'is_online', 'property')
+    list_select_related = ('property',)
+    list_only_fields = ('name', 'device_id', 'type', 'is_online', 'last_temperature',
+                        'property__name', 'property__address', 'property__city')
 
 @admin.register(Calendar)
-class CalendarAdmin(admin.ModelAdmin):
+class CalendarAdmin(ChangelistOnlyMixin, admin.ModelAdmin):
     list_display = ('name', 'type', 'property', 'sync_frequency', 'last_synced')
     search_fields = ('name',)
     list_filter = ('type', 'sync_frequency')
+    list_select_related = ('property',)
+    list_only_fields = ('name', 'type', 'sync_frequency', 'last_synced',
+                        'property__name', 'property__address', 'property__city')
 
 @admin.register(Schedule)
-class ScheduleAdmin(admin.ModelAdmin):
+class ScheduleAdmin(ChangelistOnlyMixin, admin.ModelAdmin):
     list_display = ('name', 'type', 'thermostat', 'occupied_temp', 'unoccupied_temp', 'is_active')
     search_fields = ('name',)
     list_filter = ('type', 'is_active')
+    list_select_related = ('thermostat',)
+    list_only_fields = ('name', 'type', 'occupied_temp', 'unoccupied_temp', 'is_active',
+                        'thermostat__name', 'thermostat__type')
 
 @admin.register(TemperatureLog)
 class TemperatureLogAdmin(admin.ModelAdmin):
     list_display = ('thermostat', 'temperature', 'is_occupied', 'timestamp')
-    list_filter = ('is_occupied', 'timestamp')
-    date_hierarchy = 'timestamp'
+    list_filter = ('is_occupied', TimestampMonthListFilter)
+    list_select_related = ('thermostat',)
+    ordering = ('-timestamp',)
 
 @admin.register(UserProfile)
 class UserProfileAdmin(admin.ModelAdmin):
     list_display = ('user', 'phone', 'company', 'role')
-    search_fields = ('user__username', 'user__email', 'company')
+    search_fields = ('search_blob',)
     list_filter = ('role',)
+    list_select_related = ('user',)
@@ -4,3 +4,10 @@ from django.apps import AppConfig
 class ApiConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'api'
+
+    def ready(self):
+        from . import authentication, signals  # noqa: F401
+        from .thermostat_control_mixin import nest_settings
+
+        # Load the Nest settings up front rather than on the first request
+        nest_settings()
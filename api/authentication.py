@@ -0,0 +1,45 @@
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.settings import api_settings
+
+
+# Seconds a token's user is served from cache; the user signal handlers drop it on any change
+AUTH_USER_CACHE_TIMEOUT = 300
+
+
+def auth_user_cache_key(user_id):
+    """Cache key for the user object behind a JWT's user id claim"""
+    return f"user:{user_id}:auth"
+
+
+class CachedJWTAuthentication(JWTAuthentication):
+    """
+    JWTAuthentication that keeps each token's user in the cache, so
+    authenticated requests skip the per-request SELECT on the user table.
+    Only users that pass the usual lookup and is_active check are cached.
+    """
+
+    def get_user(self, validated_token):
+        user_id = validated_token.get(api_settings.USER_ID_CLAIM)
+        if user_id is None or api_settings.CHECK_REVOKE_TOKEN:
+            # Missing claim raises as usual; revocation is checked per token, so never cached
+            return super().get_user(validated_token)
+        
+        key = auth_user_cache_key(user_id)
+        user = cache.get(key)
+        if user is None:
+            user = super().get_user(validated_token)
+            cache.set(key, user, AUTH_USER_CACHE_TIMEOUT)
+        return user
+
+
+# Connected wherever this module is imported at startup: by the api app and by the
+# authentication app, so whichever of them a project installs keeps the cache honest
+@receiver(post_save, sender=settings.AUTH_USER_MODEL)
+@receiver(post_delete, sender=settings.AUTH_USER_MODEL)
+def invalidate_authenticated_user(sender, instance, **kwargs):
+    """Drop the cached JWT user so deactivation or deletion applies to the next request"""
+    cache.delete(auth_user_cache_key(instance.pk))
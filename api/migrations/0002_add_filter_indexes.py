@@ -0,0 +1,33 @@
+# Generated by Django 4.2.7 on 2026-10-15 22:15
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='schedule',
+            index=models.Index(fields=['thermostat', 'is_active'], name='api_schedul_thermos_077dab_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='temperaturelog',
+            index=models.Index(fields=['thermostat', '-timestamp'], name='api_tempera_thermos_9015a2_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='temperaturelog',
+            index=models.Index(fields=['is_occupied', '-timestamp'], name='api_tempera_is_occu_a6c483_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='thermostat',
+            index=models.Index(fields=['property', 'is_online'], name='api_thermos_propert_c0bd84_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='thermostat',
+            index=models.Index(fields=['type'], name='api_thermos_type_68e775_idx'),
+        ),
+    ]
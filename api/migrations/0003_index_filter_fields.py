@@ -0,0 +1,28 @@
+# Generated by Django 4.2.7 on 2026-10-15 22:18
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0002_add_filter_indexes'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='schedule',
+            name='is_active',
+            field=models.BooleanField(db_index=True, default=True),
+        ),
+        migrations.AlterField(
+            model_name='temperaturelog',
+            name='timestamp',
+            field=models.DateTimeField(auto_now_add=True, db_index=True),
+        ),
+        migrations.AlterField(
+            model_name='thermostat',
+            name='is_online',
+            field=models.BooleanField(db_index=True, default=False),
+        ),
+    ]
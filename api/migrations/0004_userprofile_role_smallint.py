@@ -0,0 +1,46 @@
+from django.db import migrations, models
+
+
+ROLE_CODES = {'manager': 1, 'owner': 2, 'tech': 3}
+
+
+def role_names_to_codes(apps, schema_editor):
+    UserProfile = apps.get_model('api', 'UserProfile')
+    for name, code in ROLE_CODES.items():
+        UserProfile.objects.filter(role=name).update(role_code=code)
+
+
+def role_codes_to_names(apps, schema_editor):
+    UserProfile = apps.get_model('api', 'UserProfile')
+    for name, code in ROLE_CODES.items():
+        UserProfile.objects.filter(role_code=code).update(role=name)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0003_index_filter_fields'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='userprofile',
+            name='role_code',
+            field=models.PositiveSmallIntegerField(default=1),
+        ),
+        migrations.RunPython(role_names_to_codes, role_codes_to_names),
+        migrations.RemoveField(
+            model_name='userprofile',
+            name='role',
+        ),
+        migrations.RenameField(
+            model_name='userprofile',
+            old_name='role_code',
+            new_name='role',
+        ),
+        migrations.AlterField(
+            model_name='userprofile',
+            name='role',
+            field=models.PositiveSmallIntegerField(choices=[(1, 'manager'), (2, 'owner'), (3, 'tech')], db_index=True, default=1),
+        ),
+    ]
@@ -0,0 +1,71 @@
+import json
+
+from django.db import migrations, models
+
+
+def _load(value, fallback):
+    try:
+        return json.loads(value)
+    except (TypeError, ValueError):
+        return fallback(value)
+
+
+def text_to_json(apps, schema_editor):
+    Thermostat = apps.get_model('api', 'Thermostat')
+    Calendar = apps.get_model('api', 'Calendar')
+    for thermostat in Thermostat.objects.exclude(api_key__isnull=True).exclude(api_key=''):
+        thermostat.api_key_json = _load(thermostat.api_key, lambda value: {'token': value})
+        thermostat.save(update_fields=['api_key_json'])
+    for calendar in Calendar.objects.exclude(credentials__isnull=True).exclude(credentials=''):
+        calendar.credentials_json = _load(calendar.credentials, lambda value: value)
+        calendar.save(update_fields=['credentials_json'])
+
+
+def json_to_text(apps, schema_editor):
+    Thermostat = apps.get_model('api', 'Thermostat')
+    Calendar = apps.get_model('api', 'Calendar')
+    for thermostat in Thermostat.objects.exclude(api_key_json__isnull=True):
+        thermostat.api_key = json.dumps(thermostat.api_key_json)
+        thermostat.save(update_fields=['api_key'])
+    for calendar in Calendar.objects.exclude(credentials_json__isnull=True):
+        calendar.credentials = json.dumps(calendar.credentials_json)
+        calendar.save(update_fields=['credentials'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0004_userprofile_role_smallint'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='thermostat',
+            name='api_key_json',
+            field=models.JSONField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='calendar',
+            name='credentials_json',
+            field=models.JSONField(blank=True, null=True),
+        ),
+        migrations.RunPython(text_to_json, json_to_text),
+        migrations.RemoveField(
+            model_name='thermostat',
+            name='api_key',
+        ),
+        migrations.RemoveField(
+            model_name='calendar',
+            name='credentials',
+        ),
+        migrations.RenameField(
+            model_name='thermostat',
+            old_name='api_key_json',
+            new_name='api_key',
+        ),
+        migrations.RenameField(
+            model_name='calendar',
+            old_name='credentials_json',
+            new_name='credentials',
+        ),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 4.2.7 on 2026-10-15 22:21
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0005_json_credentials'),
+    ]
+
+    operations = [
+        migrations.AlterModelOptions(
+            name='temperaturelog',
+            options={},
+        ),
+    ]
@@ -0,0 +1,21 @@
+# Generated by Django 4.2.7 on 2026-10-15 22:22
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0006_temperaturelog_no_default_ordering'),
+    ]
+
+    operations = [
+        migrations.AlterModelOptions(
+            name='schedule',
+            options={'base_manager_name': 'objects'},
+        ),
+        migrations.AlterModelOptions(
+            name='thermostat',
+            options={'base_manager_name': 'objects'},
+        ),
+    ]
@@ -0,0 +1,45 @@
+# Generated by Django 4.2.7 on 2026-10-15 22:23
+
+from django.db import migrations, models
+
+
+def fill_search_blob(apps, schema_editor):
+    UserProfile = apps.get_model('api', 'UserProfile')
+    for profile in UserProfile.objects.select_related('user'):
+        user = profile.user
+        profile.search_blob = f"{user.username} {user.email} {profile.company or ''}".strip()[:400]
+        profile.save(update_fields=['search_blob'])
+
+
+def create_trigram_index(apps, schema_editor):
+    # Substring search (icontains) can only use a trigram index, which is Postgres-only
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    schema_editor.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+    schema_editor.execute(
+        'CREATE INDEX IF NOT EXISTS api_userprofile_search_blob_trgm '
+        'ON api_userprofile USING gin (UPPER(search_blob) gin_trgm_ops)'
+    )
+
+
+def drop_trigram_index(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    schema_editor.execute('DROP INDEX IF EXISTS api_userprofile_search_blob_trgm')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0007_select_related_managers'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='userprofile',
+            name='search_blob',
+            field=models.CharField(blank=True, db_index=True, default='', max_length=400),
+        ),
+        migrations.RunPython(fill_search_blob, migrations.RunPython.noop),
+        migrations.RunPython(create_trigram_index, drop_trigram_index),
+    ]
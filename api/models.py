@@ -22,6 +22,13 @@ class Property(models.Model):
         verbose_name_plural = "Properties"
 
 
+class ThermostatManager(models.Manager):
+    """Always join the owning property, which nearly every caller dereferences"""
+
+    def get_queryset(self):
+        return super().get_queryset().select_related('property')
+
+
 class Thermostat(models.Model):
     """
     Thermostat model representing a physical thermostat device
@@ -36,16 +43,25 @@ class Thermostat(models.Model):
     device_id = models.CharField(max_length=255, unique=True)
     type = models.CharField(max_length=20, choices=THERMOSTAT_TYPES)
     property = models.ForeignKey(Property, on_delete=models.CASCADE, related_name='thermostats')
-    is_online = models.BooleanField(default=False)
+    is_online = models.BooleanField(default=False, db_index=True)
     last_temperature = models.FloatField(null=True, blank=True)
     last_updated = models.DateTimeField(null=True, blank=True)
-    api_key = models.CharField(max_length=255, null=True, blank=True)
+    api_key = models.JSONField(null=True, blank=True)
     ip_address = models.CharField(max_length=45, null=True, blank=True)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    objects = ThermostatManager()
+
     def __str__(self):
-        return f"{self.name} ({self.type}) - {self.property.name}"
+        return f"{self.name} ({self.type})"
+
+    class Meta:
+        base_manager_name = 'objects'
+        indexes = [
+            models.Index(fields=['property', 'is_online']),
+            models.Index(fields=['type']),
+        ]
 
 
 class Calendar(models.Model):
@@ -70,18 +86,25 @@ class Calendar(models.Model):
     url = models.URLField(null=True, blank=True)
     property = models.ForeignKey(Property, on_delete=models.CASCADE, related_name='calendars')
     sync_frequency = models.CharField(max_length=20, choices=SYNC_FREQUENCIES)
-    credentials = models.TextField(null=True, blank=True)  # Encrypted in production
+    credentials = models.JSONField(null=True, blank=True)  # Encrypted in production
     last_synced = models.DateTimeField(null=True, blank=True)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
     def __str__(self):
-        return f"{self.name} ({self.type}) - {self.property.name}"
+        return f"{self.name} ({self.type})"
 
     class Meta:
         verbose_name_plural = "Calendars"
 
 
+class ScheduleManager(models.Manager):
+    """Always join the thermostat the schedule belongs to"""
+
+    def get_queryset(self):
+        return super().get_queryset().select_related('thermostat')
+
+
 class Schedule(models.Model):
     """
     Schedule model for thermostat temperature scheduling
@@ -98,13 +121,21 @@ class Schedule(models.Model):
     occupied_temp = models.FloatField()
     unoccupied_temp = models.FloatField()
     pre_arrival_hours = models.IntegerField(null=True, blank=True)
-    is_active = models.BooleanField(default=True)
+    is_active = models.BooleanField(default=True, db_index=True)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    objects = ScheduleManager()
+
     def __str__(self):
         return f"{self.name} - {self.thermostat.name}"
 
+    class Meta:
+        base_manager_name = 'objects'
+        indexes = [
+            models.Index(fields=['thermostat', 'is_active']),
+        ]
+
 
 class TemperatureLog(models.Model):
     """
@@ -113,25 +144,60 @@ class TemperatureLog(models.Model):
     thermostat = models.ForeignKey(Thermostat, on_delete=models.CASCADE, related_name='temperature_logs')
     temperature = models.FloatField()
     is_occupied = models.BooleanField(default=False)
-    timestamp = models.DateTimeField(auto_now_add=True)
+    timestamp = models.DateTimeField(auto_now_add=True, db_index=True)
 
     def __str__(self):
         return f"{self.thermostat.name} - {self.temperature}°F at {self.timestamp}"
 
+    @classmethod
+    def bulk_log(cls, entries):
+        """
+        Insert many readings at once, e.g. one per thermostat from a polling run.
+        Each entry is a dict of field values such as
+        {'thermostat_id': 1, 'temperature': 71.5, 'is_occupied': True}.
+        """
+        objs = [cls(**entry) for entry in entries]
+        return cls.objects.bulk_create(objs, batch_size=500, ignore_conflicts=True)
+
     class Meta:
-        ordering = ['-timestamp']
+        indexes = [
+            models.Index(fields=['thermostat', '-timestamp']),
+            models.Index(fields=['is_occupied', '-timestamp']),
+        ]
 
 
 class UserProfile(models.Model):
     """
     Extended user profile for additional user information
     """
+    ROLE_CHOICES = (
+        (1, 'manager'),
+        (2, 'owner'),
+        (3, 'tech'),
+    )
+    
     user = models.OneToOneField(User, on_delete=models.CASCADE, related_name='profile')
     phone = models.CharField(max_length=20, null=True, blank=True)
     company = models.CharField(max_length=255, null=True, blank=True)
-    role = models.CharField(max_length=50, default='manager')
+    role = models.PositiveSmallIntegerField(choices=ROLE_CHOICES, default=1, db_index=True)
+    # Username, email and company in one column for admin search, kept in sync on save
+    search_blob = models.CharField(max_length=400, db_index=True, blank=True, default='')
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
     def __str__(self):
         return f"{self.user.username}'s Profile"
+
+    def build_search_blob(self):
+        return f"{self.user.username} {self.user.email} {self.company or ''}".strip()[:400]
+
+    def save(self, *args, **kwargs):
+        self.search_blob = self.build_search_blob()
+        if kwargs.get('update_fields') is not None:
+            kwargs['update_fields'] = {*kwargs['update_fields'], 'search_blob'}
+        super().save(*args, **kwargs)
+
+    @property
+    def role_name(self):
+        """Role as its string name (manager, owner, tech)"""
+        return self.get_role_display()
@@ -0,0 +1,46 @@
+import orjson
+from rest_framework.renderers import JSONRenderer
+from rest_framework.utils.encoders import JSONEncoder
+
+
+# Datetimes go through DRF's encoder so raw datetimes in Response data keep
+# DRF's formatting (trailing "Z" instead of "+00:00").
+ORJSON_OPTIONS = orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME
+
+_encoder = JSONEncoder()
+
+
+class OrjsonRenderer(JSONRenderer):
+    """JSONRenderer that encodes with orjson instead of the stdlib json module"""
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+
+        option = ORJSON_OPTIONS
+        if self.get_indent(accepted_media_type, renderer_context or {}):
+            option |= orjson.OPT_INDENT_2
+
+        return _escape_line_terminators(orjson.dumps(data, default=_encoder.default, option=option))
+
+
+def iter_json_array(batches):
+    """
+    Encode an iterable of lists as one JSON array, yielding a bytes chunk per list.
+    Used to stream large list responses without holding every row in memory.
+    """
+    yield b'['
+    first = True
+    for batch in batches:
+        if not batch:
+            continue
+        # Drop the batch's own brackets and join it onto the running array
+        body = _escape_line_terminators(orjson.dumps(batch, default=_encoder.default, option=ORJSON_OPTIONS))[1:-1]
+        yield body if first else b',' + body
+        first = False
+    yield b']'
+
+
+def _escape_line_terminators(ret):
+    # Escape the JavaScript line terminators, as JSONRenderer does
+    return ret.replace(b'\xe2\x80\xa8', b'\\u2028').replace(b'\xe2\x80\xa9', b'\\u2029')
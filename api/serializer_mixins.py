@@ -0,0 +1,29 @@
+import copy
+
+
+class CachedFieldsMixin:
+    """
+    Build a ModelSerializer's fields once per class instead of once per instance
+
+    ModelSerializer.get_fields() deep-copies the declared fields and rebuilds
+    every model field on each instantiation. With this mixin the result is
+    kept per serializer class, and each instance gets shallow copies to bind.
+    Only use it on serializers whose get_fields() does not depend on context.
+    """
+
+    _fields_cache = {}
+
+    def get_fields(self):
+        cls = type(self)
+        fields = self._fields_cache.get(cls)
+        if fields is None:
+            fields = self._fields_cache[cls] = super().get_fields()
+        return {name: _copy_field(field) for name, field in fields.items()}
+
+
+def _copy_field(field):
+    # List, dict and many-related fields bind a child field of their own,
+    # so a shallow copy would share it between instances
+    if hasattr(field, 'child') or hasattr(field, 'child_relation'):
+        return copy.deepcopy(field)
+    return copy.copy(field)
@@ -1,27 +1,85 @@
 from rest_framework import serializers
 from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.db import transaction
 from .models import Property, Thermostat, Calendar, Schedule, TemperatureLog, UserProfile
+from .serializer_mixins import CachedFieldsMixin
 
 
-class UserSerializer(serializers.ModelSerializer):
+class UserSerializer(CachedFieldsMixin, serializers.ModelSerializer):
     """Serializer for the User model"""
     class Meta:
         model = User
         fields = ('id', 'username', 'email', 'first_name', 'last_name')
-        read_only_fields = ('id',)
+        # Output only (UserViewSet is read-only, auth responses embed it)
+        read_only_fields = fields
+
+
+USER_CACHE_TIMEOUT = 300
+
+# Shared output-only instance; its fields are bound once and reused for every user
+_user_serializer = UserSerializer()
+
+
+def user_cache_key(user_id):
+    """Cache key for a user's serialized representation"""
+    return f"user:{user_id}:serialized"
+
+
+def serialize_user(user):
+    """
+    Return UserSerializer output for a user, cached by primary key.
+    Entries are invalidated by the User save/delete signal handlers.
+    """
+    key = user_cache_key(user.pk)
+    data = cache.get(key)
+    if data is None:
+        data = _user_serializer.to_representation(user)
+        cache.set(key, data, USER_CACHE_TIMEOUT)
+    return data
+
+
+PROFILE_CACHE_TIMEOUT = 60
 
 
-class UserProfileSerializer(serializers.ModelSerializer):
+def profile_cache_key(user_id):
+    """Cache key for a user's serialized UserProfile"""
+    return f"user:{user_id}:profile"
+
+
+class RoleField(serializers.ChoiceField):
+    """Expose UserProfile.role by name (manager, owner, tech) rather than its stored code"""
+    
+    def __init__(self, **kwargs):
+        super().__init__(choices=UserProfile.ROLE_CHOICES, **kwargs)
+        self.codes_by_name = {name: code for code, name in UserProfile.ROLE_CHOICES}
+    
+    def to_internal_value(self, data):
+        if isinstance(data, str) and data in self.codes_by_name:
+            return self.codes_by_name[data]
+        return super().to_internal_value(data)
+    
+    def to_representation(self, value):
+        return self.choices.get(value, value)
+
+
+class UserProfileSerializer(CachedFieldsMixin, serializers.ModelSerializer):
     """Serializer for the UserProfile model"""
-    user = UserSerializer(read_only=True)
+    role = RoleField(required=False)
+    user_id = serializers.IntegerField(read_only=True)
+    username = serializers.CharField(source='user.username', read_only=True)
+    email = serializers.CharField(source='user.email', read_only=True)
+    first_name = serializers.CharField(source='user.first_name', read_only=True)
+    last_name = serializers.CharField(source='user.last_name', read_only=True)
     
     class Meta:
         model = UserProfile
-        fields = ('id', 'user', 'phone', 'company', 'role', 'created_at', 'updated_at')
+        fields = ('id', 'user_id', 'username', 'email', 'first_name', 'last_name',
+                  'phone', 'company', 'role', 'created_at', 'updated_at')
         read_only_fields = ('id', 'created_at', 'updated_at')
 
 
-class PropertySerializer(serializers.ModelSerializer):
+class PropertySerializer(CachedFieldsMixin, serializers.ModelSerializer):
     """Serializer for the Property model"""
     user = serializers.PrimaryKeyRelatedField(read_only=True)
     
@@ -32,9 +90,18 @@ class PropertySerializer(serializers.ModelSerializer):
         read_only_fields = ('id', 'created_at', 'updated_at')
 
 
-class ThermostatSerializer(serializers.ModelSerializer):
+class ThermostatSerializer(CachedFieldsMixin, serializers.ModelSerializer):
     """Serializer for the Thermostat model"""
-    property = serializers.PrimaryKeyRelatedField(queryset=Property.objects.all())
+    property = serializers.PrimaryKeyRelatedField(
+        queryset=Property.objects.all(),
+        style={'base_template': 'input.html'}
+    )
+    
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        request = self.context.get('request')
+        if request is not None and request.user.is_authenticated:
+            self.fields['property'].queryset = Property.objects.filter(user=request.user)
     
     class Meta:
         model = Thermostat
@@ -45,9 +112,18 @@ class ThermostatSerializer(serializers.ModelSerializer):
                            'created_at', 'updated_at')
 
 
-class CalendarSerializer(serializers.ModelSerializer):
+class CalendarSerializer(CachedFieldsMixin, serializers.ModelSerializer):
     """Serializer for the Calendar model"""
-    property = serializers.PrimaryKeyRelatedField(queryset=Property.objects.all())
+    property = serializers.PrimaryKeyRelatedField(
+        queryset=Property.objects.all(),
+        style={'base_template': 'input.html'}
+    )
+    
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        request = self.context.get('request')
+        if request is not None and request.user.is_authenticated:
+            self.fields['property'].queryset = Property.objects.filter(user=request.user)
     
     class Meta:
         model = Calendar
@@ -56,9 +132,18 @@ class CalendarSerializer(serializers.ModelSerializer):
         read_only_fields = ('id', 'last_synced', 'created_at', 'updated_at')
 
 
-class ScheduleSerializer(serializers.ModelSerializer):
+class ScheduleSerializer(CachedFieldsMixin, serializers.ModelSerializer):
     """Serializer for the Schedule model"""
-    thermostat = serializers.PrimaryKeyRelatedField(queryset=Thermostat.objects.all())
+    thermostat = serializers.PrimaryKeyRelatedField(
+        queryset=Thermostat.objects.all(),
+        style={'base_template': 'input.html'}
+    )
+    
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        request = self.context.get('request')
+        if request is not None and request.user.is_authenticated:
+            self.fields['thermostat'].queryset = Thermostat.objects.filter(property__user=request.user)
     
     class Meta:
         model = Schedule
@@ -68,17 +153,18 @@ class ScheduleSerializer(serializers.ModelSerializer):
         read_only_fields = ('id', 'created_at', 'updated_at')
 
 
-class TemperatureLogSerializer(serializers.ModelSerializer):
+class TemperatureLogSerializer(CachedFieldsMixin, serializers.ModelSerializer):
     """Serializer for the TemperatureLog model"""
     thermostat = serializers.PrimaryKeyRelatedField(read_only=True)
     
     class Meta:
         model = TemperatureLog
         fields = ('id', 'thermostat', 'temperature', 'is_occupied', 'timestamp')
-        read_only_fields = ('id', 'timestamp')
+        # Output only; logs are written by the polling code, not through the API
+        read_only_fields = fields
 
 
-class UserRegistrationSerializer(serializers.ModelSerializer):
+class UserRegistrationSerializer(CachedFieldsMixin, serializers.ModelSerializer):
     """Serializer for user registration"""
     password = serializers.CharField(write_only=True)
     first_name = serializers.CharField(required=True)
@@ -90,6 +176,7 @@ class UserRegistrationSerializer(serializers.ModelSerializer):
         fields = ('id', 'username', 'password', 'email', 'first_name', 'last_name')
         read_only_fields = ('id',)
     
+    @transaction.atomic
     def create(self, validated_data):
         user = User.objects.create_user(
             username=validated_data['username'],
@@ -98,10 +185,7 @@ class UserRegistrationSerializer(serializers.ModelSerializer):
             first_name=validated_data['first_name'],
             last_name=validated_data['last_name']
         )
-        
-        # Create user profile
-        UserProfile.objects.create(user=user)
-        
+        # The UserProfile is created by the post_save signal in signals.py
         return user
 
 
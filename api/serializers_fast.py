@@ -0,0 +1,73 @@
+"""
+Read-only serializers for list endpoints.
+
+These mirror the output of the ModelSerializers in serializers.py but are
+built on serpy, which reads attributes directly without DRF's per-field
+binding and validation machinery. Use them for GET list responses only;
+writes keep going through the regular serializers.
+"""
+import serpy
+from rest_framework import serializers
+
+
+_datetime_field = serializers.DateTimeField()
+
+
+class DateTimeField(serpy.Field):
+    """Format datetimes exactly as DRF's DateTimeField does"""
+
+    def to_value(self, value):
+        return _datetime_field.to_representation(value)
+
+
+class FastPropertySerializer(serpy.Serializer):
+    """Read-only list serializer for the Property model"""
+    id = serpy.IntField()
+    name = serpy.StrField()
+    address = serpy.StrField()
+    city = serpy.StrField()
+    state = serpy.StrField()
+    zip_code = serpy.StrField()
+    country = serpy.StrField()
+    user = serpy.IntField(attr='user_id')
+    created_at = DateTimeField()
+    updated_at = DateTimeField()
+
+
+class FastThermostatSerializer(serpy.Serializer):
+    """Read-only list serializer for the Thermostat model"""
+    id = serpy.IntField()
+    name = serpy.StrField()
+    device_id = serpy.StrField()
+    type = serpy.StrField()
+    property = serpy.IntField(attr='property_id')
+    is_online = serpy.BoolField()
+    last_temperature = serpy.FloatField(required=False)
+    last_updated = DateTimeField(required=False)
+    api_key = serpy.Field(required=False)
+    ip_address = serpy.StrField(required=False)
+    created_at = DateTimeField()
+    updated_at = DateTimeField()
+
+
+class FastCalendarSerializer(serpy.Serializer):
+    """Read-only list serializer for the Calendar model"""
+    id = serpy.IntField()
+    name = serpy.StrField()
+    type = serpy.StrField()
+    url = serpy.StrField(required=False)
+    property = serpy.IntField(attr='property_id')
+    sync_frequency = serpy.StrField()
+    credentials = serpy.Field(required=False)
+    last_synced = DateTimeField(required=False)
+    created_at = DateTimeField()
+    updated_at = DateTimeField()
+
+
+class FastTemperatureLogSerializer(serpy.Serializer):
+    """Read-only list serializer for the TemperatureLog model"""
+    id = serpy.IntField()
+    thermostat = serpy.IntField(attr='thermostat_id')
+    temperature = serpy.FloatField()
+    is_occupied = serpy.BoolField()
+    timestamp = DateTimeField()
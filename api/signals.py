@@ -0,0 +1,42 @@
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+
+from .models import UserProfile
+from .serializers import profile_cache_key, user_cache_key
+
+
+@receiver(post_save, sender=User)
+def ensure_profile(sender, instance, created, **kwargs):
+    """Give every new user a UserProfile, however the user was created"""
+    if created:
+        UserProfile.objects.get_or_create(user=instance)
+
+
+@receiver(post_save, sender=User)
+def refresh_profile_search_blob(sender, instance, created, update_fields=None, **kwargs):
+    """Keep UserProfile.search_blob in step with the user's username and email"""
+    if created:
+        return  # ensure_profile just built it
+    if update_fields is not None and not {'username', 'email'} & set(update_fields):
+        return  # e.g. the last_login update on every login
+    profile = UserProfile.objects.filter(user=instance).first()
+    if profile is not None:
+        profile.user = instance
+        profile.save(update_fields=['search_blob'])
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def invalidate_serialized_user(sender, instance, **kwargs):
+    """Drop the cached serialized user and profile whenever the User row changes"""
+    cache.delete_many([user_cache_key(instance.pk), profile_cache_key(instance.pk)])
+
+
+@receiver(post_save, sender=UserProfile)
+@receiver(post_delete, sender=UserProfile)
+def invalidate_serialized_profile(sender, instance, **kwargs):
+    """Drop the cached serialized profile whenever the UserProfile row changes"""
+    cache.delete(profile_cache_key(instance.user_id))
+
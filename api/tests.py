@@ -1,10 +1,23 @@
-from django.test import TestCase
+import json
+from datetime import timedelta
+from unittest import mock
+
+from django.test import TestCase, override_settings
 from django.urls import reverse
 from django.contrib.auth.models import User
+from django.utils import timezone
 from rest_framework.test import APIClient
 from rest_framework import status
-from .models import Property, Thermostat, Calendar, Schedule, UserProfile
+from rest_framework.pagination import PageNumberPagination
+from rest_framework_simplejwt.tokens import RefreshToken
+from .models import Property, Thermostat, Calendar, Schedule, TemperatureLog, UserProfile
+from . import views
+
+# Fast hasher so creating test users doesn't pay for production-strength hashing
+FAST_PASSWORD_HASHERS = ['django.contrib.auth.hashers.MD5PasswordHasher']
+
 
+@override_settings(PASSWORD_HASHERS=FAST_PASSWORD_HASHERS)
 class AuthenticationTests(TestCase):
     """Test authentication endpoints"""
     
@@ -39,7 +52,6 @@ class AuthenticationTests(TestCase):
             email=self.user_data['email'],
             password=self.user_data['password']
         )
-        UserProfile.objects.create(user=user)
         
         # Login
         login_data = {
@@ -60,7 +72,7 @@ class AuthenticationTests(TestCase):
             email=self.user_data['email'],
             password=self.user_data['password']
         )
-        UserProfile.objects.create(user=user, phone='1234567890', company='Test Company')
+        UserProfile.objects.filter(user=user).update(phone='1234567890', company='Test Company')
         
         # Login
         login_data = {
@@ -76,28 +88,50 @@ class AuthenticationTests(TestCase):
         self.assertEqual(response.status_code, status.HTTP_200_OK)
         self.assertEqual(response.data['phone'], '1234567890')
         self.assertEqual(response.data['company'], 'Test Company')
+    
+    def test_user_profile_created_when_missing(self):
+        """Test that a user without a profile gets one on first read"""
+        user = User.objects.create_user(
+            username=self.user_data['username'],
+            email=self.user_data['email'],
+            password=self.user_data['password']
+        )
+        UserProfile.objects.filter(user=user).delete()
+        
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {RefreshToken.for_user(user).access_token}')
+        response = self.client.get(self.profile_url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(UserProfile.objects.filter(user=user).exists())
+    
+    def test_user_profile_rejects_unhashable_role(self):
+        """Test that a role that is not a string is a validation error, not a server error"""
+        user = User.objects.create_user(
+            username=self.user_data['username'],
+            email=self.user_data['email'],
+            password=self.user_data['password']
+        )
+        
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {RefreshToken.for_user(user).access_token}')
+        response = self.client.put(self.profile_url, {'role': {'a': 1}}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn('role', response.data)
 
 
+@override_settings(PASSWORD_HASHERS=FAST_PASSWORD_HASHERS)
 class PropertyTests(TestCase):
     """Test property endpoints"""
     
-    def setUp(self):
-        self.client = APIClient()
-        self.user = User.objects.create_user(
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(
             username='testuser',
             email='test@example.com',
             password='testpassword123'
         )
-        UserProfile.objects.create(user=self.user)
-        
-        # Login
-        login_data = {
-            'username': 'testuser',
-            'password': 'testpassword123'
-        }
-        login_url = reverse('login')
-        login_response = self.client.post(login_url, login_data, format='json')
-        self.token = login_response.data['access']
+        cls.token = str(RefreshToken.for_user(cls.user).access_token)
+    
+    def setUp(self):
+        self.client = APIClient()
         self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {self.token}')
         
         # URLs
@@ -117,9 +151,9 @@ class PropertyTests(TestCase):
         """Test creating a property"""
         response = self.client.post(self.properties_url, self.property_data, format='json')
         self.assertEqual(response.status_code, status.HTTP_201_CREATED)
-        self.assertEqual(Property.objects.count(), 1)
-        self.assertEqual(Property.objects.get().name, 'Test Property')
-        self.assertEqual(Property.objects.get().user, self.user)
+        prop = Property.objects.get()
+        self.assertEqual(prop.name, 'Test Property')
+        self.assertEqual(prop.user_id, self.user.id)
         
     def test_list_properties(self):
         """Test listing properties"""
@@ -157,38 +191,33 @@ class PropertyTests(TestCase):
         self.assertEqual(response.data['results'][0]['name'], 'Test Property')
 
 
+@override_settings(PASSWORD_HASHERS=FAST_PASSWORD_HASHERS)
 class ThermostatTests(TestCase):
     """Test thermostat endpoints"""
     
-    def setUp(self):
-        self.client = APIClient()
-        self.user = User.objects.create_user(
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(
             username='testuser',
             email='test@example.com',
             password='testpassword123'
         )
-        UserProfile.objects.create(user=self.user)
-        
-        # Login
-        login_data = {
-            'username': 'testuser',
-            'password': 'testpassword123'
-        }
-        login_url = reverse('login')
-        login_response = self.client.post(login_url, login_data, format='json')
-        self.token = login_response.data['access']
-        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {self.token}')
+        cls.token = str(RefreshToken.for_user(cls.user).access_token)
         
         # Create a property
-        self.property = Property.objects.create(
+        cls.property = Property.objects.create(
             name='Test Property',
             address='123 Test St',
             city='Test City',
             state='TS',
             zip_code='12345',
             country='Test Country',
-            user=self.user
+            user=cls.user
         )
+    
+    def setUp(self):
+        self.client = APIClient()
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {self.token}')
         
         # URLs
         self.thermostats_url = reverse('thermostat-list')
@@ -205,6 +234,73 @@ class ThermostatTests(TestCase):
         """Test creating a thermostat"""
         response = self.client.post(self.thermostats_url, self.thermostat_data, format='json')
         self.assertEqual(response.status_code, status.HTTP_201_CREATED)
-        self.assertEqual(Thermostat.objects.count(), 1)
-        self.assertEqual(Thermostat.objects.get().name, 'Test Thermostat')
-        self.assertEqual(Thermostat.objects.get().property, self.property)
+        thermostat = Thermostat.objects.get()
+        self.assertEqual(thermostat.name, 'Test Thermostat')
+        self.assertEqual(thermostat.property_id, self.property.id)
+
+
+class SmallPagePagination(PageNumberPagination):
+    page_size = 2
+
+
+@override_settings(PASSWORD_HASHERS=FAST_PASSWORD_HASHERS)
+class TemperatureLogTests(TestCase):
+    """Test temperature log listing"""
+    
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(
+            username='testuser',
+            email='test@example.com',
+            password='testpassword123'
+        )
+        cls.token = str(RefreshToken.for_user(cls.user).access_token)
+        
+        property = Property.objects.create(
+            name='Test Property',
+            address='123 Test St',
+            city='Test City',
+            state='TS',
+            zip_code='12345',
+            country='Test Country',
+            user=cls.user
+        )
+        thermostat = Thermostat.objects.create(
+            name='Test Thermostat', device_id='test123', type='NEST', property=property
+        )
+        
+        # Distinct timestamps, so the newest-first order is fully determined
+        now = timezone.now()
+        for i in range(5):
+            log = TemperatureLog.objects.create(thermostat=thermostat, temperature=60 + i)
+            TemperatureLog.objects.filter(pk=log.pk).update(timestamp=now - timedelta(minutes=i))
+        cls.expected_ids = list(TemperatureLog.objects.order_by('-timestamp').values_list('id', flat=True))
+    
+    def setUp(self):
+        self.client = APIClient()
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {self.token}')
+        self.logs_url = reverse('temperaturelog-list')
+    
+    def test_list_streams_every_row_across_batches(self):
+        """Test that an unpaginated list streams a JSON array of every log, newest first"""
+        with mock.patch.object(views.TemperatureLogViewSet, 'pagination_class', None), \
+                mock.patch.object(views, 'LOG_STREAM_CHUNK_SIZE', 2):
+            response = self.client.get(self.logs_url)
+            body = b''.join(response.streaming_content)
+        
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(response.streaming)
+        self.assertEqual(response['Content-Type'], 'application/json')
+        logs = json.loads(body)
+        self.assertEqual([log['id'] for log in logs], self.expected_ids)
+        self.assertEqual(logs[0]['temperature'], 60)
+    
+    def test_list_paginated(self):
+        """Test that a configured paginator still gets a regular paginated response"""
+        with mock.patch.object(views.TemperatureLogViewSet, 'pagination_class', SmallPagePagination):
+            response = self.client.get(self.logs_url)
+        
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertFalse(response.streaming)
+        self.assertEqual(response.data['count'], 5)
+        self.assertEqual([log['id'] for log in response.data['results']], self.expected_ids[:2])
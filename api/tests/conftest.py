@@ -0,0 +1,8 @@
+import os
+
+import django
+
+# The thermostat control tests import DRF and the Django cache, which need
+# configured settings; use the project's default, as manage.py does
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'config.settings')
+django.setup()
@@ -7,7 +7,8 @@ import os
 # Add the parent directory to sys.path to import the modules
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from api.thermostat_api_extension import extend_thermostat_viewset
+from api.thermostat_control_mixin import ThermostatControlMixin
+from api.thermostat_clients.client_factory import ThermostatClientFactory
 
 class TestThermostatAPIExtension(unittest.TestCase):
     """Test cases for thermostat API extension"""
@@ -15,7 +16,7 @@ class TestThermostatAPIExtension(unittest.TestCase):
     def setUp(self):
         """Set up test fixtures"""
         # Create a mock ThermostatViewSet class
-        class MockThermostatViewSet:
+        class MockThermostatViewSet(ThermostatControlMixin):
             def get_object(self):
                 thermostat = MagicMock()
                 thermostat.type = "NEST"
@@ -26,10 +27,11 @@ class TestThermostatAPIExtension(unittest.TestCase):
                     "access_token": "test_access_token"
                 })
                 return thermostat
+            
+            def get_queryset(self):
+                return MagicMock()
         
-        # Extend the mock class with our API extension
-        self.ViewSetClass = extend_thermostat_viewset(MockThermostatViewSet)
-        self.viewset = self.ViewSetClass()
+        self.viewset = MockThermostatViewSet()
     
     @patch('api.thermostat_clients.nest_client.NestClient.authenticate')
     @patch('api.thermostat_clients.nest_client.NestClient.get_status')
@@ -114,6 +116,95 @@ class TestThermostatAPIExtension(unittest.TestCase):
         self.assertEqual(response.status_code, 200)
         self.assertTrue(response.data["success"])
     
+    @patch('api.thermostat_clients.nest_client.NestClient.authenticate')
+    @patch('api.thermostat_clients.nest_client.NestClient.get_status_many')
+    def test_bulk_status_endpoint(self, mock_get_status_many, mock_authenticate):
+        """Test the bulk_status endpoint"""
+        # Mock authentication and status
+        mock_authenticate.return_value = True
+        mock_get_status_many.side_effect = lambda device_ids: {
+            device_id: {"temperature": 72.0, "mode": "heat"} for device_id in device_ids
+        }
+        
+        # Mock the queryset the viewset filters on
+        thermostats = []
+        for pk in (1, 2):
+            thermostat = self.viewset.get_object()
+            thermostat.pk = pk
+            thermostat.device_id = f"test_device_{pk}"
+            thermostats.append(thermostat)
+        queryset = MagicMock()
+        queryset.filter.return_value = thermostats
+        self.viewset.get_queryset = MagicMock(return_value=queryset)
+        
+        # Create a mock request
+        request = MagicMock()
+        request.data = {"ids": [1, 2]}
+        
+        # Call the bulk_status endpoint
+        response = self.viewset.bulk_status(request)
+        
+        # Verify the response, that the shared account was polled once,
+        # and that both records were updated in one call
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data["1"]["temperature"], 72.0)
+        self.assertEqual(response.data["2"]["mode"], "heat")
+        mock_get_status_many.assert_called_once_with(["test_device_1", "test_device_2"])
+        queryset.model.objects.bulk_update.assert_called_once()
+    
+    @patch('api.thermostat_clients.nest_client.NestClient.authenticate')
+    def test_failed_authentication_releases_client(self, mock_authenticate):
+        """Test that a client that fails to authenticate is dropped from the pool"""
+        mock_authenticate.return_value = False
+        thermostat = self.viewset.get_object()
+        kwargs = self.viewset._get_client_kwargs(thermostat)
+        client = ThermostatClientFactory.create_client(thermostat.type, **kwargs)
+    
+        request = MagicMock()
+        request.data = {"temperature": 72.0}
+        response = self.viewset.set_temperature(request, pk=1)
+    
+        self.assertEqual(response.status_code, 401)
+        self.assertIsNot(ThermostatClientFactory.create_client(thermostat.type, **kwargs), client)
+    
+    def test_bulk_status_rejects_non_integer_ids(self):
+        """Test that bulk_status rejects ids that are not integers"""
+        request = MagicMock()
+    
+        for ids in (["1"], [1, None], [{"pk": 1}], [True]):
+            request.data = {"ids": ids}
+            response = self.viewset.bulk_status(request)
+            self.assertEqual(response.status_code, 400)
+    
+    @patch('api.thermostat_clients.nest_client.NestClient.authenticate')
+    @patch('api.thermostat_clients.nest_client.NestClient.get_status_many')
+    def test_bulk_status_unsupported_type(self, mock_get_status_many, mock_authenticate):
+        """Test that a thermostat without a client gets its own error instead of failing the batch"""
+        mock_authenticate.return_value = True
+        mock_get_status_many.side_effect = lambda device_ids: {
+            device_id: {"temperature": 72.0} for device_id in device_ids
+        }
+    
+        thermostats = []
+        for pk, thermostat_type in ((1, "NEST"), (2, "ECOBEE")):
+            thermostat = self.viewset.get_object()
+            thermostat.pk = pk
+            thermostat.type = thermostat_type
+            thermostat.device_id = f"test_device_{pk}"
+            thermostats.append(thermostat)
+        queryset = MagicMock()
+        queryset.filter.return_value = thermostats
+        self.viewset.get_queryset = MagicMock(return_value=queryset)
+    
+        request = MagicMock()
+        request.data = {"ids": [1, 2]}
+    
+        response = self.viewset.bulk_status(request)
+    
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data["1"]["temperature"], 72.0)
+        self.assertIn("Unsupported thermostat type", response.data["2"]["error"])
+    
     def test_get_client_kwargs(self):
         """Test the _get_client_kwargs method"""
         # Get client kwargs for NEST
@@ -1,6 +1,7 @@
 import unittest
-from unittest.mock import patch, MagicMock
+from unittest.mock import patch
 import json
+import responses
 import sys
 import os
 
@@ -34,18 +35,15 @@ class TestThermostatClients(unittest.TestCase):
         with self.assertRaises(ValueError):
             ThermostatClientFactory.create_client("INVALID")
     
-    @patch('api.thermostat_clients.nest_client.requests.post')
-    def test_nest_authentication(self, mock_post):
+    @responses.activate
+    def test_nest_authentication(self):
         """Test Nest client authentication"""
         # Mock the OAuth token response
-        mock_response = MagicMock()
-        mock_response.status_code = 200
-        mock_response.json.return_value = {
+        responses.add(responses.POST, "https://oauth2.googleapis.com/token", json={
             "access_token": "test_access_token",
             "refresh_token": "test_refresh_token",
             "expires_in": 3600
-        }
-        mock_post.return_value = mock_response
+        })
         
         # Create client and test authentication
         client = NestClient(
@@ -66,17 +64,32 @@ class TestThermostatClients(unittest.TestCase):
         self.assertTrue(result)
         self.assertEqual(client.access_token, "test_access_token")
     
-    @patch('api.thermostat_clients.cielo_client.requests.post')
-    def test_cielo_authentication(self, mock_post):
+    @responses.activate
+    def test_nest_token_shared_between_clients(self):
+        """Test that Nest clients for the same account share a refreshed token"""
+        # Mock the OAuth token response
+        responses.add(responses.POST, "https://oauth2.googleapis.com/token", json={
+            "access_token": "shared_access_token",
+            "expires_in": 3600
+        })
+
+        # Two separate clients with the same credentials
+        first = NestClient(client_id="shared_client_id", refresh_token="shared_refresh_token")
+        second = NestClient(client_id="shared_client_id", refresh_token="shared_refresh_token")
+
+        self.assertTrue(first.authenticate())
+        self.assertTrue(second.authenticate())
+        self.assertEqual(second.access_token, "shared_access_token")
+        self.assertEqual(len(responses.calls), 1)
+
+    @responses.activate
+    def test_cielo_authentication(self):
         """Test Cielo client authentication"""
         # Mock the authentication response
-        mock_response = MagicMock()
-        mock_response.status_code = 200
-        mock_response.json.return_value = {
+        responses.add(responses.POST, "https://api.cielowigle.com/v1/auth", json={
             "token": "test_token",
             "expires_in": 86400
-        }
-        mock_post.return_value = mock_response
+        })
         
         # Create client and test authentication
         client = CieloClient(
@@ -88,17 +101,14 @@ class TestThermostatClients(unittest.TestCase):
         self.assertTrue(result)
         self.assertEqual(client.token, "test_token")
     
-    @patch('api.thermostat_clients.pioneer_client.requests.post')
-    def test_pioneer_authentication(self, mock_post):
+    @responses.activate
+    def test_pioneer_authentication(self):
         """Test Pioneer client authentication"""
         # Mock the authentication response
-        mock_response = MagicMock()
-        mock_response.status_code = 200
-        mock_response.json.return_value = {
+        responses.add(responses.POST, "https://api.pioneerminisplit.com/api/auth", json={
             "token": "test_token",
             "expires_in": 86400
-        }
-        mock_post.return_value = mock_response
+        })
         
         # Create client and test authentication
         client = PioneerClient(
@@ -116,17 +126,15 @@ class TestThermostatClients(unittest.TestCase):
         self.assertTrue(result)
         self.assertEqual(client.token, "test_device_key")
     
-    @patch('api.thermostat_clients.nest_client.requests.get')
+    @responses.activate
     @patch('api.thermostat_clients.nest_client.NestClient.authenticate')
-    def test_nest_get_status(self, mock_auth, mock_get):
+    def test_nest_get_status(self, mock_auth):
         """Test Nest client get_status method"""
         # Mock authentication
         mock_auth.return_value = True
         
         # Mock the status response
-        mock_response = MagicMock()
-        mock_response.status_code = 200
-        mock_response.json.return_value = {
+        responses.add(responses.GET, "https://smartdevicemanagement.googleapis.com/v1/enterprises/test_project_id/devices/test_device_id", json={
             "traits": {
                 "sdm.devices.traits.Temperature": {
                     "ambientTemperatureCelsius": 22.0
@@ -144,8 +152,7 @@ class TestThermostatClients(unittest.TestCase):
                     "ambientHumidityPercent": 45
                 }
             }
-        }
-        mock_get.return_value = mock_response
+        })
         
         # Create client and test get_status
         client = NestClient(
@@ -166,25 +173,93 @@ class TestThermostatClients(unittest.TestCase):
         # Test temperature conversion (22°C should be about 71.6°F)
         self.assertAlmostEqual(status["temperature"], 71.6, delta=0.1)
     
-    @patch('api.thermostat_clients.cielo_client.requests.get')
+    @responses.activate
+    @patch('api.thermostat_clients.nest_client.NestClient.authenticate')
+    def test_nest_get_status_many(self, mock_auth):
+        """Test Nest client get_status_many method"""
+        # Mock authentication
+        mock_auth.return_value = True
+        
+        # Mock the devices.list response
+        responses.add(responses.GET, "https://smartdevicemanagement.googleapis.com/v1/enterprises/test_project_id/devices", json={
+            "devices": [
+                {
+                    "name": "enterprises/test_project_id/devices/device_1",
+                    "traits": {"sdm.devices.traits.Temperature": {"ambientTemperatureCelsius": 22.0}}
+                },
+                {
+                    "name": "enterprises/test_project_id/devices/other_device",
+                    "traits": {}
+                }
+            ]
+        })
+        
+        # Create client and test get_status_many
+        client = NestClient(project_id="test_project_id", access_token="test_access_token")
+        
+        statuses = client.get_status_many(["device_1", "device_2"])
+        self.assertEqual(len(responses.calls), 1)
+        self.assertAlmostEqual(statuses["device_1"]["temperature"], 71.6, delta=0.1)
+        self.assertIsNone(statuses["device_2"])
+        self.assertNotIn("other_device", statuses)
+        
+        # A single-device read right after is served from the same devices.list call
+        status = client.get_status("device_1")
+        self.assertAlmostEqual(status["temperature"], 71.6, delta=0.1)
+        self.assertEqual(len(responses.calls), 1)
+        
+        # Each read gets its own copy of the snapshot entry
+        status["temperature"] = None
+        self.assertAlmostEqual(client.get_status("device_1")["temperature"], 71.6, delta=0.1)
+    
+    @responses.activate
+    @patch('api.thermostat_clients.nest_client.NestClient.authenticate')
+    def test_nest_set_temperature_keeps_known_mode(self, mock_auth):
+        """Test Nest client set_temperature reuses the mode from a devices.list call"""
+        # Mock authentication
+        mock_auth.return_value = True
+        
+        # Mock the devices.list and set_temperature responses
+        responses.add(responses.GET, "https://smartdevicemanagement.googleapis.com/v1/enterprises/test_project_id/devices", json={
+            "devices": [
+                {
+                    "name": "enterprises/test_project_id/devices/device_1",
+                    "traits": {"sdm.devices.traits.ThermostatMode": {"mode": "COOL"}}
+                }
+            ]
+        })
+        responses.add(
+            responses.POST,
+            "https://smartdevicemanagement.googleapis.com/v1/enterprises/test_project_id/devices/device_1:executeCommand"
+        )
+        
+        # Create client and set the temperature twice after one devices.list call
+        client = NestClient(project_id="test_project_id", access_token="test_access_token")
+        client.get_all_statuses()
+        self.assertTrue(client.set_temperature("device_1", 72.0))
+        self.assertTrue(client.set_temperature("device_1", 70.0))
+        
+        # No single-device status reads; both commands use the listed mode
+        self.assertEqual([call.request.method for call in responses.calls], ["GET", "POST", "POST"])
+        for call in responses.calls[1:]:
+            self.assertEqual(json.loads(call.request.body)["command"], "sdm.devices.commands.ThermostatTemperatureSetpoint.SetCool")
+    
+    @responses.activate
     @patch('api.thermostat_clients.cielo_client.CieloClient.authenticate')
-    def test_cielo_get_status(self, mock_auth, mock_get):
+    def test_cielo_get_status(self, mock_auth):
         """Test Cielo client get_status method"""
         # Mock authentication
         mock_auth.return_value = True
         
         # Mock the status response
-        mock_response = MagicMock()
-        mock_response.status_code = 200
-        mock_response.json.return_value = {
+        responses.add(responses.GET, "https://api.cielowigle.com/v1/devices/test_device_id", json={
             "current_temperature": 72.0,
             "target_temperature": 74.0,
             "mode": "heat",
             "fan_mode": "auto",
             "is_online": True,
             "humidity": 40
-        }
-        mock_get.return_value = mock_response
+        })
         
         # Create client and test get_status
         client = CieloClient(token="test_token")
@@ -198,25 +273,22 @@ class TestThermostatClients(unittest.TestCase):
         self.assertTrue(status["is_online"])
         self.assertEqual(status["humidity"], 40)
     
-    @patch('api.thermostat_clients.pioneer_client.requests.get')
+    @responses.activate
     @patch('api.thermostat_clients.pioneer_client.PioneerClient.authenticate')
-    def test_pioneer_get_status(self, mock_auth, mock_get):
+    def test_pioneer_get_status(self, mock_auth):
         """Test Pioneer client get_status method"""
         # Mock authentication
         mock_auth.return_value = True
         
         # Mock the status response
-        mock_response = MagicMock()
-        mock_response.status_code = 200
-        mock_response.json.return_value = {
+        responses.add(responses.GET, "https://api.pioneerminisplit.com/api/devices/test_device_id/status", json={
             "current_temperature": 70.0,
             "target_temperature": 72.0,
             "mode": "heat",
             "fan_mode": "auto",
             "is_online": True,
             "humidity": 35
-        }
-        mock_get.return_value = mock_response
+        })
         
         # Create client and test get_status
         client = PioneerClient(device_key="test_device_key")
@@ -230,19 +302,20 @@ class TestThermostatClients(unittest.TestCase):
         self.assertTrue(status["is_online"])
         self.assertEqual(status["humidity"], 35)
     
-    @patch('api.thermostat_clients.nest_client.requests.post')
+    @responses.activate
     @patch('api.thermostat_clients.nest_client.NestClient.authenticate')
     @patch('api.thermostat_clients.nest_client.NestClient.get_status')
-    def test_nest_set_temperature(self, mock_get_status, mock_auth, mock_post):
+    def test_nest_set_temperature(self, mock_get_status, mock_auth):
         """Test Nest client set_temperature method"""
         # Mock authentication and status
         mock_auth.return_value = True
         mock_get_status.return_value = {"mode": "heat"}
         
         # Mock the set_temperature response
-        mock_response = MagicMock()
-        mock_response.status_code = 200
-        mock_post.return_value = mock_response
+        responses.add(
+            responses.POST,
+            "https://smartdevicemanagement.googleapis.com/v1/enterprises/test_project_id/devices/test_device_id:executeCommand"
+        )
         
         # Create client and test set_temperature
         client = NestClient(
@@ -257,12 +330,41 @@ class TestThermostatClients(unittest.TestCase):
         self.assertTrue(result)
         
         # Verify the correct command was sent
-        args, kwargs = mock_post.call_args
-        self.assertIn("executeCommand", args[0])
-        self.assertEqual(kwargs["json"]["command"], "sdm.devices.commands.ThermostatTemperatureSetpoint.SetHeat")
+        request = responses.calls[0].request
+        self.assertIn("executeCommand", request.url)
+        payload = json.loads(request.body)
+        self.assertEqual(payload["command"], "sdm.devices.commands.ThermostatTemperatureSetpoint.SetHeat")
         
         # Test temperature conversion (72°F should be about 22.2°C)
-        self.assertAlmostEqual(kwargs["json"]["params"]["heatCelsius"], 22.2, delta=0.1)
+        self.assertAlmostEqual(payload["params"]["heatCelsius"], 22.2, delta=0.1)
+    
+    @responses.activate
+    @patch('api.thermostat_clients.nest_client.NestClient.authenticate')
+    def test_nest_set_temperature_after_status_read(self, mock_auth):
+        """Test Nest client set_temperature reuses the mode from a recent status read"""
+        # Mock authentication
+        mock_auth.return_value = True
+        
+        # Mock the status and set_temperature responses
+        responses.add(responses.GET, "https://smartdevicemanagement.googleapis.com/v1/enterprises/test_project_id/devices/test_device_id", json={
+            "traits": {"sdm.devices.traits.ThermostatMode": {"mode": "COOL"}}
+        })
+        responses.add(
+            responses.POST,
+            "https://smartdevicemanagement.googleapis.com/v1/enterprises/test_project_id/devices/test_device_id:executeCommand"
+        )
+        
+        # Create client, read the status, then test set_temperature
+        client = NestClient(project_id="test_project_id", access_token="test_access_token")
+        client.get_status("test_device_id")
+        
+        result = client.set_temperature("test_device_id", 72.0)
+        self.assertTrue(result)
+        self.assertEqual(len(responses.calls), 2)
+        
+        # Verify the command matches the mode seen in the status read
+        payload = json.loads(responses.calls[1].request.body)
+        self.assertEqual(payload["command"], "sdm.devices.commands.ThermostatTemperatureSetpoint.SetCool")
 
 if __name__ == '__main__':
     unittest.main()
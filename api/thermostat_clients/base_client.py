@@ -1,9 +1,16 @@
-from abc import ABC, abstractmethod
+import orjson
 
-class BaseThermostatClient(ABC):
-    """Abstract base class for thermostat API clients"""
+class BaseThermostatClient:
+    """
+    Base class for thermostat API clients
+    
+    A plain class rather than an ABC, so constructing a client skips the
+    abstract-method check; subclasses must override every method that
+    raises NotImplementedError.
+    """
+    
+    __slots__ = ()
     
-    @abstractmethod
     def authenticate(self):
         """
         Authenticate with the thermostat API
@@ -11,23 +18,82 @@ class BaseThermostatClient(ABC):
         Returns:
             bool: True if authentication was successful, False otherwise
         """
-        pass
+        raise NotImplementedError
     
-    @abstractmethod
-    def get_status(self, device_id):
+    def get_status(self, device_id, include_raw=False):
         """
         Get current status of the thermostat
         
         Args:
             device_id (str): Unique identifier for the thermostat device
+            include_raw (bool, optional): Include the vendor's raw response as raw_data
             
         Returns:
             dict: Status information including current temperature, target temperature,
                  mode, fan status, etc. or None if failed
         """
-        pass
+        raise NotImplementedError
+    
+    @staticmethod
+    def _parse(response):
+        """
+        Decode a vendor API response body
+        
+        Args:
+            response (requests.Response): Response from the vendor API
+            
+        Returns:
+            The decoded JSON body, or None if the body is empty
+        """
+        return orjson.loads(response.content) if response.content else None
+    
+    def _auth_headers(self, token, json_body=False):
+        """
+        Bearer auth headers for token, rebuilt only when the token changes
+        
+        Subclasses set self._header_cache = None in __init__.
+        
+        Args:
+            token (str): Current access token
+            json_body (bool, optional): Also declare a JSON request body
+            
+        Returns:
+            dict: Request headers; callers must not modify it
+        """
+        cached = self._header_cache
+        if cached is None or cached[0] != token:
+            headers = {"Authorization": f"Bearer {token}"}
+            cached = self._header_cache = (token, headers, {**headers, "Content-Type": "application/json"})
+        return cached[2] if json_body else cached[1]
+    
+    @staticmethod
+    def _encode(payload):
+        """
+        Encode a request body for a vendor API
+        
+        Args:
+            payload (dict): JSON-serializable request body
+            
+        Returns:
+            bytes: The JSON-encoded body
+        """
+        return orjson.dumps(payload)
+    
+    def get_status_many(self, device_ids):
+        """
+        Get current status of several thermostats on the same account
+        
+        Clients whose API has a batch endpoint override this; the default
+        polls one device at a time.
+        
+        Args:
+            device_ids (list): Unique identifiers for the thermostat devices
+            
+        Returns:
+            dict: Status information keyed by device id; devices that failed map to None
+        """
+        return {device_id: self.get_status(device_id) for device_id in device_ids}
     
-    @abstractmethod
     def set_temperature(self, device_id, temperature):
         """
         Set target temperature for the thermostat
@@ -39,9 +105,8 @@ class BaseThermostatClient(ABC):
         Returns:
             bool: True if successful, False otherwise
         """
-        pass
+        raise NotImplementedError
     
-    @abstractmethod
     def set_mode(self, device_id, mode):
         """
         Set thermostat mode (heat, cool, off, etc.)
@@ -53,9 +118,8 @@ class BaseThermostatClient(ABC):
         Returns:
             bool: True if successful, False otherwise
         """
-        pass
+        raise NotImplementedError
     
-    @abstractmethod
     def set_fan_mode(self, device_id, fan_mode):
         """
         Set fan mode (auto, on)
@@ -67,9 +131,8 @@ class BaseThermostatClient(ABC):
         Returns:
             bool: True if successful, False otherwise
         """
-        pass
+        raise NotImplementedError
     
-    @abstractmethod
     def get_schedule(self, device_id):
         """
         Get current schedule for the thermostat
@@ -80,9 +143,8 @@ class BaseThermostatClient(ABC):
         Returns:
             dict: Schedule information or None if not supported/failed
         """
-        pass
+        raise NotImplementedError
     
-    @abstractmethod
     def set_schedule(self, device_id, schedule):
         """
         Set schedule for the thermostat
@@ -94,4 +156,4 @@ class BaseThermostatClient(ABC):
         Returns:
             bool: True if successful, False otherwise
         """
-        pass
+        raise NotImplementedError
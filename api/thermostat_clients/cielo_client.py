@@ -1,11 +1,28 @@
-import requests
 import json
+import logging
 from datetime import datetime, timedelta
 from .base_client import BaseThermostatClient
+from .session import build_session
+
+logger = logging.getLogger(__name__)
+
+# Shared across all clients in this module so connections are reused
+_SESSION = build_session()
+
+# Endpoint templates, filled in with %-formatting per call
+_BASE_URL = "https://api.cielowigle.com/v1"  # Example URL, may need to be updated
+_URL_AUTH = _BASE_URL + "/auth"
+_URL_STATUS = _BASE_URL + "/devices/%s"
+_URL_TEMPERATURE = _BASE_URL + "/devices/%s/temperature"
+_URL_MODE = _BASE_URL + "/devices/%s/mode"
+_URL_FAN = _BASE_URL + "/devices/%s/fan"
+_URL_SCHEDULE = _BASE_URL + "/devices/%s/schedule"
 
 class CieloClient(BaseThermostatClient):
     """Client for Cielo thermostat API"""
     
+    __slots__ = ("username", "password", "token", "token_expiry", "base_url", "_header_cache")
+    
     def __init__(self, username=None, password=None, token=None):
         """
         Initialize the Cielo client
@@ -19,7 +36,8 @@ class CieloClient(BaseThermostatClient):
         self.password = password
         self.token = token
         self.token_expiry = None
-        self.base_url = "https://api.cielowigle.com/v1"  # Example URL, may need to be updated
+        self.base_url = _BASE_URL
+        self._header_cache = None  # (token, headers, JSON body headers)
     
     def authenticate(self):
         """
@@ -36,32 +54,33 @@ class CieloClient(BaseThermostatClient):
         if not self.username or not self.password:
             return False
         
-        auth_url = f"{self.base_url}/auth"
+        auth_url = _URL_AUTH
         payload = {
             "username": self.username,
             "password": self.password
         }
         
         try:
-            response = requests.post(auth_url, json=payload)
+            response = _SESSION.post(auth_url, headers={"Content-Type": "application/json"}, data=self._encode(payload))
             if response.status_code == 200:
-                auth_data = response.json()
+                auth_data = self._parse(response)
                 self.token = auth_data.get("token")
                 # Typically tokens are valid for a certain period, e.g., 24 hours
                 expires_in = auth_data.get("expires_in", 86400)  # Default to 24 hours
                 self.token_expiry = datetime.now() + timedelta(seconds=expires_in)
                 return bool(self.token)
-        except Exception as e:
-            print(f"Error authenticating with Cielo API: {str(e)}")
+        except Exception:
+            logger.exception("Error authenticating with Cielo API")
         
         return False
     
-    def get_status(self, device_id):
+    def get_status(self, device_id, include_raw=False):
         """
         Get current status of the Cielo thermostat
         
         Args:
             device_id (str): Unique identifier for the thermostat device
+            include_raw (bool, optional): Include the vendor's raw response as raw_data
             
         Returns:
             dict: Status information or None if failed
@@ -69,13 +88,13 @@ class CieloClient(BaseThermostatClient):
         if not self.authenticate():
             raise Exception("Not authenticated")
         
-        url = f"{self.base_url}/devices/{device_id}"
-        headers = {"Authorization": f"Bearer {self.token}"}
+        url = _URL_STATUS % device_id
+        headers = self._auth_headers(self.token)
         
         try:
-            response = requests.get(url, headers=headers)
+            response = _SESSION.get(url, headers=headers)
             if response.status_code == 200:
-                data = response.json()
+                data = self._parse(response)
                 
                 # Extract relevant information from the Cielo API response
                 # Note: This is based on community documentation and may need adjustment
@@ -85,13 +104,14 @@ class CieloClient(BaseThermostatClient):
                     "mode": data.get("mode", "heat").lower(),
                     "fan_mode": data.get("fan_mode", "auto").lower(),
                     "is_online": data.get("is_online", True),
-                    "humidity": data.get("humidity"),
-                    "raw_data": data  # Include raw data for debugging
+                    "humidity": data.get("humidity")
                 }
+                if include_raw:
+                    status["raw_data"] = data
                 
                 return status
-        except Exception as e:
-            print(f"Error getting Cielo thermostat status: {str(e)}")
+        except Exception:
+            logger.exception("Error getting Cielo thermostat status")
         
         return None
     
@@ -109,18 +129,15 @@ class CieloClient(BaseThermostatClient):
         if not self.authenticate():
             raise Exception("Not authenticated")
         
-        url = f"{self.base_url}/devices/{device_id}/temperature"
-        headers = {
-            "Authorization": f"Bearer {self.token}",
-            "Content-Type": "application/json"
-        }
+        url = _URL_TEMPERATURE % device_id
+        headers = self._auth_headers(self.token, json_body=True)
         payload = {"temperature": temperature}
         
         try:
-            response = requests.post(url, headers=headers, json=payload)
+            response = _SESSION.post(url, headers=headers, data=self._encode(payload))
             return response.status_code == 200
-        except Exception as e:
-            print(f"Error setting Cielo temperature: {str(e)}")
+        except Exception:
+            logger.exception("Error setting Cielo temperature")
         
         return False
     
@@ -138,18 +155,15 @@ class CieloClient(BaseThermostatClient):
         if not self.authenticate():
             raise Exception("Not authenticated")
         
-        url = f"{self.base_url}/devices/{device_id}/mode"
-        headers = {
-            "Authorization": f"Bearer {self.token}",
-            "Content-Type": "application/json"
-        }
+        url = _URL_MODE % device_id
+        headers = self._auth_headers(self.token, json_body=True)
         payload = {"mode": mode}
         
         try:
-            response = requests.post(url, headers=headers, json=payload)
+            response = _SESSION.post(url, headers=headers, data=self._encode(payload))
             return response.status_code == 200
-        except Exception as e:
-            print(f"Error setting Cielo mode: {str(e)}")
+        except Exception:
+            logger.exception("Error setting Cielo mode")
         
         return False
     
@@ -167,18 +181,15 @@ class CieloClient(BaseThermostatClient):
         if not self.authenticate():
             raise Exception("Not authenticated")
         
-        url = f"{self.base_url}/devices/{device_id}/fan"
-        headers = {
-            "Authorization": f"Bearer {self.token}",
-            "Content-Type": "application/json"
-        }
+        url = _URL_FAN % device_id
+        headers = self._auth_headers(self.token, json_body=True)
         payload = {"fan_mode": fan_mode}
         
         try:
-            response = requests.post(url, headers=headers, json=payload)
+            response = _SESSION.post(url, headers=headers, data=self._encode(payload))
             return response.status_code == 200
-        except Exception as e:
-            print(f"Error setting Cielo fan mode: {str(e)}")
+        except Exception:
+            logger.exception("Error setting Cielo fan mode")
         
         return False
     
@@ -195,15 +206,15 @@ class CieloClient(BaseThermostatClient):
         if not self.authenticate():
             raise Exception("Not authenticated")
         
-        url = f"{self.base_url}/devices/{device_id}/schedule"
-        headers = {"Authorization": f"Bearer {self.token}"}
+        url = _URL_SCHEDULE % device_id
+        headers = self._auth_headers(self.token)
         
         try:
-            response = requests.get(url, headers=headers)
+            response = _SESSION.get(url, headers=headers)
             if response.status_code == 200:
-                return response.json()
-        except Exception as e:
-            print(f"Error getting Cielo schedule: {str(e)}")
+                return self._parse(response)
+        except Exception:
+            logger.exception("Error getting Cielo schedule")
         
         return None
     
@@ -221,16 +232,13 @@ class CieloClient(BaseThermostatClient):
         if not self.authenticate():
             raise Exception("Not authenticated")
         
-        url = f"{self.base_url}/devices/{device_id}/schedule"
-        headers = {
-            "Authorization": f"Bearer {self.token}",
-            "Content-Type": "application/json"
-        }
+        url = _URL_SCHEDULE % device_id
+        headers = self._auth_headers(self.token, json_body=True)
         
         try:
-            response = requests.post(url, headers=headers, json=schedule)
+            response = _SESSION.post(url, headers=headers, data=self._encode(schedule))
             return response.status_code == 200
-        except Exception as e:
-            print(f"Error setting Cielo schedule: {str(e)}")
+        except Exception:
+            logger.exception("Error setting Cielo schedule")
         
         return False
@@ -1,42 +1,133 @@
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime
+
 from .nest_client import NestClient
 from .cielo_client import CieloClient
 from .pioneer_client import PioneerClient
 
+# Authenticated clients are kept per process and reused for identical credentials
+CLIENT_POOL_MAX_SIZE = int(os.getenv("CLIENT_POOL_MAX_SIZE", "100"))
+CLIENT_POOL_IDLE_TIMEOUT = int(os.getenv("CLIENT_POOL_IDLE_TIMEOUT", "300"))
+CLIENT_POOL_MAX_AGE = int(os.getenv("CLIENT_POOL_MAX_AGE", "3600"))
+
+_CLIENT_CLASSES = {
+    "NEST": NestClient,
+    "CIELO": CieloClient,
+    "PIONEER": PioneerClient,
+}
+
+# Constructor arguments each client accepts; anything else in kwargs is ignored
+_CLIENT_ARGS = {
+    "NEST": ("client_id", "client_secret", "redirect_uri", "project_id", "access_token", "refresh_token"),
+    "CIELO": ("username", "password", "token"),
+    "PIONEER": ("username", "password", "device_key"),
+}
+
+
+class ClientPool:
+    """Thread-safe LRU cache of thermostat clients"""
+
+    def __init__(self, max_size=CLIENT_POOL_MAX_SIZE, idle_timeout=CLIENT_POOL_IDLE_TIMEOUT, max_age=CLIENT_POOL_MAX_AGE):
+        self.max_size = max_size
+        self.idle_timeout = idle_timeout
+        self.max_age = max_age
+        self._entries = OrderedDict()  # key -> [client, created_at, last_used]
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        """
+        Return the cached client for key, or None if missing or stale
+
+        A client is stale once it has been idle or alive too long, or once
+        its token has expired.
+        """
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            client, created_at, last_used = entry
+            token_expiry = getattr(client, "token_expiry", None)
+            if (now - last_used > self.idle_timeout
+                    or now - created_at > self.max_age
+                    or (token_expiry and datetime.now() >= token_expiry)):
+                del self._entries[key]
+                return None
+            entry[2] = now
+            self._entries.move_to_end(key)
+            return client
+
+    def put(self, key, client):
+        """Cache client under key, evicting the least recently used if full"""
+        now = time.monotonic()
+        with self._lock:
+            self._entries[key] = [client, now, now]
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def discard(self, key):
+        """Drop the client cached under key, if any"""
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
 class ThermostatClientFactory:
     """Factory for creating thermostat API clients"""
-    
+
+    pool = ClientPool()
+
     @staticmethod
-    def create_client(thermostat_type, **kwargs):
+    def _pool_key(thermostat_type, kwargs):
+        credentials = json.dumps(kwargs, sort_keys=True, default=str).encode()
+        return (thermostat_type, hashlib.blake2b(credentials, digest_size=16).digest())
+
+    @classmethod
+    def create_client(cls, thermostat_type, **kwargs):
         """
         Create a thermostat client based on type
-        
+
+        Clients are cached per process by type and credentials, so repeated
+        calls with the same credentials get back the same, already
+        authenticated client instead of logging in again.
+
         Args:
             thermostat_type: Type of thermostat (NEST, CIELO, PIONEER)
             **kwargs: Additional arguments for specific client
-        
+
         Returns:
             BaseThermostatClient: An instance of the appropriate client
         """
-        if thermostat_type == "NEST":
-            return NestClient(
-                client_id=kwargs.get("client_id"),
-                client_secret=kwargs.get("client_secret"),
-                redirect_uri=kwargs.get("redirect_uri"),
-                project_id=kwargs.get("project_id"),
-                access_token=kwargs.get("access_token"),
-                refresh_token=kwargs.get("refresh_token")
-            )
-        elif thermostat_type == "CIELO":
-            return CieloClient(
-                username=kwargs.get("username"),
-                password=kwargs.get("password"),
-                token=kwargs.get("token")
-            )
-        elif thermostat_type == "PIONEER":
-            return PioneerClient(
-                username=kwargs.get("username"),
-                password=kwargs.get("password"),
-                device_key=kwargs.get("device_key")
-            )
-        else:
+        key = cls._pool_key(thermostat_type, kwargs)
+        client = cls.pool.get(key)
+        if client is None:
+            client = cls._build_client(thermostat_type, **kwargs)
+            cls.pool.put(key, client)
+        return client
+
+    @classmethod
+    def release_client(cls, thermostat_type, **kwargs):
+        """
+        Drop the cached client for these credentials, e.g. after it failed to authenticate
+
+        Args:
+            thermostat_type: Type of thermostat (NEST, CIELO, PIONEER)
+            **kwargs: The same arguments that were passed to create_client
+        """
+        cls.pool.discard(cls._pool_key(thermostat_type, kwargs))
+
+    @staticmethod
+    def _build_client(thermostat_type, **kwargs):
+        client_class = _CLIENT_CLASSES.get(thermostat_type)
+        if client_class is None:
             raise ValueError(f"Unsupported thermostat type: {thermostat_type}")
+        return client_class(**{name: kwargs.get(name) for name in _CLIENT_ARGS[thermostat_type]})
@@ -1,11 +1,70 @@
-import requests
 import json
+import logging
 from datetime import datetime, timedelta
 from .base_client import BaseThermostatClient
+from .session import build_session
+from .token_cache import TokenCache
+
+logger = logging.getLogger(__name__)
+
+# Shared across all clients in this module so connections are reused
+_SESSION = build_session()
+
+# Endpoint templates, filled in with %-formatting per call
+_BASE_URL = "https://smartdevicemanagement.googleapis.com/v1"
+_URL_TOKEN = "https://oauth2.googleapis.com/token"
+_URL_DEVICES = _BASE_URL + "/enterprises/%s/devices"
+
+# Pre-encoded setpoint command bodies; only the temperatures are filled in per call
+_SET_HEAT_BODY = b'{"command":"sdm.devices.commands.ThermostatTemperatureSetpoint.SetHeat","params":{"heatCelsius":%s}}'
+_SET_COOL_BODY = b'{"command":"sdm.devices.commands.ThermostatTemperatureSetpoint.SetCool","params":{"coolCelsius":%s}}'
+_SET_RANGE_BODY = b'{"command":"sdm.devices.commands.ThermostatTemperatureSetpoint.SetRange","params":{"heatCelsius":%s,"coolCelsius":%s}}'
+
+# Access tokens shared by every client in the process with the same client id and refresh token
+_TOKENS = TokenCache()
+
+# Treat tokens as expired this long before Google does, so one never lapses mid-request
+_TOKEN_EXPIRY_SKEW = timedelta(seconds=60)
+
+# How long statuses from one devices.list call answer get_status for single devices
+_ALL_STATUSES_TTL = timedelta(seconds=10)
+
+# How long a mode seen in a status read is trusted when setting the temperature
+_LAST_MODE_TTL = timedelta(seconds=30)
+
+# Nest API modes and our standard modes
+_NEST_TO_STD = {"HEAT": "heat", "COOL": "cool", "HEATCOOL": "auto", "OFF": "off"}
+_STD_TO_NEST = {std: nest for nest, std in _NEST_TO_STD.items()}
+
+# Temperature conversion constants
+_F_PER_C = 1.8
+_C_PER_F = 5 / 9
+_F_OFFSET = 32.0
+
+
+def _json_number(value):
+    """Encode a float the way json.dumps would"""
+    return repr(float(value)).encode()
+
+
+# Setpoint command body per mode, given the target in Celsius. Auto mode sets
+# a heat/cool range of about 2°F either side of the target.
+_RANGE_HALF_WIDTH_C = 1.1
+_SETPOINT_BODY_BUILDERS = {
+    "heat": lambda celsius: _SET_HEAT_BODY % _json_number(celsius),
+    "cool": lambda celsius: _SET_COOL_BODY % _json_number(celsius),
+    "auto": lambda celsius: _SET_RANGE_BODY % (
+        _json_number(celsius - _RANGE_HALF_WIDTH_C),
+        _json_number(celsius + _RANGE_HALF_WIDTH_C),
+    ),
+}
+
 
 class NestClient(BaseThermostatClient):
     """Client for Google Nest thermostat API"""
     
+    __slots__ = ("client_id", "client_secret", "redirect_uri", "project_id", "access_token", "refresh_token", "token_expiry", "base_url", "_devices_prefix", "_header_cache", "_last_mode", "_all_statuses")
+    
     def __init__(self, client_id=None, client_secret=None, redirect_uri=None, project_id=None, access_token=None, refresh_token=None):
         """
         Initialize the Nest client
@@ -25,7 +84,12 @@ class NestClient(BaseThermostatClient):
         self.access_token = access_token
         self.refresh_token = refresh_token
         self.token_expiry = None
-        self.base_url = "https://smartdevicemanagement.googleapis.com/v1"
+        self.base_url = _BASE_URL
+        # Device and command URLs are this prefix plus the device id
+        self._devices_prefix = _URL_DEVICES % project_id + "/"
+        self._header_cache = None  # (token, headers, JSON body headers)
+        self._last_mode = {}  # device_id -> (mode, seen_at)
+        self._all_statuses = None  # (statuses by device_id, fetched_at) from get_all_statuses
     
     def authenticate(self, auth_code=None):
         """
@@ -38,12 +102,22 @@ class NestClient(BaseThermostatClient):
             bool: True if authentication was successful, False otherwise
         """
         # If we have a valid access token, use it
-        if self.access_token and self.token_expiry and datetime.now() < self.token_expiry:
+        if self._has_valid_token():
             return True
             
         # If we have a refresh token, use it to get a new access token
         if self.refresh_token:
-            return self._refresh_access_token()
+            # Only one caller per account refreshes; the rest pick up its token
+            token_key = self._token_cache_key()
+            with _TOKENS.refresh_lock(token_key):
+                if self._has_valid_token():
+                    return True
+                # Another client for the same account may already hold a live token
+                cached = _TOKENS.get(token_key)
+                if cached:
+                    self.access_token, self.token_expiry = cached
+                    return True
+                return self._refresh_access_token()
             
         # If we have an auth code, exchange it for tokens
         if auth_code:
@@ -52,6 +126,13 @@ class NestClient(BaseThermostatClient):
         # No authentication method available
         return False
     
+    def _has_valid_token(self):
+        """Whether the current access token is still good, allowing for the expiry skew"""
+        return bool(self.access_token and self.token_expiry and datetime.now() < self.token_expiry)
+    
+    def _token_cache_key(self):
+        return TokenCache.key(self.client_id, self.refresh_token)
+    
     def _exchange_auth_code(self, auth_code):
         """
         Exchange authorization code for access and refresh tokens
@@ -62,7 +143,7 @@ class NestClient(BaseThermostatClient):
         Returns:
             bool: True if successful, False otherwise
         """
-        token_url = "https://oauth2.googleapis.com/token"
+        token_url = _URL_TOKEN
         payload = {
             "client_id": self.client_id,
             "client_secret": self.client_secret,
@@ -72,16 +153,18 @@ class NestClient(BaseThermostatClient):
         }
         
         try:
-            response = requests.post(token_url, data=payload)
+            response = _SESSION.post(token_url, data=payload)
             if response.status_code == 200:
-                token_data = response.json()
+                token_data = self._parse(response)
                 self.access_token = token_data.get("access_token")
                 self.refresh_token = token_data.get("refresh_token")
                 expires_in = token_data.get("expires_in", 3600)
-                self.token_expiry = datetime.now() + timedelta(seconds=expires_in)
+                self.token_expiry = datetime.now() + timedelta(seconds=expires_in) - _TOKEN_EXPIRY_SKEW
+                if self.access_token and self.refresh_token:
+                    _TOKENS.put(self._token_cache_key(), self.access_token, self.token_expiry)
                 return bool(self.access_token)
-        except Exception as e:
-            print(f"Error exchanging auth code: {str(e)}")
+        except Exception:
+            logger.exception("Error exchanging auth code")
         
         return False
     
@@ -92,7 +175,7 @@ class NestClient(BaseThermostatClient):
         Returns:
             bool: True if successful, False otherwise
         """
-        token_url = "https://oauth2.googleapis.com/token"
+        token_url = _URL_TOKEN
         payload = {
             "client_id": self.client_id,
             "client_secret": self.client_secret,
@@ -101,85 +184,175 @@ class NestClient(BaseThermostatClient):
         }
         
         try:
-            response = requests.post(token_url, data=payload)
+            response = _SESSION.post(token_url, data=payload)
             if response.status_code == 200:
-                token_data = response.json()
+                token_data = self._parse(response)
                 self.access_token = token_data.get("access_token")
                 expires_in = token_data.get("expires_in", 3600)
-                self.token_expiry = datetime.now() + timedelta(seconds=expires_in)
+                self.token_expiry = datetime.now() + timedelta(seconds=expires_in) - _TOKEN_EXPIRY_SKEW
+                if self.access_token and self.refresh_token:
+                    _TOKENS.put(self._token_cache_key(), self.access_token, self.token_expiry)
                 return bool(self.access_token)
-        except Exception as e:
-            print(f"Error refreshing token: {str(e)}")
+        except Exception:
+            logger.exception("Error refreshing token")
         
         return False
     
-    def get_status(self, device_id):
+    def get_status(self, device_id, include_raw=False):
         """
         Get current status of the Nest thermostat
         
         Args:
             device_id (str): Unique identifier for the thermostat device
+            include_raw (bool, optional): Include the vendor's raw response as raw_data
             
         Returns:
             dict: Status information or None if failed
         """
+        # A recent devices.list call already covers every device on the account
+        if not include_raw and self._all_statuses:
+            statuses, fetched_at = self._all_statuses
+            # One lookup, since another thread may forget the device at any point
+            status = statuses.get(device_id)
+            if status is not None and datetime.now() - fetched_at < _ALL_STATUSES_TTL:
+                return dict(status)  # callers must not change the shared snapshot
+        
         if not self.authenticate():
             raise Exception("Not authenticated")
         
-        url = f"{self.base_url}/enterprises/{self.project_id}/devices/{device_id}"
-        headers = {"Authorization": f"Bearer {self.access_token}"}
+        url = self._devices_prefix + device_id
+        headers = self._auth_headers(self.access_token)
         
         try:
-            response = requests.get(url, headers=headers)
+            response = _SESSION.get(url, headers=headers)
             if response.status_code == 200:
-                data = response.json()
-                
-                # Extract relevant information from the Nest API response
-                traits = data.get("traits", {})
-                
-                # Get temperature information
-                temperature_trait = traits.get("sdm.devices.traits.Temperature", {})
-                ambient_temp_c = temperature_trait.get("ambientTemperatureCelsius")
-                
-                # Get thermostat mode
-                thermostat_mode_trait = traits.get("sdm.devices.traits.ThermostatMode", {})
-                mode = thermostat_mode_trait.get("mode", "HEAT")
-                
-                # Get target temperature
-                thermostat_setpoint_trait = traits.get("sdm.devices.traits.ThermostatTemperatureSetpoint", {})
-                target_temp_c = None
-                
-                if mode == "HEAT":
-                    target_temp_c = thermostat_setpoint_trait.get("heatCelsius")
-                elif mode == "COOL":
-                    target_temp_c = thermostat_setpoint_trait.get("coolCelsius")
-                elif mode == "HEATCOOL":
-                    target_temp_c = (
-                        thermostat_setpoint_trait.get("heatCelsius", 0) +
-                        thermostat_setpoint_trait.get("coolCelsius", 0)
-                    ) / 2
-                
-                # Get fan status
-                fan_trait = traits.get("sdm.devices.traits.Fan", {})
-                fan_timer_mode = fan_trait.get("timerMode", "OFF")
-                
-                # Convert to our standardized format
-                status = {
-                    "temperature": self._celsius_to_fahrenheit(ambient_temp_c) if ambient_temp_c else None,
-                    "target_temperature": self._celsius_to_fahrenheit(target_temp_c) if target_temp_c else None,
-                    "mode": self._map_nest_mode_to_standard(mode),
-                    "fan_mode": "on" if fan_timer_mode == "ON" else "auto",
-                    "is_online": True,
-                    "humidity": traits.get("sdm.devices.traits.Humidity", {}).get("ambientHumidityPercent"),
-                    "raw_data": data  # Include raw data for debugging
-                }
-                
+                status = self._parse_status(self._parse(response), include_raw)
+                self._remember_mode(device_id, status["mode"])
                 return status
-        except Exception as e:
-            print(f"Error getting thermostat status: {str(e)}")
+        except Exception:
+            logger.exception("Error getting thermostat status")
         
         return None
     
+    def get_status_many(self, device_ids):
+        """
+        Get current status of several Nest thermostats with a single devices.list call
+        
+        Args:
+            device_ids (list): Unique identifiers for the thermostat devices
+            
+        Returns:
+            dict: Status information keyed by device id; devices not found map to None
+        """
+        statuses = self.get_all_statuses()
+        return {device_id: statuses.get(device_id) for device_id in device_ids}
+    
+    def get_all_statuses(self):
+        """
+        Get current status of every thermostat in the project with one devices.list call
+        
+        The result also answers get_status for any of these devices for a few
+        seconds, so a polling cycle makes one request instead of one per device.
+        
+        Returns:
+            dict: Status information keyed by device id; empty if the call failed
+        """
+        if not self.authenticate():
+            raise Exception("Not authenticated")
+        
+        url = _URL_DEVICES % self.project_id
+        headers = self._auth_headers(self.access_token)
+        statuses = {}
+        
+        try:
+            response = _SESSION.get(url, headers=headers)
+            if response.status_code == 200:
+                for device in self._parse(response).get("devices", []):
+                    # Device names look like enterprises/{project_id}/devices/{device_id}
+                    device_id = device.get("name", "").rsplit("/", 1)[-1]
+                    statuses[device_id] = self._parse_status(device)
+                    self._remember_mode(device_id, statuses[device_id]["mode"])
+                self._all_statuses = (statuses, datetime.now())
+        except Exception:
+            logger.exception("Error listing thermostat statuses")
+        
+        return {device_id: dict(status) for device_id, status in statuses.items()}
+    
+    def _parse_status(self, data, include_raw=False):
+        """
+        Convert a Nest device resource into our standardized status format
+        
+        Args:
+            data (dict): Device resource from the Nest API
+            include_raw (bool, optional): Include the device resource as raw_data
+            
+        Returns:
+            dict: Status information
+        """
+        # Extract relevant information from the Nest API response
+        traits = data.get("traits", {})
+        
+        # Get temperature information
+        temperature_trait = traits.get("sdm.devices.traits.Temperature", {})
+        ambient_temp_c = temperature_trait.get("ambientTemperatureCelsius")
+        
+        # Get thermostat mode
+        thermostat_mode_trait = traits.get("sdm.devices.traits.ThermostatMode", {})
+        mode = thermostat_mode_trait.get("mode", "HEAT")
+        
+        # Get target temperature
+        thermostat_setpoint_trait = traits.get("sdm.devices.traits.ThermostatTemperatureSetpoint", {})
+        target_temp_c = None
+        
+        if mode == "HEAT":
+            target_temp_c = thermostat_setpoint_trait.get("heatCelsius")
+        elif mode == "COOL":
+            target_temp_c = thermostat_setpoint_trait.get("coolCelsius")
+        elif mode == "HEATCOOL":
+            target_temp_c = (
+                thermostat_setpoint_trait.get("heatCelsius", 0) +
+                thermostat_setpoint_trait.get("coolCelsius", 0)
+            ) / 2
+        
+        # Get fan status
+        fan_trait = traits.get("sdm.devices.traits.Fan", {})
+        fan_timer_mode = fan_trait.get("timerMode", "OFF")
+        
+        # Convert to our standardized format (temperature conversions inlined, this runs per device per poll)
+        status = {
+            "temperature": ambient_temp_c * _F_PER_C + _F_OFFSET if ambient_temp_c else None,
+            "target_temperature": target_temp_c * _F_PER_C + _F_OFFSET if target_temp_c else None,
+            "mode": self._map_nest_mode_to_standard(mode),
+            "fan_mode": "on" if fan_timer_mode == "ON" else "auto",
+            "is_online": True,
+            "humidity": traits.get("sdm.devices.traits.Humidity", {}).get("ambientHumidityPercent")
+        }
+        if include_raw:
+            status["raw_data"] = data
+        
+        return status
+    
+    def _forget_device(self, device_id):
+        """Drop what we remember about a device after changing its mode"""
+        self._last_mode.pop(device_id, None)
+        self._forget_status(device_id)
+    
+    def _forget_status(self, device_id):
+        """Drop the device's snapshot status after a change that leaves its mode alone"""
+        all_statuses = self._all_statuses
+        if all_statuses:
+            all_statuses[0].pop(device_id, None)
+    
+    def _remember_mode(self, device_id, mode):
+        self._last_mode[device_id] = (mode, datetime.now())
+    
+    def _recent_mode(self, device_id):
+        """The mode last seen for the device, if it was seen recently enough to trust"""
+        last = self._last_mode.get(device_id)
+        if last and datetime.now() - last[1] < _LAST_MODE_TTL:
+            return last[0]
+        return None
+    
     def set_temperature(self, device_id, temperature):
         """
         Set target temperature for the thermostat
@@ -194,57 +367,34 @@ class NestClient(BaseThermostatClient):
         if not self.authenticate():
             raise Exception("Not authenticated")
         
-        # First get current status to determine the mode
-        status = self.get_status(device_id)
-        if not status:
-            return False
+        # The setpoint command depends on the mode; only ask the device if we don't know it
+        mode = self._recent_mode(device_id)
+        if mode is None:
+            status = self.get_status(device_id)
+            if not status:
+                return False
+            mode = status.get("mode", "heat")
         
-        mode = status.get("mode", "heat")
-        temp_celsius = self._fahrenheit_to_celsius(temperature)
+        temp_celsius = (temperature - _F_OFFSET) * _C_PER_F
         
-        url = f"{self.base_url}/enterprises/{self.project_id}/devices/{device_id}:executeCommand"
-        headers = {
-            "Authorization": f"Bearer {self.access_token}",
-            "Content-Type": "application/json"
-        }
+        url = self._devices_prefix + device_id + ":executeCommand"
+        headers = self._auth_headers(self.access_token, json_body=True)
         
         try:
             # Command depends on the current mode
-            if mode == "heat":
-                payload = {
-                    "command": "sdm.devices.commands.ThermostatTemperatureSetpoint.SetHeat",
-                    "params": {
-                        "heatCelsius": temp_celsius
-                    }
-                }
-            elif mode == "cool":
-                payload = {
-                    "command": "sdm.devices.commands.ThermostatTemperatureSetpoint.SetCool",
-                    "params": {
-                        "coolCelsius": temp_celsius
-                    }
-                }
-            elif mode == "auto":
-                # For auto mode, we need to set both heat and cool points
-                # Typically with a reasonable range (e.g., ±2°F)
-                heat_celsius = temp_celsius - 1.1  # About 2°F lower
-                cool_celsius = temp_celsius + 1.1  # About 2°F higher
-                
-                payload = {
-                    "command": "sdm.devices.commands.ThermostatTemperatureSetpoint.SetRange",
-                    "params": {
-                        "heatCelsius": heat_celsius,
-                        "coolCelsius": cool_celsius
-                    }
-                }
-            else:
+            build_body = _SETPOINT_BODY_BUILDERS.get(mode)
+            if build_body is None:
                 # Cannot set temperature in OFF mode
                 return False
+            body = build_body(temp_celsius)
             
-            response = requests.post(url, headers=headers, json=payload)
-            return response.status_code == 200
-        except Exception as e:
-            print(f"Error setting temperature: {str(e)}")
+            response = _SESSION.post(url, headers=headers, data=body)
+            if response.status_code == 200:
+                self._forget_status(device_id)
+                return True
+            return False
+        except Exception:
+            logger.exception("Error setting temperature")
         
         return False
     
@@ -265,11 +415,8 @@ class NestClient(BaseThermostatClient):
         # Map our standard modes to Nest API modes
         nest_mode = self._map_standard_mode_to_nest(mode)
         
-        url = f"{self.base_url}/enterprises/{self.project_id}/devices/{device_id}:executeCommand"
-        headers = {
-            "Authorization": f"Bearer {self.access_token}",
-            "Content-Type": "application/json"
-        }
+        url = self._devices_prefix + device_id + ":executeCommand"
+        headers = self._auth_headers(self.access_token, json_body=True)
         
         try:
             payload = {
@@ -279,10 +426,13 @@ class NestClient(BaseThermostatClient):
                 }
             }
             
-            response = requests.post(url, headers=headers, json=payload)
-            return response.status_code == 200
-        except Exception as e:
-            print(f"Error setting mode: {str(e)}")
+            response = _SESSION.post(url, headers=headers, data=self._encode(payload))
+            if response.status_code == 200:
+                self._forget_device(device_id)
+                return True
+            return False
+        except Exception:
+            logger.exception("Error setting mode")
         
         return False
     
@@ -303,11 +453,8 @@ class NestClient(BaseThermostatClient):
         # Map our standard fan modes to Nest API fan modes
         timer_mode = "ON" if fan_mode.lower() == "on" else "OFF"
         
-        url = f"{self.base_url}/enterprises/{self.project_id}/devices/{device_id}:executeCommand"
-        headers = {
-            "Authorization": f"Bearer {self.access_token}",
-            "Content-Type": "application/json"
-        }
+        url = self._devices_prefix + device_id + ":executeCommand"
+        headers = self._auth_headers(self.access_token, json_body=True)
         
         try:
             # For Nest, we use the Fan Timer feature to control the fan
@@ -321,10 +468,13 @@ class NestClient(BaseThermostatClient):
                 }
             }
             
-            response = requests.post(url, headers=headers, json=payload)
-            return response.status_code == 200
-        except Exception as e:
-            print(f"Error setting fan mode: {str(e)}")
+            response = _SESSION.post(url, headers=headers, data=self._encode(payload))
+            if response.status_code == 200:
+                self._forget_status(device_id)
+                return True
+            return False
+        except Exception:
+            logger.exception("Error setting fan mode")
         
         return False
     
@@ -357,7 +507,8 @@ class NestClient(BaseThermostatClient):
         # This would need to be implemented through Google Home routines or a custom solution
         return False
     
-    def _fahrenheit_to_celsius(self, fahrenheit):
+    @staticmethod
+    def _fahrenheit_to_celsius(fahrenheit):
         """
         Convert Fahrenheit to Celsius
         
@@ -367,9 +518,10 @@ class NestClient(BaseThermostatClient):
         Returns:
             float: Temperature in Celsius
         """
-        return (fahrenheit - 32) * 5 / 9
+        return (fahrenheit - _F_OFFSET) * _C_PER_F
     
-    def _celsius_to_fahrenheit(self, celsius):
+    @staticmethod
+    def _celsius_to_fahrenheit(celsius):
         """
         Convert Celsius to Fahrenheit
         
@@ -379,7 +531,7 @@ class NestClient(BaseThermostatClient):
         Returns:
             float: Temperature in Fahrenheit
         """
-        return (celsius * 9 / 5) + 32
+        return celsius * _F_PER_C + _F_OFFSET
     
     def _map_nest_mode_to_standard(self, nest_mode):
         """
@@ -391,13 +543,7 @@ class NestClient(BaseThermostatClient):
         Returns:
             str: Standard mode (heat, cool, auto, off)
         """
-        mode_map = {
-            "HEAT": "heat",
-            "COOL": "cool",
-            "HEATCOOL": "auto",
-            "OFF": "off"
-        }
-        return mode_map.get(nest_mode, "heat")
+        return _NEST_TO_STD.get(nest_mode, "heat")
     
     def _map_standard_mode_to_nest(self, mode):
         """
@@ -409,10 +555,4 @@ class NestClient(BaseThermostatClient):
         Returns:
             str: Nest API mode
         """
-        mode_map = {
-            "heat": "HEAT",
-            "cool": "COOL",
-            "auto": "HEATCOOL",
-            "off": "OFF"
-        }
-        return mode_map.get(mode.lower(), "HEAT")
+        return _STD_TO_NEST.get(mode.lower(), "HEAT")
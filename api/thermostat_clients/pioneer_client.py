@@ -1,11 +1,32 @@
-import requests
 import json
+import logging
 from datetime import datetime, timedelta
 from .base_client import BaseThermostatClient
+from .session import build_session
+from .token_cache import TokenCache
+
+logger = logging.getLogger(__name__)
+
+# Shared across all clients in this module so connections are reused
+_SESSION = build_session()
+
+# Login tokens shared by every client in the process with the same username and password
+_TOKENS = TokenCache()
+
+# Endpoint templates, filled in with %-formatting per call
+_BASE_URL = "https://api.pioneerminisplit.com/api"  # Example URL, may need to be updated
+_URL_AUTH = _BASE_URL + "/auth"
+_URL_STATUS = _BASE_URL + "/devices/%s/status"
+_URL_TEMPERATURE = _BASE_URL + "/devices/%s/temperature"
+_URL_MODE = _BASE_URL + "/devices/%s/mode"
+_URL_FAN = _BASE_URL + "/devices/%s/fan"
+_URL_SCHEDULE = _BASE_URL + "/devices/%s/schedule"
 
 class PioneerClient(BaseThermostatClient):
     """Client for Pioneer thermostat API"""
     
+    __slots__ = ("username", "password", "device_key", "token", "token_expiry", "base_url", "_header_cache")
+    
     def __init__(self, username=None, password=None, device_key=None):
         """
         Initialize the Pioneer client
@@ -20,7 +41,8 @@ class PioneerClient(BaseThermostatClient):
         self.device_key = device_key
         self.token = None
         self.token_expiry = None
-        self.base_url = "https://api.pioneerminisplit.com/api"  # Example URL, may need to be updated
+        self.base_url = _BASE_URL
+        self._header_cache = None  # (token, headers, JSON body headers)
     
     def authenticate(self):
         """
@@ -43,32 +65,54 @@ class PioneerClient(BaseThermostatClient):
         if not self.username or not self.password:
             return False
         
-        auth_url = f"{self.base_url}/auth"
+        # Only one caller per account logs in; the rest pick up its token
+        token_key = TokenCache.key(self.username, self.password)
+        with _TOKENS.refresh_lock(token_key):
+            cached = _TOKENS.get(token_key)
+            if cached:
+                self.token, self.token_expiry = cached
+                return True
+            return self._login(token_key)
+    
+    def _login(self, token_key):
+        """
+        Log in with username and password and share the token with other clients
+        
+        Args:
+            token_key (str): TokenCache key for this account
+            
+        Returns:
+            bool: True if successful, False otherwise
+        """
+        auth_url = _URL_AUTH
         payload = {
             "username": self.username,
             "password": self.password
         }
         
         try:
-            response = requests.post(auth_url, json=payload)
+            response = _SESSION.post(auth_url, headers={"Content-Type": "application/json"}, data=self._encode(payload))
             if response.status_code == 200:
-                auth_data = response.json()
+                auth_data = self._parse(response)
                 self.token = auth_data.get("token")
                 # Typically tokens are valid for a certain period
                 expires_in = auth_data.get("expires_in", 86400)  # Default to 24 hours
                 self.token_expiry = datetime.now() + timedelta(seconds=expires_in)
+                if self.token:
+                    _TOKENS.put(token_key, self.token, self.token_expiry)
                 return bool(self.token)
-        except Exception as e:
-            print(f"Error authenticating with Pioneer API: {str(e)}")
+        except Exception:
+            logger.exception("Error authenticating with Pioneer API")
         
         return False
     
-    def get_status(self, device_id):
+    def get_status(self, device_id, include_raw=False):
         """
         Get current status of the Pioneer thermostat
         
         Args:
             device_id (str): Unique identifier for the thermostat device
+            include_raw (bool, optional): Include the vendor's raw response as raw_data
             
         Returns:
             dict: Status information or None if failed
@@ -76,13 +120,13 @@ class PioneerClient(BaseThermostatClient):
         if not self.authenticate():
             raise Exception("Not authenticated")
         
-        url = f"{self.base_url}/devices/{device_id}/status"
-        headers = {"Authorization": f"Bearer {self.token}"}
+        url = _URL_STATUS % device_id
+        headers = self._auth_headers(self.token)
         
         try:
-            response = requests.get(url, headers=headers)
+            response = _SESSION.get(url, headers=headers)
             if response.status_code == 200:
-                data = response.json()
+                data = self._parse(response)
                 
                 # Extract relevant information from the Pioneer API response
                 # Note: This is based on community documentation and may need adjustment
@@ -92,13 +136,14 @@ class PioneerClient(BaseThermostatClient):
                     "mode": data.get("mode", "heat").lower(),
                     "fan_mode": data.get("fan_mode", "auto").lower(),
                     "is_online": data.get("is_online", True),
-                    "humidity": data.get("humidity"),
-                    "raw_data": data  # Include raw data for debugging
+                    "humidity": data.get("humidity")
                 }
+                if include_raw:
+                    status["raw_data"] = data
                 
                 return status
-        except Exception as e:
-            print(f"Error getting Pioneer thermostat status: {str(e)}")
+        except Exception:
+            logger.exception("Error getting Pioneer thermostat status")
         
         return None
     
@@ -116,18 +161,15 @@ class PioneerClient(BaseThermostatClient):
         if not self.authenticate():
             raise Exception("Not authenticated")
         
-        url = f"{self.base_url}/devices/{device_id}/temperature"
-        headers = {
-            "Authorization": f"Bearer {self.token}",
-            "Content-Type": "application/json"
-        }
+        url = _URL_TEMPERATURE % device_id
+        headers = self._auth_headers(self.token, json_body=True)
         payload = {"temperature": temperature}
         
         try:
-            response = requests.post(url, headers=headers, json=payload)
+            response = _SESSION.post(url, headers=headers, data=self._encode(payload))
             return response.status_code == 200
-        except Exception as e:
-            print(f"Error setting Pioneer temperature: {str(e)}")
+        except Exception:
+            logger.exception("Error setting Pioneer temperature")
         
         return False
     
@@ -148,18 +190,15 @@ class PioneerClient(BaseThermostatClient):
         # Map standard modes to Pioneer-specific modes if needed
         pioneer_mode = self._map_standard_mode_to_pioneer(mode)
         
-        url = f"{self.base_url}/devices/{device_id}/mode"
-        headers = {
-            "Authorization": f"Bearer {self.token}",
-            "Content-Type": "application/json"
-        }
+        url = _URL_MODE % device_id
+        headers = self._auth_headers(self.token, json_body=True)
         payload = {"mode": pioneer_mode}
         
         try:
-            response = requests.post(url, headers=headers, json=payload)
+            response = _SESSION.post(url, headers=headers, data=self._encode(payload))
             return response.status_code == 200
-        except Exception as e:
-            print(f"Error setting Pioneer mode: {str(e)}")
+        except Exception:
+            logger.exception("Error setting Pioneer mode")
         
         return False
     
@@ -180,18 +219,15 @@ class PioneerClient(BaseThermostatClient):
         # Map standard fan modes to Pioneer-specific fan modes if needed
         pioneer_fan_mode = fan_mode.lower()
         
-        url = f"{self.base_url}/devices/{device_id}/fan"
-        headers = {
-            "Authorization": f"Bearer {self.token}",
-            "Content-Type": "application/json"
-        }
+        url = _URL_FAN % device_id
+        headers = self._auth_headers(self.token, json_body=True)
         payload = {"fan_mode": pioneer_fan_mode}
         
         try:
-            response = requests.post(url, headers=headers, json=payload)
+            response = _SESSION.post(url, headers=headers, data=self._encode(payload))
             return response.status_code == 200
-        except Exception as e:
-            print(f"Error setting Pioneer fan mode: {str(e)}")
+        except Exception:
+            logger.exception("Error setting Pioneer fan mode")
         
         return False
     
@@ -208,15 +244,15 @@ class PioneerClient(BaseThermostatClient):
         if not self.authenticate():
             raise Exception("Not authenticated")
         
-        url = f"{self.base_url}/devices/{device_id}/schedule"
-        headers = {"Authorization": f"Bearer {self.token}"}
+        url = _URL_SCHEDULE % device_id
+        headers = self._auth_headers(self.token)
         
         try:
-            response = requests.get(url, headers=headers)
+            response = _SESSION.get(url, headers=headers)
             if response.status_code == 200:
-                return response.json()
-        except Exception as e:
-            print(f"Error getting Pioneer schedule: {str(e)}")
+                return self._parse(response)
+        except Exception:
+            logger.exception("Error getting Pioneer schedule")
         
         return None
     
@@ -234,17 +270,14 @@ class PioneerClient(BaseThermostatClient):
         if not self.authenticate():
             raise Exception("Not authenticated")
         
-        url = f"{self.base_url}/devices/{device_id}/schedule"
-        headers = {
-            "Authorization": f"Bearer {self.token}",
-            "Content-Type": "application/json"
-        }
+        url = _URL_SCHEDULE % device_id
+        headers = self._auth_headers(self.token, json_body=True)
         
         try:
-            response = requests.post(url, headers=headers, json=schedule)
+            response = _SESSION.post(url, headers=headers, data=self._encode(schedule))
             return response.status_code == 200
-        except Exception as e:
-            print(f"Error setting Pioneer schedule: {str(e)}")
+        except Exception:
+            logger.exception("Error setting Pioneer schedule")
         
         return False
     
@@ -0,0 +1,24 @@
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+
+def build_session():
+    """
+    Build a pooled requests session for a thermostat vendor API
+    
+    The session is meant to be created once per client module and reused, so
+    polling keeps its TCP/TLS connections alive instead of reconnecting on
+    every call. Retries only cover connection errors and idempotent requests.
+    
+    Returns:
+        requests.Session: Session with a pooled, retrying HTTPS adapter
+    """
+    session = requests.Session()
+    adapter = HTTPAdapter(
+        pool_connections=32,
+        pool_maxsize=64,
+        max_retries=Retry(total=2, backoff_factor=0.2)
+    )
+    session.mount("https://", adapter)
+    return session
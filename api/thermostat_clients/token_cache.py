@@ -0,0 +1,63 @@
+import hashlib
+import threading
+from datetime import datetime
+
+
+class TokenCache:
+    """
+    Thread-safe, process-wide cache of vendor access tokens
+
+    Lets separate client instances with the same credentials share one live
+    token instead of each logging in again. Entries are keyed by a hash of
+    the credentials so no raw secret is kept as a key.
+    """
+
+    def __init__(self):
+        self._tokens = {}  # key -> (token, expiry)
+        self._refresh_locks = {}  # key -> threading.Lock
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def key(*credentials):
+        """
+        Build a cache key from the credentials a token was issued for
+
+        Args:
+            *credentials (str): Values identifying the account, e.g. client id and refresh token
+
+        Returns:
+            str: Hex digest of the credentials
+        """
+        return hashlib.sha256("|".join(str(part) for part in credentials).encode()).hexdigest()
+
+    def get(self, key):
+        """
+        Return the cached (token, expiry) for key, or None if missing or expired
+        """
+        with self._lock:
+            entry = self._tokens.get(key)
+            if entry is None:
+                return None
+            if datetime.now() >= entry[1]:
+                del self._tokens[key]
+                return None
+            return entry
+
+    def refresh_lock(self, key):
+        """
+        Return the lock that serializes fetching a new token for key
+
+        Callers take it, check get() again, and only log in if it is still
+        missing, so concurrent callers for one account make a single request.
+        """
+        with self._lock:
+            return self._refresh_locks.setdefault(key, threading.Lock())
+
+    def put(self, key, token, expiry):
+        """Cache a token until its expiry"""
+        with self._lock:
+            self._tokens[key] = (token, expiry)
+
+    def clear(self):
+        with self._lock:
+            self._tokens.clear()
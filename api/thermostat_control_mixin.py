@@ -0,0 +1,350 @@
+from rest_framework.decorators import action
+from rest_framework.response import Response
+from rest_framework import status
+from django.core.cache import cache
+from django.utils import timezone
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+import functools
+import orjson
+import requests
+
+from .thermostat_clients.client_factory import ThermostatClientFactory
+
+# Upper bound on concurrent vendor API calls for one bulk_status request
+BULK_STATUS_MAX_WORKERS = 16
+
+# Seconds a polled status is served from cache before asking the vendor again
+STATUS_CACHE_TIMEOUT = 15
+
+# Failures a vendor call is expected to raise; anything else goes to DRF's exception handler
+_CLIENT_ERRORS = (requests.RequestException, ValueError, KeyError)
+
+
+@dataclass(frozen=True)
+class NestSettings:
+    """Project-wide Nest OAuth settings; missing ones are None"""
+    client_id: str = None
+    client_secret: str = None
+    redirect_uri: str = None
+    project_id: str = None
+
+
+@functools.lru_cache(maxsize=1024)
+def _parse_credentials(api_key):
+    """Parse a legacy string API key, falling back to treating it as a bare token"""
+    # Only a JSON object can carry credentials; anything else is a raw token
+    if api_key.lstrip()[:1] == "{":
+        try:
+            return orjson.loads(api_key)
+        except orjson.JSONDecodeError:
+            pass
+    # If not valid JSON, use as-is
+    return {"token": api_key}
+
+
+@functools.lru_cache(maxsize=None)
+def nest_settings():
+    """
+    Read the Nest settings once per process
+    
+    ApiConfig.ready() calls this at startup, so requests only ever hit the cache.
+    """
+    from django.conf import settings
+    return NestSettings(
+        client_id=getattr(settings, "NEST_CLIENT_ID", None),
+        client_secret=getattr(settings, "NEST_CLIENT_SECRET", None),
+        redirect_uri=getattr(settings, "NEST_REDIRECT_URI", None),
+        project_id=getattr(settings, "NEST_PROJECT_ID", None),
+    )
+
+
+def _nest_client_kwargs(credentials):
+    nest = nest_settings()
+    return {
+        "client_id": nest.client_id or credentials.get("client_id"),
+        "client_secret": nest.client_secret or credentials.get("client_secret"),
+        "redirect_uri": nest.redirect_uri or credentials.get("redirect_uri"),
+        "project_id": nest.project_id or credentials.get("project_id"),
+        "access_token": credentials.get("access_token"),
+        "refresh_token": credentials.get("refresh_token")
+    }
+
+
+def _cielo_client_kwargs(credentials):
+    return {
+        "username": credentials.get("username"),
+        "password": credentials.get("password"),
+        "token": credentials.get("token")
+    }
+
+
+def _pioneer_client_kwargs(credentials):
+    return {
+        "username": credentials.get("username"),
+        "password": credentials.get("password"),
+        "device_key": credentials.get("device_key")
+    }
+
+
+_CLIENT_KWARGS_BUILDERS = {
+    "NEST": _nest_client_kwargs,
+    "CIELO": _cielo_client_kwargs,
+    "PIONEER": _pioneer_client_kwargs,
+}
+
+
+def _error_response(message, code):
+    return Response({"error": message}, status=code)
+
+
+def status_cache_key(thermostat):
+    return f"thermostat:{thermostat.type}:{thermostat.device_id}:status"
+
+
+class ThermostatControlMixin:
+    """
+    Thermostat control actions (status, temperature, mode, fan, schedule) for the thermostat viewset
+    Expects get_object() and get_queryset() from the viewset it is mixed into
+    """
+    
+    @action(detail=True, methods=['get'])
+    def status(self, request, pk=None):
+        """Get current status of the thermostat"""
+        thermostat = self.get_object()
+        
+        # Dashboards poll every few seconds; serve recent statuses without a vendor call
+        cache_key = status_cache_key(thermostat)
+        status_data = cache.get(cache_key)
+        if status_data is not None:
+            return Response(status_data)
+        
+        try:
+            client = ThermostatClientFactory.create_client(
+                thermostat_type=thermostat.type,
+                **self._get_client_kwargs(thermostat)
+            )
+            
+            if client.authenticate():
+                status_data = client.get_status(thermostat.device_id)
+                if status_data:
+                    # Update thermostat record with latest data, touching only these columns
+                    if 'temperature' in status_data:
+                        self.get_queryset().filter(pk=thermostat.pk).update(
+                            last_temperature=status_data['temperature'],
+                            last_updated=timezone.now(),
+                            is_online=True
+                        )
+                    
+                    cache.set(cache_key, status_data, STATUS_CACHE_TIMEOUT)
+                    return Response(status_data)
+                return _error_response("Failed to get thermostat status", status.HTTP_400_BAD_REQUEST)
+            self._release_client(thermostat)
+            return _error_response("Authentication failed", status.HTTP_401_UNAUTHORIZED)
+        except _CLIENT_ERRORS as e:
+            return _error_response(str(e), status.HTTP_500_INTERNAL_SERVER_ERROR)
+    
+    @action(detail=False, methods=['post'])
+    def bulk_status(self, request):
+        """Get current status of several thermostats at once, polling them concurrently"""
+        ids = request.data.get('ids')
+        if not isinstance(ids, list) or not ids:
+            return _error_response("A list of thermostat ids is required", status.HTTP_400_BAD_REQUEST)
+        if not all(isinstance(pk, int) and not isinstance(pk, bool) for pk in ids):
+            return _error_response("Thermostat ids must be integers", status.HTTP_400_BAD_REQUEST)
+        
+        queryset = self.get_queryset()
+        thermostats = list(queryset.filter(pk__in=ids))
+        
+        # Thermostats sharing credentials share a client, so poll each account once;
+        # one that cannot get a client fails on its own instead of failing the batch
+        statuses = {}
+        groups = {}
+        for thermostat in thermostats:
+            try:
+                client = ThermostatClientFactory.create_client(
+                    thermostat_type=thermostat.type,
+                    **self._get_client_kwargs(thermostat)
+                )
+            except _CLIENT_ERRORS as e:
+                statuses[thermostat.device_id] = {"error": str(e)}
+                continue
+            groups.setdefault(id(client), (client, thermostat, []))[2].append(thermostat.device_id)
+        
+        def fetch_statuses(group):
+            client, thermostat, device_ids = group
+            try:
+                if not client.authenticate():
+                    self._release_client(thermostat)
+                    return dict.fromkeys(device_ids, {"error": "Authentication failed"})
+                statuses = client.get_status_many(device_ids)
+            except Exception as e:
+                return dict.fromkeys(device_ids, {"error": str(e)})
+            return {
+                device_id: statuses.get(device_id) or {"error": "Failed to get thermostat status"}
+                for device_id in device_ids
+            }
+        
+        # Each account poll is a blocking HTTPS call, so run them side by side
+        workers = max(1, min(BULK_STATUS_MAX_WORKERS, len(groups)))
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            for group_statuses in executor.map(fetch_statuses, groups.values()):
+                statuses.update(group_statuses)
+        results = [statuses[thermostat.device_id] for thermostat in thermostats]
+        
+        # Update thermostat records with latest data in one query
+        now = timezone.now()
+        updated = []
+        for thermostat, status_data in zip(thermostats, results):
+            if 'temperature' in status_data:
+                thermostat.last_temperature = status_data['temperature']
+                thermostat.last_updated = now
+                thermostat.is_online = True
+                updated.append(thermostat)
+        if updated:
+            queryset.model.objects.bulk_update(updated, ['last_temperature', 'last_updated', 'is_online'])
+        
+        return Response({str(thermostat.pk): status_data for thermostat, status_data in zip(thermostats, results)})
+    
+    @action(detail=True, methods=['post'])
+    def set_temperature(self, request, pk=None):
+        """Set target temperature for the thermostat"""
+        thermostat = self.get_object()
+        temperature = request.data.get('temperature')
+        
+        if not temperature:
+            return _error_response("Temperature is required", status.HTTP_400_BAD_REQUEST)
+        
+        try:
+            client = ThermostatClientFactory.create_client(
+                thermostat_type=thermostat.type,
+                **self._get_client_kwargs(thermostat)
+            )
+            
+            if client.authenticate():
+                success = client.set_temperature(thermostat.device_id, float(temperature))
+                if success:
+                    # The next status read should reflect the change
+                    cache.delete(status_cache_key(thermostat))
+                    return Response({"success": True})
+                return _error_response("Failed to set temperature", status.HTTP_400_BAD_REQUEST)
+            self._release_client(thermostat)
+            return _error_response("Authentication failed", status.HTTP_401_UNAUTHORIZED)
+        except _CLIENT_ERRORS as e:
+            return _error_response(str(e), status.HTTP_500_INTERNAL_SERVER_ERROR)
+    
+    @action(detail=True, methods=['post'])
+    def set_mode(self, request, pk=None):
+        """Set thermostat mode (heat, cool, off, etc.)"""
+        thermostat = self.get_object()
+        mode = request.data.get('mode')
+        
+        if not mode:
+            return _error_response("Mode is required", status.HTTP_400_BAD_REQUEST)
+        
+        try:
+            client = ThermostatClientFactory.create_client(
+                thermostat_type=thermostat.type,
+                **self._get_client_kwargs(thermostat)
+            )
+            
+            if client.authenticate():
+                success = client.set_mode(thermostat.device_id, mode)
+                if success:
+                    # The next status read should reflect the change
+                    cache.delete(status_cache_key(thermostat))
+                    return Response({"success": True})
+                return _error_response("Failed to set mode", status.HTTP_400_BAD_REQUEST)
+            self._release_client(thermostat)
+            return _error_response("Authentication failed", status.HTTP_401_UNAUTHORIZED)
+        except _CLIENT_ERRORS as e:
+            return _error_response(str(e), status.HTTP_500_INTERNAL_SERVER_ERROR)
+    
+    @action(detail=True, methods=['post'])
+    def set_fan_mode(self, request, pk=None):
+        """Set fan mode (auto, on)"""
+        thermostat = self.get_object()
+        fan_mode = request.data.get('fan_mode')
+        
+        if not fan_mode:
+            return _error_response("Fan mode is required", status.HTTP_400_BAD_REQUEST)
+        
+        try:
+            client = ThermostatClientFactory.create_client(
+                thermostat_type=thermostat.type,
+                **self._get_client_kwargs(thermostat)
+            )
+            
+            if client.authenticate():
+                success = client.set_fan_mode(thermostat.device_id, fan_mode)
+                if success:
+                    # The next status read should reflect the change
+                    cache.delete(status_cache_key(thermostat))
+                    return Response({"success": True})
+                return _error_response("Failed to set fan mode", status.HTTP_400_BAD_REQUEST)
+            self._release_client(thermostat)
+            return _error_response("Authentication failed", status.HTTP_401_UNAUTHORIZED)
+        except _CLIENT_ERRORS as e:
+            return _error_response(str(e), status.HTTP_500_INTERNAL_SERVER_ERROR)
+    
+    @action(detail=True, methods=['get'])
+    def schedule(self, request, pk=None):
+        """Get current schedule for the thermostat"""
+        thermostat = self.get_object()
+        
+        try:
+            client = ThermostatClientFactory.create_client(
+                thermostat_type=thermostat.type,
+                **self._get_client_kwargs(thermostat)
+            )
+            
+            if client.authenticate():
+                schedule_data = client.get_schedule(thermostat.device_id)
+                if schedule_data:
+                    return Response(schedule_data)
+                return _error_response("Failed to get schedule or not supported", status.HTTP_400_BAD_REQUEST)
+            self._release_client(thermostat)
+            return _error_response("Authentication failed", status.HTTP_401_UNAUTHORIZED)
+        except _CLIENT_ERRORS as e:
+            return _error_response(str(e), status.HTTP_500_INTERNAL_SERVER_ERROR)
+    
+    @action(detail=True, methods=['post'])
+    def set_schedule(self, request, pk=None):
+        """Set schedule for the thermostat"""
+        thermostat = self.get_object()
+        schedule = request.data
+        
+        if not schedule:
+            return _error_response("Schedule data is required", status.HTTP_400_BAD_REQUEST)
+        
+        try:
+            client = ThermostatClientFactory.create_client(
+                thermostat_type=thermostat.type,
+                **self._get_client_kwargs(thermostat)
+            )
+            
+            if client.authenticate():
+                success = client.set_schedule(thermostat.device_id, schedule)
+                if success:
+                    return Response({"success": True})
+                return _error_response("Failed to set schedule or not supported", status.HTTP_400_BAD_REQUEST)
+            self._release_client(thermostat)
+            return _error_response("Authentication failed", status.HTTP_401_UNAUTHORIZED)
+        except _CLIENT_ERRORS as e:
+            return _error_response(str(e), status.HTTP_500_INTERNAL_SERVER_ERROR)
+    
+    def _release_client(self, thermostat):
+        """Drop the pooled client for this thermostat's credentials so the next call logs in afresh"""
+        ThermostatClientFactory.release_client(thermostat.type, **self._get_client_kwargs(thermostat))
+    
+    def _get_client_kwargs(self, thermostat):
+        """Get kwargs for client initialization based on thermostat type"""
+        builder = _CLIENT_KWARGS_BUILDERS.get(thermostat.type)
+        if builder is None:
+            return {}
+        
+        # API key is stored as JSON; older rows may still hold a raw string
+        credentials = thermostat.api_key or {}
+        if isinstance(credentials, str):
+            credentials = _parse_credentials(credentials)
+        return builder(credentials)
@@ -16,6 +16,9 @@ router.register(r'calendars', CalendarViewSet)
 router.register(r'schedules', ScheduleViewSet)
 router.register(r'temperature-logs', TemperatureLogViewSet)
 
+# Build the router's URL patterns once, now that every viewset is registered
+router_urls = router.urls
+
 # The API URLs are determined automatically by the router
 urlpatterns = [
     # Authentication endpoints
@@ -25,5 +28,5 @@ urlpatterns = [
     path('auth/token/refresh/', TokenRefreshView.as_view(), name='token_refresh'),
     
     # Include the router URLs
-    path('', include(router.urls)),
+    path('', include(router_urls)),
 ]
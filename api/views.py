@@ -1,19 +1,49 @@
+from itertools import islice
+
 from rest_framework import viewsets, status, permissions
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework_simplejwt.tokens import RefreshToken
 from django.contrib.auth import authenticate
 from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.http import StreamingHttpResponse
 from django.shortcuts import get_object_or_404
 
 from .models import Property, Thermostat, Calendar, Schedule, TemperatureLog, UserProfile
 from .serializers import (
     UserSerializer, PropertySerializer, ThermostatSerializer, 
     CalendarSerializer, ScheduleSerializer, TemperatureLogSerializer,
-    UserRegistrationSerializer, UserLoginSerializer, UserProfileSerializer
+    UserRegistrationSerializer, UserLoginSerializer, UserProfileSerializer,
+    serialize_user, profile_cache_key, PROFILE_CACHE_TIMEOUT
+)
+from .renderers import OrjsonRenderer, iter_json_array
+from .thermostat_control_mixin import ThermostatControlMixin
+from .serializers_fast import (
+    FastPropertySerializer, FastThermostatSerializer,
+    FastCalendarSerializer, FastTemperatureLogSerializer
 )
 
 
+# Rows fetched and encoded per chunk when streaming temperature logs
+LOG_STREAM_CHUNK_SIZE = 2000
+
+
+class FastListMixin:
+    """
+    Serve GET list responses with a read-only serpy serializer.
+    All other actions keep using serializer_class.
+    """
+    list_serializer_class = None
+    
+    def list(self, request, *args, **kwargs):
+        queryset = self.filter_queryset(self.get_queryset())
+        page = self.paginate_queryset(queryset)
+        if page is not None:
+            return self.get_paginated_response(self.list_serializer_class(page, many=True).data)
+        return Response(self.list_serializer_class(queryset, many=True).data)
+
+
 class UserViewSet(viewsets.ReadOnlyModelViewSet):
     """
     API endpoint that allows users to be viewed.
@@ -23,12 +53,13 @@ class UserViewSet(viewsets.ReadOnlyModelViewSet):
     permission_classes = [permissions.IsAuthenticated]
 
 
-class PropertyViewSet(viewsets.ModelViewSet):
+class PropertyViewSet(FastListMixin, viewsets.ModelViewSet):
     """
     API endpoint that allows properties to be viewed or edited.
     """
     queryset = Property.objects.all()
     serializer_class = PropertySerializer
+    list_serializer_class = FastPropertySerializer
     permission_classes = [permissions.IsAuthenticated]
     
     def get_queryset(self):
@@ -40,32 +71,32 @@ class PropertyViewSet(viewsets.ModelViewSet):
         serializer.save(user=self.request.user)
 
 
-class ThermostatViewSet(viewsets.ModelViewSet):
+class ThermostatViewSet(ThermostatControlMixin, FastListMixin, viewsets.ModelViewSet):
     """
     API endpoint that allows thermostats to be viewed or edited.
     """
     queryset = Thermostat.objects.all()
     serializer_class = ThermostatSerializer
+    list_serializer_class = FastThermostatSerializer
     permission_classes = [permissions.IsAuthenticated]
     
     def get_queryset(self):
         """Filter thermostats to return only those belonging to the current user's properties"""
-        user_properties = Property.objects.filter(user=self.request.user)
-        return Thermostat.objects.filter(property__in=user_properties)
+        return Thermostat.objects.filter(property__user=self.request.user)
 
 
-class CalendarViewSet(viewsets.ModelViewSet):
+class CalendarViewSet(FastListMixin, viewsets.ModelViewSet):
     """
     API endpoint that allows calendars to be viewed or edited.
     """
     queryset = Calendar.objects.all()
     serializer_class = CalendarSerializer
+    list_serializer_class = FastCalendarSerializer
     permission_classes = [permissions.IsAuthenticated]
     
     def get_queryset(self):
         """Filter calendars to return only those belonging to the current user's properties"""
-        user_properties = Property.objects.filter(user=self.request.user)
-        return Calendar.objects.filter(property__in=user_properties)
+        return Calendar.objects.filter(property__user=self.request.user)
 
 
 class ScheduleViewSet(viewsets.ModelViewSet):
@@ -78,24 +109,36 @@ class ScheduleViewSet(viewsets.ModelViewSet):
     
     def get_queryset(self):
         """Filter schedules to return only those belonging to the current user's thermostats"""
-        user_properties = Property.objects.filter(user=self.request.user)
-        user_thermostats = Thermostat.objects.filter(property__in=user_properties)
-        return Schedule.objects.filter(thermostat__in=user_thermostats)
+        return Schedule.objects.filter(thermostat__property__user=self.request.user)
 
 
-class TemperatureLogViewSet(viewsets.ReadOnlyModelViewSet):
+class TemperatureLogViewSet(FastListMixin, viewsets.ReadOnlyModelViewSet):
     """
     API endpoint that allows temperature logs to be viewed.
     """
     queryset = TemperatureLog.objects.all()
     serializer_class = TemperatureLogSerializer
+    list_serializer_class = FastTemperatureLogSerializer
     permission_classes = [permissions.IsAuthenticated]
     
     def get_queryset(self):
         """Filter temperature logs to return only those belonging to the current user's thermostats"""
-        user_properties = Property.objects.filter(user=self.request.user)
-        user_thermostats = Thermostat.objects.filter(property__in=user_properties)
-        return TemperatureLog.objects.filter(thermostat__in=user_thermostats)
+        return TemperatureLog.objects.filter(thermostat__property__user=self.request.user).order_by('-timestamp')
+    
+    def list(self, request, *args, **kwargs):
+        """
+        Stream unpaginated JSON histories in chunks of LOG_STREAM_CHUNK_SIZE rows,
+        so a thermostat's full log is never held in memory at once.
+        """
+        if self.paginator is not None or not isinstance(request.accepted_renderer, OrjsonRenderer):
+            return super().list(request, *args, **kwargs)
+        
+        rows = self.filter_queryset(self.get_queryset()).iterator(chunk_size=LOG_STREAM_CHUNK_SIZE)
+        batches = (
+            self.list_serializer_class(batch, many=True).data
+            for batch in iter(lambda: list(islice(rows, LOG_STREAM_CHUNK_SIZE)), [])
+        )
+        return StreamingHttpResponse(iter_json_array(batches), content_type=request.accepted_renderer.media_type)
 
 
 class UserRegistrationView(APIView):
@@ -113,7 +156,7 @@ class UserRegistrationView(APIView):
             return Response({
                 'refresh': str(refresh),
                 'access': str(refresh.access_token),
-                'user': UserSerializer(user).data
+                'user': serialize_user(user)
             }, status=status.HTTP_201_CREATED)
         
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
@@ -138,7 +181,7 @@ class UserLoginView(APIView):
                 return Response({
                     'refresh': str(refresh),
                     'access': str(refresh.access_token),
-                    'user': UserSerializer(user).data
+                    'user': serialize_user(user)
                 })
             
             return Response({'error': 'Invalid credentials'}, status=status.HTTP_401_UNAUTHORIZED)
@@ -154,13 +197,21 @@ class UserProfileView(APIView):
     
     def get(self, request):
         user = request.user
-        profile, created = UserProfile.objects.get_or_create(user=user)
-        serializer = UserProfileSerializer(profile)
-        return Response(serializer.data)
+        
+        def serialize_profile():
+            # Only users that predate the ensure_profile signal lack a profile. If a
+            # concurrent first request inserts it first, get_or_create catches the
+            # IntegrityError and re-fetches that row.
+            profile, _ = UserProfile.objects.select_related('user').get_or_create(user=user)
+            return UserProfileSerializer(profile).data
+        
+        # Invalidated by the User/UserProfile signal handlers
+        data = cache.get_or_set(profile_cache_key(user.pk), serialize_profile, PROFILE_CACHE_TIMEOUT)
+        return Response(data)
     
     def put(self, request):
         user = request.user
-        profile = get_object_or_404(UserProfile, user=user)
+        profile = get_object_or_404(UserProfile.objects.select_related('user'), user=user)
         serializer = UserProfileSerializer(profile, data=request.data, partial=True)
         
         if serializer.is_valid():
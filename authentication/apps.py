@@ -3,3 +3,7 @@ from django.apps import AppConfig
 class AuthenticationConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'authentication'
+
+    def ready(self):
+        # Invalidates api.authentication.CachedJWTAuthentication's user cache on user changes
+        import api.authentication  # noqa: F401
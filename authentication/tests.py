@@ -0,0 +1,53 @@
+import sys
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db.models.signals import post_save
+from django.test import TestCase, override_settings
+from rest_framework.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.tokens import AccessToken
+
+User = get_user_model()
+
+# Recorded before anything below imports it: the receiver must be connected at
+# startup, also in processes that save users but never authenticate a request
+LOADED_AT_STARTUP = 'api.authentication' in sys.modules
+
+from api.authentication import CachedJWTAuthentication, auth_user_cache_key  # noqa: E402
+
+
+@override_settings(PASSWORD_HASHERS=['django.contrib.auth.hashers.MD5PasswordHasher'])
+class CachedJWTAuthenticationTests(TestCase):
+    """Test the cached JWT user under the project's own settings"""
+    
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(username='testuser', password='testpassword123')
+        self.token = AccessToken.for_user(self.user)
+        self.authentication = CachedJWTAuthentication()
+    
+    def test_invalidation_receiver_connected_at_startup(self):
+        """Test that user saves are wired to the cache invalidation once apps are ready"""
+        self.assertTrue(LOADED_AT_STARTUP)
+        self.assertTrue(post_save.has_listeners(User))
+    
+    def test_deactivated_user_not_served_from_cache(self):
+        """Test that deactivating a user drops their cached entry"""
+        self.assertEqual(self.authentication.get_user(self.token), self.user)
+        self.assertIsNotNone(cache.get(auth_user_cache_key(self.user.pk)))
+        
+        self.user.is_active = False
+        self.user.save()
+        
+        self.assertIsNone(cache.get(auth_user_cache_key(self.user.pk)))
+        with self.assertRaises(AuthenticationFailed):
+            self.authentication.get_user(self.token)
+    
+    def test_deleted_user_not_served_from_cache(self):
+        """Test that deleting a user drops their cached entry"""
+        self.authentication.get_user(self.token)
+        user_id = self.user.pk
+        
+        self.user.delete()
+        
+        self.assertIsNone(cache.get(auth_user_cache_key(user_id)))
@@ -36,6 +36,10 @@ class Property(models.Model):
         verbose_name = 'Property'
         verbose_name_plural = 'Properties'
         ordering = ['-created_at']
+        indexes = [
+            # Every list filters on the owner and sorts by the default ordering
+            models.Index(fields=['owner', '-created_at']),
+        ]
     
     def __str__(self):
         return self.name
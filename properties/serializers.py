@@ -1,17 +1,26 @@
 from rest_framework import serializers
+
+from api.serializer_mixins import CachedFieldsMixin
 from .models import Property, PropertySettings
 
 
-class PropertySettingsSerializer(serializers.ModelSerializer):
+class PropertySettingsSerializer(CachedFieldsMixin, serializers.ModelSerializer):
+    """Output-only; updates go through PropertySettingsWriteSerializer"""
     class Meta:
         model = PropertySettings
         fields = [
             'id', 'default_temperature', 'away_temperature',
             'energy_saving_mode', 'schedule_enabled'
         ]
+        read_only_fields = fields
+
 
+class PropertySettingsWriteSerializer(PropertySettingsSerializer):
+    class Meta(PropertySettingsSerializer.Meta):
+        read_only_fields = ['id']
 
-class PropertySerializer(serializers.ModelSerializer):
+
+class PropertySerializer(CachedFieldsMixin, serializers.ModelSerializer):
     settings = PropertySettingsSerializer(read_only=True)
     
     class Meta:
@@ -35,3 +44,12 @@ class PropertySerializer(serializers.ModelSerializer):
         PropertySettings.objects.create(property=property_instance)
         
         return property_instance
+
+
+class PropertyListSerializer(PropertySerializer):
+    """List view; leaves out the address and other detail-only columns"""
+    class Meta(PropertySerializer.Meta):
+        fields = [
+            'id', 'name', 'property_type', 'num_bedrooms', 'num_bathrooms',
+            'created_at', 'settings'
+        ]
@@ -1,10 +1,24 @@
 from rest_framework import viewsets, permissions, status
 from rest_framework.decorators import action
 from rest_framework.response import Response
+from django.core.cache import cache
+from django.http import Http404
 from django.shortcuts import get_object_or_404
 
 from .models import Property, PropertySettings
-from .serializers import PropertySerializer, PropertySettingsSerializer
+from .serializers import (
+    PropertySerializer, PropertyListSerializer,
+    PropertySettingsSerializer, PropertySettingsWriteSerializer
+)
+
+
+# Seconds a property's serialized settings are served from cache
+PROPERTY_SETTINGS_CACHE_TIMEOUT = 60
+
+
+def property_settings_cache_key(property_id, owner_id):
+    """Cache key for a property's serialized settings; scoped to the owner who may read them"""
+    return f"property:{property_id}:owner:{owner_id}:settings"
 
 
 class PropertyViewSet(viewsets.ModelViewSet):
@@ -20,23 +34,46 @@ class PropertyViewSet(viewsets.ModelViewSet):
         for the currently authenticated user.
         """
         user = self.request.user
-        return Property.objects.filter(owner=user)
+        # The serializer nests each property's settings; join them in
+        queryset = Property.objects.filter(owner=user).select_related('settings')
+        if self.action == 'list':
+            # Skip the address text and other columns the list serializer leaves out
+            queryset = queryset.only(*PropertyListSerializer.Meta.fields)
+        return queryset
+    
+    def get_serializer_class(self):
+        if self.action == 'list':
+            return PropertyListSerializer
+        return PropertySerializer
     
     @action(detail=True, methods=['get', 'put', 'patch'])
     def settings(self, request, pk=None):
         """
         Retrieve or update property settings.
         """
-        property_instance = get_object_or_404(Property, pk=pk, owner=request.user)
-        settings_instance = get_object_or_404(PropertySettings, property=property_instance)
+        cache_key = property_settings_cache_key(pk, request.user.pk)
+        if request.method == 'GET':
+            data = cache.get(cache_key)
+            if data is not None:
+                return Response(data)
+        
+        property_instance = get_object_or_404(
+            Property.objects.select_related('settings'), pk=pk, owner=request.user
+        )
+        try:
+            settings_instance = property_instance.settings
+        except PropertySettings.DoesNotExist:
+            raise Http404('No PropertySettings matches the given query.')
         
         if request.method == 'GET':
-            serializer = PropertySettingsSerializer(settings_instance)
-            return Response(serializer.data)
+            data = PropertySettingsSerializer(settings_instance).data
+            cache.set(cache_key, data, PROPERTY_SETTINGS_CACHE_TIMEOUT)
+            return Response(data)
         
         # Update settings
-        serializer = PropertySettingsSerializer(settings_instance, data=request.data, partial=True)
+        serializer = PropertySettingsWriteSerializer(settings_instance, data=request.data, partial=True)
         if serializer.is_valid():
             serializer.save()
+            cache.delete(cache_key)
             return Response(serializer.data)
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
@@ -8,6 +8,14 @@ To keep the rest of the application decoupled from vendor-specific details,
 integrations are provided via a factory function defined in ``factory.py``.
 """
 
-from .factory import VendorIntegrationFactory, BaseVendorIntegration
+__all__ = ["VendorIntegrationFactory", "BaseVendorIntegration"]
 
-__all__ = ["VendorIntegrationFactory", "BaseVendorIntegration"]
\ No newline at end of file
+
+def __getattr__(name):
+    # Import the factory (and its HTTP session and models) on first use rather
+    # than whenever anything under ``src`` is imported, e.g. ``src.main``.
+    if name in __all__:
+        from . import factory
+
+        return getattr(factory, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -16,15 +16,36 @@ Note:
 from __future__ import annotations
 
 from typing import Type
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
 from src.models.vendor_account import VendorAccount, VendorType
 
 
+# One pooled session for all vendor calls, so connections (and their TLS
+# handshakes) are kept alive and reused across integrations and requests.
+_SESSION = requests.Session()
+_SESSION.mount(
+    "https://",
+    HTTPAdapter(
+        pool_connections=32,
+        pool_maxsize=64,
+        max_retries=Retry(total=3, backoff_factor=0.3),
+    ),
+)
+
+
 class BaseVendorIntegration:
     """Abstract base class for vendor integrations.
 
-    Implementations should override methods to perform actual API calls.
+    Implementations should override methods to perform actual API calls,
+    issuing them through ``self.session`` rather than a new session.
     """
 
+    session: requests.Session = _SESSION
+
     def __init__(self, account: VendorAccount) -> None:
         self.account = account
 
@@ -78,6 +99,9 @@ class VendorIntegrationFactory:
             account: The ``VendorAccount`` instance representing an external
                 thermostat vendor account.
 
+        Integrations are cheap per-call wrappers around ``account``; state
+        worth sharing, such as the pooled HTTP session, lives on the class.
+
         Raises:
             ValueError: If no integration is registered for the account's vendor.
         """
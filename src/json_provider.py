@@ -0,0 +1,45 @@
+import orjson
+from flask import current_app, request
+from flask.json.provider import DefaultJSONProvider
+
+
+class OrjsonProvider(DefaultJSONProvider):
+    """Flask JSON provider that encodes and decodes with orjson.
+
+    orjson writes datetimes, dates and enums natively (datetimes in the same
+    ISO 8601 form as ``isoformat()``), so model ``to_dict()`` methods can
+    return datetime and enum columns as they are. Anything else orjson does
+    not know falls back to Flask's default handler.
+
+    Keys are written in insertion order, which is the order ``to_dict()``
+    builds them in; sorting every object's keys is skipped per response.
+    """
+
+    sort_keys = False
+
+    def _option(self):
+        option = orjson.OPT_NON_STR_KEYS
+        if self.sort_keys:
+            option |= orjson.OPT_SORT_KEYS
+        return option
+
+    def dumps(self, obj, **kwargs):
+        return orjson.dumps(obj, default=self.default, option=self._option()).decode()
+
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+
+    def response(self, *args, **kwargs):
+        # Hand orjson's bytes straight to the response instead of going through str
+        obj = self._prepare_response_obj(args, kwargs)
+        body = orjson.dumps(obj, default=self.default, option=self._option())
+        return self._app.response_class(body, mimetype=self.mimetype)
+
+
+def conditional_json(body, etag):
+    """JSON response with an ETag clients must revalidate; an empty 304 when If-None-Match matches"""
+    response = current_app.response_class(body, mimetype='application/json')
+    response.set_etag(etag)
+    response.cache_control.private = True
+    response.cache_control.no_cache = True
+    return response.make_conditional(request)
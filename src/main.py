@@ -1,11 +1,15 @@
 import os
+import sqlite3
 import sys
 sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))  # DON'T CHANGE THIS !!!
 
 from flask import Flask, jsonify
 from flask_sqlalchemy import SQLAlchemy
 from flask_cors import CORS
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
 from src.models.base import db
+from src.json_provider import OrjsonProvider
 from src.routes.auth import auth_bp
 from src.routes.properties import properties_bp
 from src.routes.thermostats import thermostats_bp
@@ -17,14 +21,37 @@ from src.routes.vendor_nest import vendor_nest_bp
 from src.routes.vendor_nethome import vendor_nethome_bp
 
 app = Flask(__name__)
+app.json = OrjsonProvider(app)
 app.config['SECRET_KEY'] = os.getenv('SECRET_KEY', 'dev_key_12345')
 
 # Enable CORS for frontend requests
 CORS(app, resources={r"/api/*": {"origins": "https://smartstatfront.onrender.com"}})
 
-# Switch to SQLite for deployment compatibility
-app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite:///thermostat_system.db'
+# Use DATABASE_URL (e.g. a pooled Postgres server) when set; fall back to SQLite for deployment compatibility
+DATABASE_URL = os.getenv('DATABASE_URL')
+app.config['SQLALCHEMY_DATABASE_URI'] = DATABASE_URL or 'sqlite:///thermostat_system.db'
 app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
+if DATABASE_URL and not DATABASE_URL.startswith('sqlite'):
+    # One pool per gunicorn worker; size it to the worker's threads (see deployment_guide.md)
+    app.config['SQLALCHEMY_ENGINE_OPTIONS'] = {
+        'pool_size': int(os.getenv('DB_POOL_SIZE', '10')),
+        'max_overflow': int(os.getenv('DB_MAX_OVERFLOW', '20')),
+        'pool_pre_ping': True,
+        'pool_recycle': 300,
+    }
+
+
+@event.listens_for(Engine, 'connect')
+def set_sqlite_pragmas(dbapi_connection, connection_record):
+    """Let SQLite readers run alongside a writer (WAL) and give it a 64 MB page cache"""
+    if not isinstance(dbapi_connection, sqlite3.Connection):
+        return
+    cursor = dbapi_connection.cursor()
+    cursor.execute('PRAGMA journal_mode=WAL')
+    cursor.execute('PRAGMA synchronous=NORMAL')
+    cursor.execute('PRAGMA cache_size=-64000')
+    cursor.close()
+
 
 db.init_app(app)
 
@@ -56,9 +83,11 @@ def health():
         'database': 'connected'
     })
 
-# Create database tables
-with app.app_context():
-    db.create_all()
+# Create database tables; on by default only for the SQLite fallback,
+# set CREATE_TABLES=1 to run it against DATABASE_URL
+if os.getenv('CREATE_TABLES', '0' if DATABASE_URL else '1') == '1':
+    with app.app_context():
+        db.create_all()
 
 if __name__ == '__main__':
     app.run(host='0.0.0.0', port=5000, debug=True)
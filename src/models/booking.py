@@ -7,7 +7,7 @@ class Booking(db.Model, BaseModel):
     __tablename__ = 'bookings'
     
     id = db.Column(db.Integer, primary_key=True)
-    calendar_id = db.Column(db.Integer, db.ForeignKey('calendars.id'), nullable=False)
+    calendar_id = db.Column(db.Integer, db.ForeignKey('calendars.id'), nullable=False, index=True)
     guest_name = db.Column(db.String(255), nullable=True)
     check_in = db.Column(db.DateTime, nullable=False)
     check_out = db.Column(db.DateTime, nullable=False)
@@ -23,12 +23,12 @@ class Booking(db.Model, BaseModel):
             'id': self.id,
             'calendar_id': self.calendar_id,
             'guest_name': self.guest_name,
-            'check_in': self.check_in.isoformat(),
-            'check_out': self.check_out.isoformat(),
+            'check_in': self.check_in,
+            'check_out': self.check_out,
             'booking_reference': self.booking_reference,
             'source': self.source,
-            'created_at': self.created_at.isoformat(),
-            'updated_at': self.updated_at.isoformat()
+            'created_at': self.created_at,
+            'updated_at': self.updated_at
         }
     
     @property
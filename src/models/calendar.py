@@ -9,7 +9,7 @@ class Calendar(db.Model, BaseModel):
     name = db.Column(db.String(255), nullable=False)
     source_type = db.Column(db.String(50), nullable=False)  # 'google', 'ical', etc.
     source_url = db.Column(db.String(1024), nullable=False)  # URL or identifier for the calendar
-    property_id = db.Column(db.Integer, db.ForeignKey('properties.id'), nullable=False)
+    property_id = db.Column(db.Integer, db.ForeignKey('properties.id'), nullable=False, index=True)
     last_synced = db.Column(db.DateTime, nullable=True)
     
     # Relationships
@@ -24,7 +24,7 @@ class Calendar(db.Model, BaseModel):
             'source_type': self.source_type,
             'source_url': self.source_url,
             'property_id': self.property_id,
-            'last_synced': self.last_synced.isoformat() if self.last_synced else None,
-            'created_at': self.created_at.isoformat(),
-            'updated_at': self.updated_at.isoformat()
+            'last_synced': self.last_synced,
+            'created_at': self.created_at,
+            'updated_at': self.updated_at
         }
@@ -12,7 +12,7 @@ class Property(db.Model, BaseModel):
     state = db.Column(db.String(100), nullable=False)
     zip_code = db.Column(db.String(20), nullable=False)
     country = db.Column(db.String(100), nullable=False)
-    user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False)
+    user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False, index=True)
     
     # Relationships
     user = db.relationship('User', back_populates='properties')
@@ -30,6 +30,6 @@ class Property(db.Model, BaseModel):
             'zip_code': self.zip_code,
             'country': self.country,
             'user_id': self.user_id,
-            'created_at': self.created_at.isoformat(),
-            'updated_at': self.updated_at.isoformat()
+            'created_at': self.created_at,
+            'updated_at': self.updated_at
         }
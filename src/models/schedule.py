@@ -13,7 +13,7 @@ class Schedule(db.Model, BaseModel):
     __tablename__ = 'schedules'
     
     id = db.Column(db.Integer, primary_key=True)
-    thermostat_id = db.Column(db.Integer, db.ForeignKey('thermostats.id'), nullable=False)
+    thermostat_id = db.Column(db.Integer, db.ForeignKey('thermostats.id'), nullable=False, index=True)
     schedule_type = db.Column(db.Enum(ScheduleType), nullable=False)
     
     # Schedule settings
@@ -35,14 +35,14 @@ class Schedule(db.Model, BaseModel):
         return {
             'id': self.id,
             'thermostat_id': self.thermostat_id,
-            'schedule_type': self.schedule_type.value,
+            'schedule_type': self.schedule_type,
             'hours_before_checkin': self.hours_before_checkin,
             'hours_after_checkout': self.hours_after_checkout,
             'target_temperature': self.target_temperature,
             'is_cooling': self.is_cooling,
             'is_active': self.is_active,
-            'start_time': self.start_time.isoformat() if self.start_time else None,
-            'end_time': self.end_time.isoformat() if self.end_time else None,
-            'created_at': self.created_at.isoformat(),
-            'updated_at': self.updated_at.isoformat()
+            'start_time': self.start_time,
+            'end_time': self.end_time,
+            'created_at': self.created_at,
+            'updated_at': self.updated_at
         }
@@ -10,12 +10,18 @@ class ThermostatType(enum.Enum):
 class Thermostat(db.Model, BaseModel):
     """Thermostat model for storing thermostat information"""
     __tablename__ = 'thermostats'
+    # Partial index for the offline-thermostat alerts; only offline rows are indexed
+    __table_args__ = (
+        db.Index('ix_thermostats_offline_property', 'property_id',
+                 postgresql_where=db.text('is_online IS NOT true'),
+                 sqlite_where=db.text('is_online IS NOT 1')),
+    )
     
     id = db.Column(db.Integer, primary_key=True)
     name = db.Column(db.String(255), nullable=False)
     device_id = db.Column(db.String(255), nullable=False)
     type = db.Column(db.Enum(ThermostatType), nullable=False)
-    property_id = db.Column(db.Integer, db.ForeignKey('properties.id'), nullable=False)
+    property_id = db.Column(db.Integer, db.ForeignKey('properties.id'), nullable=False, index=True)
     
     # Device-specific fields
     api_key = db.Column(db.String(255), nullable=True)  # For API authentication
@@ -36,14 +42,14 @@ class Thermostat(db.Model, BaseModel):
             'id': self.id,
             'name': self.name,
             'device_id': self.device_id,
-            'type': self.type.value,
+            'type': self.type,
             'property_id': self.property_id,
             'api_key': self.api_key,
             'ip_address': self.ip_address,
             'last_status': self.last_status,
             'last_temperature': self.last_temperature,
-            'last_updated': self.last_updated.isoformat() if self.last_updated else None,
+            'last_updated': self.last_updated,
             'is_online': self.is_online,
-            'created_at': self.created_at.isoformat(),
-            'updated_at': self.updated_at.isoformat()
+            'created_at': self.created_at,
+            'updated_at': self.updated_at
         }
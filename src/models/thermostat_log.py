@@ -11,6 +11,14 @@ class LogType(enum.Enum):
 class ThermostatLog(db.Model, BaseModel):
     """Log model for storing thermostat activity logs"""
     __tablename__ = 'thermostat_logs'
+    # Logs are read per thermostat, newest first, often over a created_at range and for one log_type
+    __table_args__ = (
+        db.Index('ix_thermostat_logs_thermostat_created_type', 'thermostat_id', db.text('created_at DESC'), 'log_type'),
+        # System-wide counts over a recent created_at window, split by log_type
+        db.Index('ix_thermostat_logs_created_type', 'created_at', 'log_type'),
+        # Keyset pagination over all logs, newest first
+        db.Index('ix_thermostat_logs_created_id', db.text('created_at DESC'), db.text('id DESC')),
+    )
     
     id = db.Column(db.Integer, primary_key=True)
     thermostat_id = db.Column(db.Integer, db.ForeignKey('thermostats.id'), nullable=False)
@@ -26,9 +34,9 @@ class ThermostatLog(db.Model, BaseModel):
         return {
             'id': self.id,
             'thermostat_id': self.thermostat_id,
-            'log_type': self.log_type.value,
+            'log_type': self.log_type,
             'message': self.message,
             'details': self.details,
-            'created_at': self.created_at.isoformat(),
-            'updated_at': self.updated_at.isoformat()
+            'created_at': self.created_at,
+            'updated_at': self.updated_at
         }
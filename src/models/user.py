@@ -1,6 +1,17 @@
 from src.models.base import db, BaseModel
-from werkzeug.security import generate_password_hash, check_password_hash
+from argon2 import PasswordHasher
+from argon2.exceptions import InvalidHashError, VerificationError
+from werkzeug.security import check_password_hash
 import enum
+import os
+
+# Argon2id, hashed in C. The cost can be tuned per deployment to hit a login latency budget;
+# hashes made with other parameters are upgraded on the user's next login.
+password_hasher = PasswordHasher(
+    time_cost=int(os.getenv('ARGON2_TIME_COST', '2')),
+    memory_cost=int(os.getenv('ARGON2_MEMORY_COST', str(64 * 1024))),  # KiB
+    parallelism=int(os.getenv('ARGON2_PARALLELISM', '2')),
+)
 
 class UserRole(enum.Enum):
     ADMIN = "admin"
@@ -10,6 +21,12 @@ class UserRole(enum.Enum):
 class User(db.Model, BaseModel):
     """User model for authentication and access control"""
     __tablename__ = 'users'
+    # Partial index for listing active users by role
+    __table_args__ = (
+        db.Index('ix_users_active_role', 'role',
+                 postgresql_where=db.text('is_active = true'),
+                 sqlite_where=db.text('is_active = 1')),
+    )
     
     id = db.Column(db.Integer, primary_key=True)
     email = db.Column(db.String(255), unique=True, nullable=False)
@@ -24,11 +41,22 @@ class User(db.Model, BaseModel):
     
     def set_password(self, password):
         """Set the password hash"""
-        self.password_hash = generate_password_hash(password)
+        self.password_hash = password_hasher.hash(password)
         
     def check_password(self, password):
-        """Check if the password is correct"""
-        return check_password_hash(self.password_hash, password)
+        """Check if the password is correct; also accepts older werkzeug hashes"""
+        if not self.password_hash.startswith('$argon2'):
+            return check_password_hash(self.password_hash, password)
+        try:
+            return password_hasher.verify(self.password_hash, password)
+        except (VerificationError, InvalidHashError):
+            return False
+    
+    def password_needs_rehash(self):
+        """Whether the stored hash is a werkzeug hash or uses outdated Argon2 parameters"""
+        if not self.password_hash.startswith('$argon2'):
+            return True
+        return password_hasher.check_needs_rehash(self.password_hash)
     
     def to_dict(self):
         """Convert user to dictionary"""
@@ -37,8 +65,8 @@ class User(db.Model, BaseModel):
             'email': self.email,
             'first_name': self.first_name,
             'last_name': self.last_name,
-            'role': self.role.value,
+            'role': self.role,
             'is_active': self.is_active,
-            'created_at': self.created_at.isoformat(),
-            'updated_at': self.updated_at.isoformat()
+            'created_at': self.created_at,
+            'updated_at': self.updated_at
         }
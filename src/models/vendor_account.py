@@ -53,7 +53,7 @@ class VendorAccount(db.Model, BaseModel):
     account_name = db.Column(db.String(255), nullable=True)
     #: Optional foreign key linking this account to a specific property.  Null
     #: indicates a global account.
-    property_id = db.Column(db.Integer, db.ForeignKey("properties.id"), nullable=True)
+    property_id = db.Column(db.Integer, db.ForeignKey("properties.id"), nullable=True, index=True)
     #: API key for vendors that use static credentials (e.g. Cielo, NetHome/Pioneer).
     api_key = db.Column(db.String(512), nullable=True)
     #: Access token for OAuth-based vendors (e.g. Nest).  May expire.
@@ -75,17 +75,26 @@ class VendorAccount(db.Model, BaseModel):
             return False
         return datetime.utcnow() >= self.expires_at
 
-    def to_dict(self) -> dict:
-        """Serialize the vendor account to a dictionary for JSON responses."""
-        return {
+    def to_dict(self, include_secrets: bool = False) -> dict:
+        """Serialize the vendor account to a dictionary for JSON responses.
+
+        Credentials are left out unless ``include_secrets`` is ``True``;
+        the ``has_*`` flags say which ones are set without sending them.
+        """
+        data = {
             "id": self.id,
-            "vendor": self.vendor.value,
+            "vendor": self.vendor,
             "account_name": self.account_name,
             "property_id": self.property_id,
-            "api_key": self.api_key,
-            "access_token": self.access_token,
-            "refresh_token": self.refresh_token,
-            "expires_at": self.expires_at.isoformat() if self.expires_at else None,
-            "created_at": self.created_at.isoformat(),
-            "updated_at": self.updated_at.isoformat(),
-        }
\ No newline at end of file
+            "has_api_key": self.api_key is not None,
+            "has_access_token": self.access_token is not None,
+            "has_refresh_token": self.refresh_token is not None,
+            "expires_at": self.expires_at,
+            "created_at": self.created_at,
+            "updated_at": self.updated_at,
+        }
+        if include_secrets:
+            data["api_key"] = self.api_key
+            data["access_token"] = self.access_token
+            data["refresh_token"] = self.refresh_token
+        return data
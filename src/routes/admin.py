@@ -1,195 +1,367 @@
-from flask import Blueprint, request, jsonify
+from flask import Blueprint, Response, current_app, request, jsonify, send_file, stream_with_context, url_for
+from src.json_provider import conditional_json
 from src.routes.auth import token_required, role_required
 from src.models.user import UserRole
 from src.models.thermostat_log import ThermostatLog, LogType
 from src.models.property import Property
 from src.models.thermostat import Thermostat
 from src.models.base import db
+from sqlalchemy import event
+from sqlalchemy.orm import joinedload
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
+from functools import lru_cache
+import base64
+import binascii
+import csv
+import hashlib
+import os
+import re
+import time
+import uuid
 
 admin_bp = Blueprint('admin', __name__)
 
-@admin_bp.route('/logs', methods=['GET'])
-@token_required
-@role_required([UserRole.ADMIN])
-def get_all_logs():
-    """Get all system logs (admin only)"""
-    # Get query parameters for filtering
-    start_date = request.args.get('start_date')
-    end_date = request.args.get('end_date')
-    log_type = request.args.get('log_type')
-    property_id = request.args.get('property_id')
-    limit = request.args.get('limit', 100, type=int)
-    offset = request.args.get('offset', 0, type=int)
+# Largest page get_all_logs will return
+LOGS_MAX_LIMIT = 1000
+
+# Rows fetched from the database per batch while writing a CSV export
+EXPORT_BATCH_SIZE = 1000
+
+# Exports with more rows than this are written in the background instead of streamed
+EXPORT_ASYNC_THRESHOLD = 50000
+EXPORT_JOB_ID = re.compile(r'[0-9a-f]{32}')
+
+# Seconds a running export may leave its .part file untouched before the job is
+# presumed lost (e.g. the process restarted), and seconds finished exports are kept
+EXPORT_STALE_AFTER = 15 * 60
+EXPORT_RETENTION = 24 * 60 * 60
+
+# Background export jobs; few workers, since each one holds a database connection
+_export_executor = ThreadPoolExecutor(max_workers=2)
+
+# log_type filter values, looked up without constructing or failing an enum lookup
+_LOG_TYPES = {t.value: t for t in LogType}
+_LOG_TYPE_VALUES = ", ".join(_LOG_TYPES)
+
+class _Echo:
+    """File-like object whose write() returns the value, so csv.writer rows can be yielded"""
+    def write(self, value):
+        return value
+
+def _csv_safe(value):
+    """Neutralise spreadsheet formula injection in a free-text CSV cell"""
+    if value and value[0] in ('=', '+', '-', '@', '\t', '\r'):
+        return "'" + value
+    return value
+
+# Seconds the dashboard status and alert payloads are served from memory
+DASHBOARD_CACHE_TIMEOUT = 30
+
+# Per-process cache of dashboard responses: key -> (expires_at, JSON body, ETag)
+_dashboard_cache = {}
+
+def _cached_response(key, build):
+    """
+    JSON response for build(), reusing the encoded body for DASHBOARD_CACHE_TIMEOUT
+    seconds; pollers that send the body's ETag back get an empty 304 instead
+    """
+    now = time.monotonic()
+    entry = _dashboard_cache.get(key)
+    if entry is None or entry[0] <= now:
+        body = jsonify(build()).get_data()
+        entry = (now + DASHBOARD_CACHE_TIMEOUT, body, hashlib.blake2b(body, digest_size=16).hexdigest())
+        _dashboard_cache[key] = entry
+    return conditional_json(entry[1], entry[2])
+
+def _encode_log_cursor(log):
+    """Opaque keyset cursor for the position just after log in (created_at, id) DESC order"""
+    return base64.urlsafe_b64encode(f"{log.created_at.isoformat()}|{log.id}".encode()).decode()
+
+def _decode_log_cursor(cursor):
+    """Return (created_at, id) from a cursor; raises ValueError if it is malformed"""
+    try:
+        created_at, log_id = base64.urlsafe_b64decode(cursor.encode()).decode().split('|')
+    except (binascii.Error, UnicodeError):
+        raise ValueError('malformed cursor')
+    return datetime.fromisoformat(created_at), int(log_id)
+
+@event.listens_for(ThermostatLog, 'after_insert')
+def _clear_dashboard_cache(mapper, connection, target):
+    # New logs change the error counts and alerts; drop everything rather than track keys
+    _dashboard_cache.clear()
+
+@lru_cache(maxsize=1024)
+def _parse_iso(value):
+    # Dashboards poll with the same few date bounds, so most calls are cache hits
+    return datetime.fromisoformat(value)
+
+def _parse_log_filters(args):
+    """
+    Validated (start_date, end_date, log_type, property_id) from the query
+    args, each None when absent; raises ValueError with a client-facing message
+    """
+    start_date = args.get('start_date')
+    end_date = args.get('end_date')
+    log_type = args.get('log_type')
+    property_id = args.get('property_id')
+    
+    try:
+        start_date = _parse_iso(start_date) if start_date else None
+    except ValueError:
+        raise ValueError('Invalid start_date format')
+    
+    try:
+        end_date = _parse_iso(end_date) if end_date else None
+    except ValueError:
+        raise ValueError('Invalid end_date format')
+    
+    if log_type and log_type not in _LOG_TYPES:
+        raise ValueError(f'Invalid log_type. Must be one of: {_LOG_TYPE_VALUES}')
+    log_type = _LOG_TYPES.get(log_type)
+    
+    try:
+        property_id = int(property_id) if property_id else None
+    except ValueError:
+        raise ValueError('Invalid property_id')
+    
+    return start_date, end_date, log_type, property_id
+
+def _filtered_logs_query(args):
+    """ThermostatLog query narrowed by the filters in args; raises ValueError like _parse_log_filters"""
+    start_date, end_date, log_type, property_id = _parse_log_filters(args)
     
     # Base query
     query = ThermostatLog.query
     
     # Apply filters if provided
     if start_date:
-        try:
-            start_date = datetime.fromisoformat(start_date)
-            query = query.filter(ThermostatLog.created_at >= start_date)
-        except:
-            return jsonify({'error': 'Invalid start_date format'}), 400
-    
+        query = query.filter(ThermostatLog.created_at >= start_date)
     if end_date:
-        try:
-            end_date = datetime.fromisoformat(end_date)
-            query = query.filter(ThermostatLog.created_at <= end_date)
-        except:
-            return jsonify({'error': 'Invalid end_date format'}), 400
-    
+        query = query.filter(ThermostatLog.created_at <= end_date)
     if log_type:
-        try:
-            log_type = LogType(log_type)
-            query = query.filter(ThermostatLog.log_type == log_type)
-        except:
-            return jsonify({'error': f'Invalid log_type. Must be one of: {", ".join([t.value for t in LogType])}'}), 400
-    
+        query = query.filter(ThermostatLog.log_type == log_type)
     if property_id:
-        # Get all thermostats for the property
-        thermostats = Thermostat.query.filter_by(property_id=property_id).all()
-        thermostat_ids = [t.id for t in thermostats]
+        # Only logs from the property's thermostats
+        thermostat_ids = db.session.query(Thermostat.id).filter(Thermostat.property_id == property_id)
         query = query.filter(ThermostatLog.thermostat_id.in_(thermostat_ids))
     
-    # Get total count before pagination
-    total_count = query.count()
+    return query
+
+@admin_bp.route('/logs', methods=['GET'])
+@token_required
+@role_required([UserRole.ADMIN])
+def get_all_logs(current_user):
+    """
+    Get all system logs (admin only), newest first.
+    Page with the returned next_cursor; offset still works but is deprecated,
+    since deep offsets scan and discard every skipped row. total_count is only
+    returned on the first page of a cursor walk.
+    """
+    # Get query parameters for paging
+    cursor = request.args.get('cursor')
+    limit = request.args.get('limit', 100, type=int)
+    offset = request.args.get('offset', 0, type=int)
+    if not 1 <= limit <= LOGS_MAX_LIMIT:
+        return jsonify({'error': f'limit must be between 1 and {LOGS_MAX_LIMIT}'}), 400
+    if offset < 0:
+        return jsonify({'error': 'offset must not be negative'}), 400
+    
+    try:
+        query = _filtered_logs_query(request.args)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
     
-    # Apply pagination
-    logs = query.order_by(ThermostatLog.created_at.desc()).limit(limit).offset(offset).all()
+    # Counting scans every matching row, so only the first page of a cursor walk pays
+    # for it; later pages return null. Offset paging still counts on every page.
+    total_count = None if cursor else query.count()
+    
+    # Apply pagination; a cursor seeks straight past the last row of the previous page
+    query = query.order_by(ThermostatLog.created_at.desc(), ThermostatLog.id.desc())
+    if cursor:
+        try:
+            cursor_created_at, cursor_id = _decode_log_cursor(cursor)
+        except ValueError:
+            return jsonify({'error': 'Invalid cursor'}), 400
+        query = query.filter(
+            db.tuple_(ThermostatLog.created_at, ThermostatLog.id) < db.tuple_(cursor_created_at, cursor_id)
+        )
+    elif offset:
+        query = query.offset(offset)
+    logs = query.limit(limit).all()
     
     return jsonify({
         'logs': [log.to_dict() for log in logs],
         'count': len(logs),
         'total_count': total_count,
         'limit': limit,
-        'offset': offset
+        'offset': offset,
+        'next_cursor': _encode_log_cursor(logs[-1]) if logs and len(logs) == limit else None
     }), 200
 
 @admin_bp.route('/logs/export', methods=['GET'])
 @token_required
 @role_required([UserRole.ADMIN])
-def export_logs():
-    """Export logs as CSV (admin only)"""
-    # Get query parameters for filtering
-    start_date = request.args.get('start_date')
-    end_date = request.args.get('end_date')
-    log_type = request.args.get('log_type')
-    property_id = request.args.get('property_id')
-    
-    # Base query
-    query = ThermostatLog.query
-    
-    # Apply filters if provided
-    if start_date:
-        try:
-            start_date = datetime.fromisoformat(start_date)
-            query = query.filter(ThermostatLog.created_at >= start_date)
-        except:
-            return jsonify({'error': 'Invalid start_date format'}), 400
-    
-    if end_date:
-        try:
-            end_date = datetime.fromisoformat(end_date)
-            query = query.filter(ThermostatLog.created_at <= end_date)
-        except:
-            return jsonify({'error': 'Invalid end_date format'}), 400
+def export_logs(current_user):
+    """
+    Export logs as CSV (admin only). Up to EXPORT_ASYNC_THRESHOLD rows are
+    streamed straight back; larger exports are written to a file in the
+    background and fetched from the returned status_url once ready.
+    """
+    try:
+        query = _filtered_logs_query(request.args)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
     
-    if log_type:
-        try:
-            log_type = LogType(log_type)
-            query = query.filter(ThermostatLog.log_type == log_type)
-        except:
-            return jsonify({'error': f'Invalid log_type. Must be one of: {", ".join([t.value for t in LogType])}'}), 400
+    if query.count() > EXPORT_ASYNC_THRESHOLD:
+        job_id = uuid.uuid4().hex
+        path = _export_path(job_id)
+        _prune_exports(os.path.dirname(path))
+        open(path + '.part', 'w').close()  # marks the job pending for any worker process
+        _export_executor.submit(
+            _write_export, current_app._get_current_object(), request.args.to_dict(), path
+        )
+        return jsonify({
+            'status': 'pending',
+            'job_id': job_id,
+            'status_url': url_for('admin.get_export', job_id=job_id)
+        }), 202
     
-    if property_id:
-        # Get all thermostats for the property
-        thermostats = Thermostat.query.filter_by(property_id=property_id).all()
-        thermostat_ids = [t.id for t in thermostats]
-        query = query.filter(ThermostatLog.thermostat_id.in_(thermostat_ids))
+    # Fetch in batches as rows are written, so memory stays flat for any date range
+    logs = query.order_by(ThermostatLog.created_at.desc()).yield_per(EXPORT_BATCH_SIZE)
     
-    # Get all logs
-    logs = query.order_by(ThermostatLog.created_at.desc()).all()
+    return Response(
+        stream_with_context(_log_csv_lines(logs)),
+        mimetype='text/csv',
+        headers={'Content-Disposition': 'attachment; filename=logs.csv'}
+    )
+
+@admin_bp.route('/logs/export/<job_id>', methods=['GET'])
+@token_required
+@role_required([UserRole.ADMIN])
+def get_export(current_user, job_id):
+    """Download a background log export, or report that it is still running (admin only)"""
+    if not EXPORT_JOB_ID.fullmatch(job_id):
+        return jsonify({'error': 'Export not found'}), 404
     
-    # Generate CSV content
-    csv_content = "id,thermostat_id,log_type,message,created_at\n"
+    path = _export_path(job_id)
+    if os.path.exists(path):
+        return send_file(path, mimetype='text/csv', as_attachment=True, download_name='logs.csv')
+    if os.path.exists(path + '.part'):
+        # The writer keeps .part's mtime fresh as rows are written; an idle one belongs to a lost job
+        if time.time() - os.path.getmtime(path + '.part') <= EXPORT_STALE_AFTER:
+            return jsonify({'status': 'pending', 'job_id': job_id}), 202
+        return jsonify({'status': 'failed', 'job_id': job_id}), 500
+    if os.path.exists(path + '.failed'):
+        return jsonify({'status': 'failed', 'job_id': job_id}), 500
+    return jsonify({'error': 'Export not found'}), 404
+
+def _log_csv_lines(logs):
+    writer = csv.writer(_Echo())
+    # Byte order mark so spreadsheet apps read the file as UTF-8
+    yield '\ufeff' + writer.writerow(['id', 'thermostat_id', 'log_type', 'message', 'created_at'])
     for log in logs:
-        csv_content += f"{log.id},{log.thermostat_id},{log.log_type.value},\"{log.message}\",{log.created_at.isoformat()}\n"
-    
-    # Return CSV response
-    response = jsonify({
-        'csv': csv_content,
-        'count': len(logs)
-    })
-    
-    return response, 200
+        yield writer.writerow([
+            log.id, log.thermostat_id, log.log_type.value,
+            _csv_safe(log.message), log.created_at.isoformat()
+        ])
+
+def _export_path(job_id):
+    directory = os.path.join(current_app.instance_path, 'exports')
+    os.makedirs(directory, exist_ok=True)
+    return os.path.join(directory, f'{job_id}.csv')
+
+def _prune_exports(directory):
+    """Delete exports, failure markers and abandoned .part files older than EXPORT_RETENTION"""
+    cutoff = time.time() - EXPORT_RETENTION
+    for entry in os.scandir(directory):
+        try:
+            if entry.stat().st_mtime < cutoff:
+                os.remove(entry.path)
+        except FileNotFoundError:
+            pass  # removed by a concurrent prune or finished job
+
+def _write_export(app, filters, path):
+    """Background job: write the filtered logs to path, via path.part, or leave path.failed"""
+    with app.app_context():
+        try:
+            query = _filtered_logs_query(filters)
+            logs = query.order_by(ThermostatLog.created_at.desc()).yield_per(EXPORT_BATCH_SIZE)
+            with open(path + '.part', 'w', newline='', encoding='utf-8') as f:
+                f.writelines(_log_csv_lines(logs))
+            os.replace(path + '.part', path)
+        except Exception:
+            app.logger.exception('Log export to %s failed', path)
+            open(path + '.failed', 'w').close()
+            if os.path.exists(path + '.part'):
+                os.remove(path + '.part')
+        finally:
+            db.session.remove()
 
 @admin_bp.route('/alerts', methods=['GET'])
 @token_required
 def get_alerts(current_user):
     """Get system alerts"""
+    # Admins all see the same alerts, so they share one cache entry
+    is_admin = current_user.role == UserRole.ADMIN
+    cache_key = 'alerts:admin' if is_admin else f'alerts:{current_user.id}'
+    return _cached_response(cache_key, lambda: _build_alerts(current_user, is_admin))
+
+def _build_alerts(current_user, is_admin):
     # For non-admin users, only show alerts for their properties
-    if current_user.role != UserRole.ADMIN:
-        properties = Property.query.filter_by(user_id=current_user.id).all()
-        property_ids = [p.id for p in properties]
-        thermostats = Thermostat.query.filter(Thermostat.property_id.in_(property_ids)).all()
-    else:
-        thermostats = Thermostat.query.all()
-    
-    thermostat_ids = [t.id for t in thermostats]
+    thermostats = Thermostat.query
+    if not is_admin:
+        property_ids = db.session.query(Property.id).filter(Property.user_id == current_user.id)
+        thermostats = thermostats.filter(Thermostat.property_id.in_(property_ids))
     
     # Get recent error logs
     recent_time = datetime.utcnow() - timedelta(hours=24)
     error_logs = ThermostatLog.query.filter(
-        ThermostatLog.thermostat_id.in_(thermostat_ids),
+        ThermostatLog.thermostat_id.in_(thermostats.with_entities(Thermostat.id)),
         ThermostatLog.log_type == LogType.ERROR,
         ThermostatLog.created_at >= recent_time
     ).order_by(ThermostatLog.created_at.desc()).all()
     
-    # Get offline thermostats
-    offline_thermostats = []
-    for thermostat in thermostats:
-        if not thermostat.is_online:
-            property = Property.query.get(thermostat.property_id)
-            offline_thermostats.append({
-                'thermostat': thermostat.to_dict(),
-                'property': property.to_dict()
-            })
+    # Get offline thermostats (is_online false or unknown), each with its property joined in
+    offline = thermostats.filter(Thermostat.is_online.isnot(True)).options(joinedload(Thermostat.property)).all()
+    offline_thermostats = [
+        {
+            'thermostat': thermostat.to_dict(),
+            'property': thermostat.property.to_dict()
+        }
+        for thermostat in offline
+    ]
     
-    return jsonify({
+    return {
         'error_logs': [log.to_dict() for log in error_logs],
         'offline_thermostats': offline_thermostats
-    }), 200
+    }
 
 @admin_bp.route('/system/status', methods=['GET'])
 @token_required
 @role_required([UserRole.ADMIN])
-def get_system_status():
+def get_system_status(current_user):
     """Get system status information (admin only)"""
-    # Count users
-    user_count = db.session.query(db.func.count(db.distinct(Property.user_id))).scalar()
-    
-    # Count properties
-    property_count = db.session.query(db.func.count(Property.id)).scalar()
-    
-    # Count thermostats
-    thermostat_count = db.session.query(db.func.count(Thermostat.id)).scalar()
-    
-    # Count online thermostats
-    online_thermostat_count = db.session.query(db.func.count(Thermostat.id)).filter(Thermostat.is_online == True).scalar()
+    return _cached_response('system_status', _build_system_status)
+
+def _build_system_status():
+    # Count users with properties, properties, thermostats and online thermostats in one pass;
+    # every thermostat belongs to a property, so the outer join from properties sees them all
+    user_count, property_count, thermostat_count, online_thermostat_count = db.session.query(
+        db.func.count(db.distinct(Property.user_id)),
+        db.func.count(db.distinct(Property.id)),
+        db.func.count(Thermostat.id),
+        db.func.coalesce(db.func.sum(db.case((Thermostat.is_online.is_(True), 1), else_=0)), 0)
+    ).select_from(Property).outerjoin(Thermostat, Thermostat.property_id == Property.id).one()
     
-    # Count logs in last 24 hours
+    # Count all and error logs in the last 24 hours
     recent_time = datetime.utcnow() - timedelta(hours=24)
-    recent_log_count = db.session.query(db.func.count(ThermostatLog.id)).filter(ThermostatLog.created_at >= recent_time).scalar()
+    recent_log_count, recent_error_count = db.session.query(
+        db.func.count(ThermostatLog.id),
+        db.func.coalesce(db.func.sum(db.case((ThermostatLog.log_type == LogType.ERROR, 1), else_=0)), 0)
+    ).filter(ThermostatLog.created_at >= recent_time).one()
     
-    # Count error logs in last 24 hours
-    recent_error_count = db.session.query(db.func.count(ThermostatLog.id)).filter(
-        ThermostatLog.log_type == LogType.ERROR,
-        ThermostatLog.created_at >= recent_time
-    ).scalar()
-    
-    return jsonify({
+    return {
         'user_count': user_count,
         'property_count': property_count,
         'thermostat_count': thermostat_count,
@@ -198,5 +370,5 @@ def get_system_status():
         'recent_log_count': recent_log_count,
         'recent_error_count': recent_error_count,
         'error_percentage': (recent_error_count / recent_log_count * 100) if recent_log_count > 0 else 0,
-        'timestamp': datetime.utcnow().isoformat()
-    }), 200
+        'timestamp': datetime.utcnow()
+    }
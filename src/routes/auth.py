@@ -2,8 +2,14 @@ from flask import Blueprint, request, jsonify
 import jwt
 from datetime import datetime, timedelta
 from functools import wraps
+import hashlib
 import os
+import threading
+import time
+from sqlalchemy import event, inspect
+from sqlalchemy.orm import load_only, make_transient_to_detached
 
+from src.json_provider import conditional_json
 from src.models.user import User, UserRole
 from src.models.base import db
 
@@ -14,6 +20,82 @@ JWT_SECRET = os.getenv('JWT_SECRET', 'dev_jwt_secret_change_in_production')
 JWT_ALGORITHM = 'HS256'
 JWT_EXPIRATION_HOURS = 24
 
+# Largest page get_users will return
+USERS_MAX_PER_PAGE = 200
+
+# Seconds a verified token is trusted without decoding it or querying its user again
+TOKEN_CACHE_TTL = 60
+TOKEN_CACHE_MAXSIZE = 10000
+
+# Per-process cache: token digest -> (expires_at, user_id, user column values).
+# Entries are dropped by the ORM after_update/after_delete events below, and only in
+# the process that made the change; other workers keep theirs for up to TOKEN_CACHE_TTL.
+# Bulk Query.update()/delete() skips those events, so it is only picked up on expiry.
+_token_cache = {}
+
+# Per-process cache of signature-checked tokens: token digest -> (exp, user_id).
+# A token's signature never changes, so it stays valid until the token itself expires.
+_verified_tokens = {}
+
+# Guards every write to the two caches above; request threads share them
+_token_cache_lock = threading.Lock()
+
+def _cache_put(cache, key, entry):
+    """Store entry, first evicting the oldest entry if the cache is full"""
+    with _token_cache_lock:
+        if len(cache) >= TOKEN_CACHE_MAXSIZE:
+            cache.pop(next(iter(cache)), None)
+        cache[key] = entry
+
+def _cache_drop(cache, key):
+    with _token_cache_lock:
+        cache.pop(key, None)
+
+def _token_cache_key(token):
+    # Fixed-size digest so long tokens don't bloat the cache
+    return hashlib.blake2b(token.encode(), digest_size=16).digest()
+
+def _cached_token_user(key):
+    """Return the cached user for a token digest, attached to this request's session, or None"""
+    entry = _token_cache.get(key)
+    if entry is None:
+        return None
+    expires_at, user_id, values = entry
+    if expires_at <= time.time():
+        _cache_drop(_token_cache, key)
+        return None
+    user = User(**values)
+    make_transient_to_detached(user)
+    # load=False attaches the copy to the session without a SELECT
+    return db.session.merge(user, load=False)
+
+def _cache_token_user(key, user, token_exp):
+    values = {attr.key: getattr(user, attr.key) for attr in inspect(User).column_attrs}
+    _cache_put(_token_cache, key, (min(time.time() + TOKEN_CACHE_TTL, token_exp), user.id, values))
+
+def _verify_token(key, token):
+    """Return (exp, user_id) for a token, checking its signature only the first time it is seen"""
+    entry = _verified_tokens.get(key)
+    if entry is not None:
+        if entry[0] <= time.time():
+            _cache_drop(_verified_tokens, key)
+            raise jwt.ExpiredSignatureError('Signature has expired')
+        return entry
+    payload = jwt.decode(token, JWT_SECRET, algorithms=[JWT_ALGORITHM])
+    entry = (payload.get('exp', 0), payload['user_id'])
+    if 'exp' in payload:
+        _cache_put(_verified_tokens, key, entry)
+    return entry
+
+@event.listens_for(User, 'after_update')
+@event.listens_for(User, 'after_delete')
+def _forget_token_user(mapper, connection, target):
+    # Role, is_active or password changes must apply to the user's next request
+    with _token_cache_lock:
+        stale = [key for key, entry in _token_cache.items() if entry[1] == target.id]
+        for key in stale:
+            del _token_cache[key]
+
 # Authentication decorator
 def token_required(f):
     @wraps(f)
@@ -29,16 +111,23 @@ def token_required(f):
         if not token:
             return jsonify({'error': 'Token is missing'}), 401
         
+        cache_key = _token_cache_key(token)
+        current_user = _cached_token_user(cache_key)
+        if current_user is not None:
+            return f(current_user, *args, **kwargs)
+        
         try:
             # Decode token
-            payload = jwt.decode(token, JWT_SECRET, algorithms=[JWT_ALGORITHM])
-            current_user = User.query.get(payload['user_id'])
+            token_exp, user_id = _verify_token(cache_key, token)
+            current_user = User.query.get(user_id)
             
             if not current_user:
                 return jsonify({'error': 'User not found'}), 401
                 
             if not current_user.is_active:
                 return jsonify({'error': 'User account is inactive'}), 401
+            
+            _cache_token_user(cache_key, current_user, token_exp)
                 
         except jwt.ExpiredSignatureError:
             return jsonify({'error': 'Token has expired'}), 401
@@ -72,7 +161,7 @@ def register():
             return jsonify({'error': f'Missing required field: {field}'}), 400
     
     # Check if user already exists
-    if User.query.filter_by(email=data['email']).first():
+    if db.session.query(User.query.filter_by(email=data['email']).exists()).scalar():
         return jsonify({'error': 'User already exists'}), 409
     
     # Create new user
@@ -112,6 +201,11 @@ def login():
     if not user.is_active:
         return jsonify({'error': 'User account is inactive'}), 401
     
+    # Move older password hashes to the current scheme while we have the plaintext
+    if user.password_needs_rehash():
+        user.set_password(data['password'])
+        db.session.commit()
+    
     # Generate JWT token
     token_payload = {
         'user_id': user.id,
@@ -124,7 +218,7 @@ def login():
     return jsonify({
         'token': token,
         'user': user.to_dict(),
-        'expires_at': (datetime.utcnow() + timedelta(hours=JWT_EXPIRATION_HOURS)).isoformat()
+        'expires_at': datetime.utcnow() + timedelta(hours=JWT_EXPIRATION_HOURS)
     }), 200
 
 @auth_bp.route('/profile', methods=['GET'])
@@ -156,10 +250,40 @@ def update_profile(current_user):
 @token_required
 @role_required([UserRole.ADMIN])
 def get_users(current_user):
-    users = User.query.all()
-    return jsonify({
-        'users': [user.to_dict() for user in users]
-    }), 200
+    # Any user insert, update or delete changes the newest updated_at or the row count,
+    # so a poller whose listing is still current gets a 304 before the page is queried
+    last_updated, user_count = db.session.query(db.func.max(User.updated_at), db.func.count(User.id)).one()
+    etag = hashlib.blake2b(
+        f'{last_updated}:{user_count}:{request.query_string.decode()}'.encode(), digest_size=16
+    ).hexdigest()
+    if etag in request.if_none_match:
+        return conditional_json(b'', etag)
+    
+    # Reads ?page= and ?per_page= (default 20, at most 200); skip the password hash column
+    query = User.query.options(
+        load_only(User.id, User.email, User.first_name, User.last_name, User.role,
+                  User.is_active, User.created_at, User.updated_at)
+    )
+    
+    # Optional ?role= and ?active= filters, applied in SQL
+    role = request.args.get('role')
+    if role:
+        try:
+            query = query.filter(User.role == UserRole(role))
+        except ValueError:
+            return jsonify({'error': 'Invalid role'}), 400
+    active = request.args.get('active')
+    if active is not None:
+        query = query.filter(User.is_active.is_(active.lower() == 'true'))
+    
+    users = query.order_by(User.id).paginate(max_per_page=USERS_MAX_PER_PAGE, error_out=False)
+    body = jsonify({
+        'users': [user.to_dict() for user in users.items],
+        'page': users.page,
+        'pages': users.pages,
+        'total': users.total
+    }).get_data()
+    return conditional_json(body, etag)
 
 @auth_bp.route('/users/<int:user_id>', methods=['GET'])
 @token_required
@@ -5,6 +5,7 @@ from src.models.booking import Booking
 from src.models.property import Property
 from src.models.user import UserRole
 from src.models.base import db
+from sqlalchemy.orm import joinedload
 from datetime import datetime
 import requests
 import icalendar
@@ -126,10 +127,10 @@ def get_property_calendars(current_user, property_id):
 @token_required
 def get_calendar(current_user, calendar_id):
     """Get a specific calendar"""
-    calendar = Calendar.query.get_or_404(calendar_id)
+    calendar = Calendar.query.options(joinedload(Calendar.property)).get_or_404(calendar_id)
     
-    # Check if user has access to this calendar's property
-    property = Property.query.get(calendar.property_id)
+    # Check if user has access to this calendar's property (joined in above)
+    property = calendar.property
     if current_user.role != UserRole.ADMIN and property.user_id != current_user.id:
         return jsonify({'error': 'Access denied'}), 403
     
@@ -182,10 +183,10 @@ def create_calendar(current_user):
 @token_required
 def update_calendar(current_user, calendar_id):
     """Update a calendar"""
-    calendar = Calendar.query.get_or_404(calendar_id)
+    calendar = Calendar.query.options(joinedload(Calendar.property)).get_or_404(calendar_id)
     
-    # Check if user has access to this calendar's property
-    property = Property.query.get(calendar.property_id)
+    # Check if user has access to this calendar's property (joined in above)
+    property = calendar.property
     if current_user.role != UserRole.ADMIN and property.user_id != current_user.id:
         return jsonify({'error': 'Access denied'}), 403
     
@@ -222,10 +223,10 @@ def update_calendar(current_user, calendar_id):
 @token_required
 def delete_calendar(current_user, calendar_id):
     """Delete a calendar"""
-    calendar = Calendar.query.get_or_404(calendar_id)
+    calendar = Calendar.query.options(joinedload(Calendar.property)).get_or_404(calendar_id)
     
-    # Check if user has access to this calendar's property
-    property = Property.query.get(calendar.property_id)
+    # Check if user has access to this calendar's property (joined in above)
+    property = calendar.property
     if current_user.role != UserRole.ADMIN and property.user_id != current_user.id:
         return jsonify({'error': 'Access denied'}), 403
     
@@ -244,10 +245,10 @@ def delete_calendar(current_user, calendar_id):
 @token_required
 def sync_calendar(current_user, calendar_id):
     """Sync bookings from a calendar source"""
-    calendar = Calendar.query.get_or_404(calendar_id)
+    calendar = Calendar.query.options(joinedload(Calendar.property)).get_or_404(calendar_id)
     
-    # Check if user has access to this calendar's property
-    property = Property.query.get(calendar.property_id)
+    # Check if user has access to this calendar's property (joined in above)
+    property = calendar.property
     if current_user.role != UserRole.ADMIN and property.user_id != current_user.id:
         return jsonify({'error': 'Access denied'}), 403
     
@@ -263,23 +264,32 @@ def sync_calendar(current_user, calendar_id):
         # Sync bookings from the calendar source
         bookings_data = api.sync(start_date, end_date)
         
+        # Load the calendar's bookings once and match against them in memory,
+        # rather than running two lookups per synced booking
+        bookings = Booking.query.filter_by(calendar_id=calendar.id).order_by(Booking.id).all()
+        by_reference = {}
+        for booking in bookings:
+            if booking.booking_reference:
+                by_reference.setdefault(booking.booking_reference, []).append(booking)
+        
         # Process bookings
         new_bookings = []
         for booking_data in bookings_data:
             # Check if booking already exists (by reference or date range)
             existing_booking = None
             if 'booking_reference' in booking_data and booking_data['booking_reference']:
-                existing_booking = Booking.query.filter_by(
-                    calendar_id=calendar.id,
-                    booking_reference=booking_data['booking_reference']
-                ).first()
+                reference = booking_data['booking_reference']
+                existing_booking = next(
+                    (b for b in by_reference.get(reference, ()) if b.booking_reference == reference), None
+                )
             
             if not existing_booking:
                 # Check for overlapping bookings by date
-                existing_booking = Booking.query.filter_by(calendar_id=calendar.id).filter(
-                    Booking.check_in <= booking_data['check_out'],
-                    Booking.check_out >= booking_data['check_in']
-                ).first()
+                existing_booking = next(
+                    (b for b in bookings
+                     if b.check_in <= booking_data['check_out'] and b.check_out >= booking_data['check_in']),
+                    None
+                )
             
             if existing_booking:
                 # Update existing booking
@@ -288,9 +298,10 @@ def sync_calendar(current_user, calendar_id):
                 existing_booking.check_out = booking_data['check_out']
                 existing_booking.booking_reference = booking_data.get('booking_reference', existing_booking.booking_reference)
                 existing_booking.source = booking_data.get('source', existing_booking.source)
+                booking = existing_booking
             else:
                 # Create new booking
-                new_booking = Booking(
+                booking = Booking(
                     calendar_id=calendar.id,
                     guest_name=booking_data.get('guest_name'),
                     check_in=booking_data['check_in'],
@@ -298,8 +309,17 @@ def sync_calendar(current_user, calendar_id):
                     booking_reference=booking_data.get('booking_reference'),
                     source=booking_data.get('source')
                 )
-                db.session.add(new_booking)
-                new_bookings.append(new_booking)
+                bookings.append(booking)
+                new_bookings.append(booking)
+            
+            # Later entries in this sync can match the booking under its new reference
+            if booking.booking_reference:
+                matches = by_reference.setdefault(booking.booking_reference, [])
+                if booking not in matches:
+                    matches.append(booking)
+        
+        # Inserted together in one flush
+        db.session.add_all(new_bookings)
         
         # Commit changes
         db.session.commit()
@@ -319,10 +339,10 @@ def sync_calendar(current_user, calendar_id):
 @token_required
 def get_calendar_bookings(current_user, calendar_id):
     """Get all bookings for a specific calendar"""
-    calendar = Calendar.query.get_or_404(calendar_id)
+    calendar = Calendar.query.options(joinedload(Calendar.property)).get_or_404(calendar_id)
     
-    # Check if user has access to this calendar's property
-    property = Property.query.get(calendar.property_id)
+    # Check if user has access to this calendar's property (joined in above)
+    property = calendar.property
     if current_user.role != UserRole.ADMIN and property.user_id != current_user.id:
         return jsonify({'error': 'Access denied'}), 403
     
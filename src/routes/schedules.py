@@ -179,23 +179,13 @@ def delete_schedule(current_user, schedule_id):
 @token_required
 def get_upcoming_schedules(current_user):
     """Get upcoming schedule triggers for the user's thermostats"""
-    # Get all properties for the user
-    if current_user.role == UserRole.ADMIN:
-        properties = Property.query.all()
-    else:
-        properties = Property.query.filter_by(user_id=current_user.id).all()
-    
-    property_ids = [p.id for p in properties]
-    
-    # Get all thermostats for these properties
-    thermostats = Thermostat.query.filter(Thermostat.property_id.in_(property_ids)).all()
-    thermostat_ids = [t.id for t in thermostats]
-    
-    # Get all active schedules for these thermostats
-    schedules = Schedule.query.filter(
-        Schedule.thermostat_id.in_(thermostat_ids),
-        Schedule.is_active == True
-    ).all()
+    # Get all active schedules for the user's thermostats, scoped with subqueries in one statement
+    schedules = Schedule.query.filter(Schedule.is_active == True)
+    if current_user.role != UserRole.ADMIN:
+        property_ids = db.session.query(Property.id).filter(Property.user_id == current_user.id)
+        thermostat_ids = db.session.query(Thermostat.id).filter(Thermostat.property_id.in_(property_ids))
+        schedules = schedules.filter(Schedule.thermostat_id.in_(thermostat_ids))
+    schedules = schedules.all()
     
     # For manual schedules, filter to only include upcoming ones
     now = datetime.utcnow()
@@ -208,8 +198,8 @@ def get_upcoming_schedules(current_user):
                     'schedule': schedule.to_dict(),
                     'thermostat': Thermostat.query.get(schedule.thermostat_id).to_dict(),
                     'property': Property.query.get(Thermostat.query.get(schedule.thermostat_id).property_id).to_dict(),
-                    'trigger_time': schedule.start_time.isoformat() if schedule.start_time > now else 'In progress',
-                    'end_time': schedule.end_time.isoformat()
+                    'trigger_time': schedule.start_time if schedule.start_time > now else 'In progress',
+                    'end_time': schedule.end_time
                 })
         else:
             # For non-manual schedules, we'd need to calculate based on bookings
@@ -12,6 +12,7 @@ token refreshes, or diagnostic checks for the Cielo API.
 from flask import Blueprint, jsonify, request
 from src.routes.auth import token_required, role_required
 from src.models.user import UserRole
+from src.models.property import Property
 from src.models.vendor_account import VendorType, VendorAccount
 from src.models.base import db
 
@@ -43,7 +44,9 @@ def list_cielo_accounts(current_user):
     query = VendorAccount.query.filter_by(vendor=VendorType.CIELO)
     # Restrict non-admin users to accounts associated with their properties
     if current_user.role != UserRole.ADMIN:
-        query = query.filter(VendorAccount.property_id.in_([p.id for p in current_user.properties]))
+        query = query.filter(VendorAccount.property_id.in_(
+            db.session.query(Property.id).filter(Property.user_id == current_user.id)
+        ))
     accounts = query.all()
     return jsonify({"accounts": [a.to_dict() for a in accounts]}), 200
 
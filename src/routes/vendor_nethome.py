@@ -10,6 +10,7 @@ accounts.  Only administrators may create new vendor accounts.
 from flask import Blueprint, jsonify, request
 from src.routes.auth import token_required, role_required
 from src.models.user import UserRole
+from src.models.property import Property
 from src.models.vendor_account import VendorType, VendorAccount
 from src.models.base import db
 
@@ -29,7 +30,9 @@ def list_nethome_accounts(current_user):
     """List all NetHome vendor accounts visible to the current user."""
     query = VendorAccount.query.filter_by(vendor=VendorType.NETHOME)
     if current_user.role != UserRole.ADMIN:
-        query = query.filter(VendorAccount.property_id.in_([p.id for p in current_user.properties]))
+        query = query.filter(VendorAccount.property_id.in_(
+            db.session.query(Property.id).filter(Property.user_id == current_user.id)
+        ))
     accounts = query.all()
     return jsonify({"accounts": [a.to_dict() for a in accounts]}), 200
 
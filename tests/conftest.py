@@ -0,0 +1,11 @@
+import pytest
+
+@pytest.fixture(autouse=True)
+def clear_token_caches():
+    """Start every test without tokens or users cached by earlier tests"""
+    from src.routes.auth import _token_cache, _verified_tokens
+    _token_cache.clear()
+    _verified_tokens.clear()
+    yield
+    _token_cache.clear()
+    _verified_tokens.clear()
@@ -0,0 +1,203 @@
+import pytest
+import csv
+import io
+import os
+import time
+import jwt
+from datetime import datetime, timedelta
+from src.models.user import User, UserRole
+from src.models.property import Property
+from src.models.thermostat import Thermostat, ThermostatType
+from src.models.thermostat_log import ThermostatLog, LogType
+from src.routes.auth import JWT_SECRET, JWT_ALGORITHM
+
+@pytest.fixture
+def app():
+    from src.main import app as flask_app
+    flask_app.config['TESTING'] = True
+    flask_app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite:///:memory:'
+    
+    with flask_app.app_context():
+        from src.models.base import db
+        db.create_all()
+        yield flask_app
+        db.drop_all()
+
+@pytest.fixture
+def client(app):
+    return app.test_client()
+
+@pytest.fixture
+def db_session(app):
+    from src.models.base import db
+    with app.app_context():
+        yield db.session
+
+@pytest.fixture
+def admin_user(db_session):
+    """Create an admin user"""
+    user = User(
+        email='admin@example.com',
+        first_name='Admin',
+        last_name='User',
+        role=UserRole.ADMIN
+    )
+    user.set_password('admin123')
+    db_session.add(user)
+    db_session.commit()
+    return user
+
+@pytest.fixture
+def admin_headers(admin_user):
+    """Generate auth headers for the admin user"""
+    token_payload = {
+        'user_id': admin_user.id,
+        'email': admin_user.email,
+        'role': admin_user.role.value,
+        'exp': datetime.utcnow() + timedelta(hours=1)
+    }
+    token = jwt.encode(token_payload, JWT_SECRET, algorithm=JWT_ALGORITHM)
+    return {'Authorization': f'Bearer {token}'}
+
+@pytest.fixture
+def test_thermostat(db_session, admin_user):
+    """Create a thermostat in a test property"""
+    property = Property(
+        name='Test Property',
+        address='123 Main St',
+        city='Testville',
+        state='TS',
+        zip_code='12345',
+        country='Testland',
+        user_id=admin_user.id
+    )
+    db_session.add(property)
+    db_session.commit()
+    thermostat = Thermostat(
+        name='Living Room',
+        device_id='device-1',
+        type=ThermostatType.NEST,
+        property_id=property.id
+    )
+    db_session.add(thermostat)
+    db_session.commit()
+    return thermostat
+
+def test_export_logs_quotes_messages(client, db_session, admin_headers, test_thermostat):
+    """Test that commas, quotes and newlines in log messages survive the CSV export"""
+    message = 'Set to 72, said "hold"\nthen resumed'
+    db_session.add(ThermostatLog(thermostat_id=test_thermostat.id, log_type=LogType.INFO, message=message))
+    db_session.commit()
+    
+    response = client.get('/api/admin/logs/export', headers=admin_headers)
+    
+    assert response.status_code == 200
+    assert response.mimetype == 'text/csv'
+    rows = list(csv.reader(io.StringIO(response.get_data(as_text=True).lstrip('\ufeff'))))
+    assert rows[0] == ['id', 'thermostat_id', 'log_type', 'message', 'created_at']
+    assert len(rows) == 2
+    assert rows[1][3] == message
+    assert rows[1][2] == 'info'
+
+@pytest.mark.parametrize('limit', [0, -1, 1001])
+def test_get_all_logs_rejects_out_of_range_limit(client, admin_headers, limit):
+    """Test that limits outside 1..LOGS_MAX_LIMIT are rejected instead of crashing or reading every row"""
+    response = client.get(f'/api/admin/logs?limit={limit}', headers=admin_headers)
+    
+    assert response.status_code == 400
+    assert 'error' in response.get_json()
+
+def test_get_all_logs_cursor_pagination(client, db_session, admin_headers, test_thermostat):
+    """Test that next_cursor walks through every log and stops on the last page"""
+    db_session.add_all([
+        ThermostatLog(thermostat_id=test_thermostat.id, log_type=LogType.INFO, message=f'msg {i}')
+        for i in range(3)
+    ])
+    db_session.commit()
+    
+    first = client.get('/api/admin/logs?limit=2', headers=admin_headers).get_json()
+    assert first['count'] == 2
+    assert first['total_count'] == 3
+    second = client.get(f'/api/admin/logs?limit=2&cursor={first["next_cursor"]}', headers=admin_headers).get_json()
+    assert second['count'] == 1
+    assert second['total_count'] is None
+    assert second['next_cursor'] is None
+    assert {log['id'] for log in first['logs'] + second['logs']} == {1, 2, 3}
+
+class _DeferredExecutor:
+    """Stands in for the export thread pool; runs queued jobs only when told to"""
+    def __init__(self):
+        self.jobs = []
+    
+    def submit(self, fn, *args):
+        self.jobs.append((fn, args))
+    
+    def run_all(self):
+        for fn, args in self.jobs:
+            fn(*args)
+
+@pytest.fixture
+def deferred_exports(app, monkeypatch, tmp_path):
+    """Send every export through the background path, into a temporary instance folder"""
+    import src.routes.admin as admin_routes
+    executor = _DeferredExecutor()
+    monkeypatch.setattr(admin_routes, 'EXPORT_ASYNC_THRESHOLD', -1)
+    monkeypatch.setattr(admin_routes, '_export_executor', executor)
+    monkeypatch.setattr(app, 'instance_path', str(tmp_path))
+    return executor
+
+def test_export_logs_background_job(client, db_session, admin_headers, test_thermostat, deferred_exports):
+    """Test that a large export goes pending, then becomes downloadable"""
+    db_session.add(ThermostatLog(thermostat_id=test_thermostat.id, log_type=LogType.ERROR, message='Offline'))
+    db_session.commit()
+    
+    response = client.get('/api/admin/logs/export', headers=admin_headers)
+    assert response.status_code == 202
+    data = response.get_json()
+    assert data['status'] == 'pending'
+    status_url = data['status_url']
+    assert status_url == f"/api/admin/logs/export/{data['job_id']}"
+    
+    response = client.get(status_url, headers=admin_headers)
+    assert response.status_code == 202
+    assert response.get_json()['status'] == 'pending'
+    
+    deferred_exports.run_all()
+    
+    response = client.get(status_url, headers=admin_headers)
+    assert response.status_code == 200
+    assert response.mimetype == 'text/csv'
+    assert 'attachment' in response.headers['Content-Disposition']
+    rows = list(csv.reader(io.StringIO(response.get_data(as_text=True).lstrip('\ufeff'))))
+    response.close()
+    assert len(rows) == 2
+    assert rows[1][2:4] == ['error', 'Offline']
+
+def test_export_logs_lost_job_reports_failed(client, admin_headers, tmp_path, deferred_exports):
+    """Test that a job whose .part file went stale is reported as failed, not pending forever"""
+    import src.routes.admin as admin_routes
+    job_id = client.get('/api/admin/logs/export', headers=admin_headers).get_json()['job_id']
+    part = tmp_path / 'exports' / f'{job_id}.csv.part'
+    stale = time.time() - admin_routes.EXPORT_STALE_AFTER - 1
+    os.utime(part, (stale, stale))
+    
+    response = client.get(f'/api/admin/logs/export/{job_id}', headers=admin_headers)
+    
+    assert response.status_code == 500
+    assert response.get_json()['status'] == 'failed'
+
+def test_export_logs_prunes_old_exports(client, admin_headers, tmp_path, deferred_exports):
+    """Test that starting an export deletes finished exports past the retention window"""
+    import src.routes.admin as admin_routes
+    exports = tmp_path / 'exports'
+    exports.mkdir()
+    old_export, recent_export = exports / ('a' * 32 + '.csv'), exports / ('b' * 32 + '.csv')
+    old_export.write_text('id\n')
+    recent_export.write_text('id\n')
+    expired = time.time() - admin_routes.EXPORT_RETENTION - 1
+    os.utime(old_export, (expired, expired))
+    
+    assert client.get('/api/admin/logs/export', headers=admin_headers).status_code == 202
+    
+    assert not old_export.exists()
+    assert recent_export.exists()
@@ -163,6 +163,44 @@ def test_admin_get_users(client, admin_token, admin_user, test_user):
     assert 'users' in data
     assert len(data['users']) == 2  # admin_user and test_user
 
+def test_admin_get_users_paginated(client, admin_token, admin_user, test_user):
+    """Test admin paging through users"""
+    response = client.get('/api/auth/users?per_page=1&page=2', headers={
+        'Authorization': f'Bearer {admin_token}'
+    })
+    
+    assert response.status_code == 200
+    data = json.loads(response.data)
+    assert len(data['users']) == 1
+    assert data['users'][0]['email'] == test_user.email
+    assert data['page'] == 2
+    assert data['pages'] == 2
+    assert data['total'] == 2
+
+def test_admin_get_users_by_role(client, admin_token, admin_user, test_user):
+    """Test admin filtering users by role"""
+    response = client.get('/api/auth/users?role=admin&active=true', headers={
+        'Authorization': f'Bearer {admin_token}'
+    })
+    
+    assert response.status_code == 200
+    data = json.loads(response.data)
+    assert [user['email'] for user in data['users']] == [admin_user.email]
+
+def test_admin_get_users_not_modified(client, admin_token, admin_user, test_user):
+    """Test that a matching ETag gets a 304 until a user changes"""
+    headers = {'Authorization': f'Bearer {admin_token}'}
+    response = client.get('/api/auth/users', headers=headers)
+    etag = response.headers['ETag']
+    
+    response = client.get('/api/auth/users', headers={**headers, 'If-None-Match': etag})
+    assert response.status_code == 304
+    assert response.data == b''
+    
+    client.put(f'/api/auth/users/{test_user.id}', headers=headers, json={'first_name': 'Renamed'})
+    response = client.get('/api/auth/users', headers={**headers, 'If-None-Match': etag})
+    assert response.status_code == 200
+
 def test_non_admin_get_users(client, auth_token):
     """Test non-admin trying to get all users"""
     response = client.get('/api/auth/users', headers={
@@ -172,3 +210,63 @@ def test_non_admin_get_users(client, auth_token):
     assert response.status_code == 403
     data = json.loads(response.data)
     assert 'error' in data
+
+def test_deactivated_user_rejected_on_next_request(client, auth_token, admin_token, test_user):
+    """Test that deactivating a user takes effect although their token is cached"""
+    headers = {'Authorization': f'Bearer {auth_token}'}
+    assert client.get('/api/auth/profile', headers=headers).status_code == 200
+    
+    client.put(f'/api/auth/users/{test_user.id}', headers={
+        'Authorization': f'Bearer {admin_token}'
+    }, json={'is_active': False})
+    
+    response = client.get('/api/auth/profile', headers=headers)
+    assert response.status_code == 401
+
+def test_role_change_applies_on_next_request(client, auth_token, admin_token, test_user):
+    """Test that a promoted user is re-checked instead of served their cached role"""
+    headers = {'Authorization': f'Bearer {auth_token}'}
+    assert client.get('/api/auth/users', headers=headers).status_code == 403
+    
+    client.put(f'/api/auth/users/{test_user.id}', headers={
+        'Authorization': f'Bearer {admin_token}'
+    }, json={'role': 'admin'})
+    
+    assert client.get('/api/auth/users', headers=headers).status_code == 200
+
+def test_expired_token_cache_entry_reloads_user(client, db_session, auth_token, test_user):
+    """Test that once a cached user expires, the next request reads the database again"""
+    from src.routes import auth
+    headers = {'Authorization': f'Bearer {auth_token}'}
+    assert client.get('/api/auth/profile', headers=headers).status_code == 200
+    
+    # A bulk update skips the ORM events, so only expiry can refresh the cached user
+    User.query.filter_by(id=test_user.id).update({'is_active': False})
+    db_session.commit()
+    assert client.get('/api/auth/profile', headers=headers).status_code == 200
+    
+    for key, (expires_at, user_id, values) in list(auth._token_cache.items()):
+        auth._token_cache[key] = (0, user_id, values)
+    # Requests here share the test's session; drop its copies as a new request's session would
+    db_session.expire_all()
+    
+    response = client.get('/api/auth/profile', headers=headers)
+    assert response.status_code == 401
+    assert response.get_json()['error'] == 'User account is inactive'
+
+
+def test_token_cache_eviction_under_concurrent_requests(monkeypatch):
+    """Test that threads filling a full token cache evict without racing on the oldest entry"""
+    from concurrent.futures import ThreadPoolExecutor
+    from src.routes import auth
+    monkeypatch.setattr(auth, 'TOKEN_CACHE_MAXSIZE', 8)
+    
+    def fill(start):
+        for i in range(start, start + 500):
+            auth._cache_put(auth._verified_tokens, i, (0, i))
+            auth._cache_drop(auth._verified_tokens, i - 3)
+    
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        list(executor.map(fill, range(0, 8000, 500)))
+    
+    assert len(auth._verified_tokens) <= 8
@@ -0,0 +1,23 @@
+import pytest
+from src.factory import VendorIntegrationFactory, NestIntegration
+from src.models.vendor_account import VendorAccount, VendorType
+
+def test_get_integration_binds_each_call_to_its_account():
+    """Test that every call gets its own integration for the account passed in"""
+    first = VendorAccount(id=1, vendor=VendorType.NEST)
+    second = VendorAccount(id=1, vendor=VendorType.NEST)
+    
+    first_integration = VendorIntegrationFactory.get_integration(first)
+    second_integration = VendorIntegrationFactory.get_integration(second)
+    
+    assert isinstance(first_integration, NestIntegration)
+    assert first_integration is not second_integration
+    assert first_integration.account is first
+    assert second_integration.account is second
+    # The pooled HTTP session is the state they share
+    assert first_integration.session is second_integration.session
+
+def test_get_integration_unknown_vendor():
+    """Test that an account without a registered vendor is rejected"""
+    with pytest.raises(ValueError):
+        VendorIntegrationFactory.get_integration(VendorAccount(id=1, vendor=None))
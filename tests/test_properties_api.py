@@ -92,6 +92,16 @@ def test_get_property(client, auth_headers, test_property):
     assert data['property']['name'] == 'Test Property'
     assert data['property']['address'] == '123 Main St'
 
+def test_property_timestamps_are_iso_8601(client, auth_headers, test_property):
+    """Test that datetimes encoded by the orjson provider match isoformat()"""
+    response = client.get(f'/api/properties/{test_property.id}', headers=auth_headers)
+    
+    assert response.status_code == 200
+    assert response.mimetype == 'application/json'
+    data = json.loads(response.data)
+    assert data['property']['created_at'] == test_property.created_at.isoformat()
+    assert data['property']['updated_at'] == test_property.updated_at.isoformat()
+
 def test_create_property(client, auth_headers):
     """Test creating a new property"""
     response = client.post('/api/properties/', headers=auth_headers, json={
@@ -9,9 +9,23 @@ import requests
 import json
 import logging
 from django.conf import settings
+from requests.adapters import HTTPAdapter
 
 logger = logging.getLogger(__name__)
 
+# Keep-alive HTTPS session shared by the vendor adapters, so status reads
+# and later commands reuse open connections
+_SESSION = requests.Session()
+_SESSION.mount("https://", HTTPAdapter(pool_connections=4, pool_maxsize=20))
+
+# What get_status() reports when the device could not be read
+_UNAVAILABLE_STATUS = {
+    'temperature': None,
+    'humidity': None,
+    'mode': 'unknown',
+    'online': False
+}
+
 class ThermostatAdapter(abc.ABC):
     """Abstract base class for thermostat adapters."""
     
@@ -68,28 +82,60 @@ class ThermostatAdapter(abc.ABC):
 class NestThermostatAdapter(ThermostatAdapter):
     """Adapter for Google Nest thermostats using the Smart Device Management API."""
     
+    # Google's mode names to our standardized modes
+    _MODES = {
+        "HEAT": "heat",
+        "COOL": "cool",
+        "HEATCOOL": "auto",
+        "OFF": "off"
+    }
+    
     def __init__(self, device_id, api_key=None, api_token=None):
         self.device_id = device_id
         self.api_key = api_key or settings.NEST_API_KEY
         self.api_token = api_token or settings.NEST_API_TOKEN
         self.base_url = "https://smartdevicemanagement.googleapis.com/v1"
-        
-    def _get_headers(self):
-        return {
+        self._headers = {
             "Content-Type": "application/json",
             "Authorization": f"Bearer {self.api_token}"
         }
+        
+    def _get_headers(self):
+        return self._headers
     
     def _get_device_path(self):
         return f"enterprises/{self.api_key}/devices/{self.device_id}"
     
+    def _get_device(self):
+        """Fetch the device resource, which carries every trait the getters read"""
+        url = f"{self.base_url}/{self._get_device_path()}"
+        response = _SESSION.get(url, headers=self._get_headers())
+        response.raise_for_status()
+        return response.json()
+    
+    @staticmethod
+    def _trait(data, name):
+        return data.get("traits", {}).get(f"sdm.devices.traits.{name}", {})
+    
+    def _status_from(self, data):
+        return {
+            'temperature': self._trait(data, "Temperature").get("ambientTemperatureCelsius"),
+            'humidity': self._trait(data, "Humidity").get("ambientHumidityPercent"),
+            'mode': self._MODES.get(self._trait(data, "ThermostatMode").get("mode"), "unknown"),
+            'online': self._trait(data, "Connectivity").get("status") == "ONLINE"
+        }
+    
+    def get_status(self):
+        # One GET returns every trait, so read the device once
+        try:
+            return self._status_from(self._get_device())
+        except Exception as e:
+            logger.error(f"Error getting status from Nest thermostat: {e}")
+            return dict(_UNAVAILABLE_STATUS)
+    
     def get_temperature(self):
         try:
-            url = f"{self.base_url}/{self._get_device_path()}"
-            response = requests.get(url, headers=self._get_headers())
-            response.raise_for_status()
-            data = response.json()
-            return data.get("traits", {}).get("sdm.devices.traits.Temperature", {}).get("ambientTemperatureCelsius")
+            return self._status_from(self._get_device())['temperature']
         except Exception as e:
             logger.error(f"Error getting temperature from Nest thermostat: {e}")
             return None
@@ -103,7 +149,7 @@ class NestThermostatAdapter(ThermostatAdapter):
                     "heatCelsius": temperature
                 }
             }
-            response = requests.post(url, headers=self._get_headers(), json=payload)
+            response = _SESSION.post(url, headers=self._get_headers(), json=payload)
             response.raise_for_status()
             return True
         except Exception as e:
@@ -112,30 +158,14 @@ class NestThermostatAdapter(ThermostatAdapter):
     
     def get_humidity(self):
         try:
-            url = f"{self.base_url}/{self._get_device_path()}"
-            response = requests.get(url, headers=self._get_headers())
-            response.raise_for_status()
-            data = response.json()
-            return data.get("traits", {}).get("sdm.devices.traits.Humidity", {}).get("ambientHumidityPercent")
+            return self._status_from(self._get_device())['humidity']
         except Exception as e:
             logger.error(f"Error getting humidity from Nest thermostat: {e}")
             return None
     
     def get_mode(self):
         try:
-            url = f"{self.base_url}/{self._get_device_path()}"
-            response = requests.get(url, headers=self._get_headers())
-            response.raise_for_status()
-            data = response.json()
-            mode = data.get("traits", {}).get("sdm.devices.traits.ThermostatMode", {}).get("mode")
-            # Convert Google's mode names to our standardized modes
-            mode_mapping = {
-                "HEAT": "heat",
-                "COOL": "cool",
-                "HEATCOOL": "auto",
-                "OFF": "off"
-            }
-            return mode_mapping.get(mode, "unknown")
+            return self._status_from(self._get_device())['mode']
         except Exception as e:
             logger.error(f"Error getting mode from Nest thermostat: {e}")
             return "unknown"
@@ -158,7 +188,7 @@ class NestThermostatAdapter(ThermostatAdapter):
                     "mode": google_mode
                 }
             }
-            response = requests.post(url, headers=self._get_headers(), json=payload)
+            response = _SESSION.post(url, headers=self._get_headers(), json=payload)
             response.raise_for_status()
             return True
         except Exception as e:
@@ -167,11 +197,7 @@ class NestThermostatAdapter(ThermostatAdapter):
     
     def is_online(self):
         try:
-            url = f"{self.base_url}/{self._get_device_path()}"
-            response = requests.get(url, headers=self._get_headers())
-            response.raise_for_status()
-            data = response.json()
-            return data.get("traits", {}).get("sdm.devices.traits.Connectivity", {}).get("status") == "ONLINE"
+            return self._status_from(self._get_device())['online']
         except Exception as e:
             logger.error(f"Error checking online status for Nest thermostat: {e}")
             return False
@@ -180,6 +206,14 @@ class NestThermostatAdapter(ThermostatAdapter):
 class CieloThermostatAdapter(ThermostatAdapter):
     """Adapter for Cielo thermostats using IFTTT webhooks and direct API when available."""
     
+    # Cielo's mode names to our standardized modes
+    _MODES = {
+        "heat": "heat",
+        "cool": "cool",
+        "auto": "auto",
+        "off": "off"
+    }
+    
     def __init__(self, device_id, api_key=None, api_token=None, ifttt_key=None):
         self.device_id = device_id
         self.api_key = api_key
@@ -195,6 +229,31 @@ class CieloThermostatAdapter(ThermostatAdapter):
             "Authorization": f"Bearer {self.api_token}"
         }
     
+    def _get_device(self):
+        """Fetch the device resource from the direct API"""
+        url = f"{self.direct_api_base_url}/devices/{self.device_id}"
+        response = requests.get(url, headers=self._get_direct_api_headers())
+        response.raise_for_status()
+        return response.json()
+    
+    def _status_from(self, data):
+        return {
+            'temperature': data.get("temperature"),
+            'humidity': data.get("humidity"),
+            'mode': self._MODES.get(data.get("mode"), "unknown"),
+            'online': data.get("online", False)
+        }
+    
+    def get_status(self):
+        if not self.use_direct_api:
+            return super().get_status()
+        # One GET returns every field, so read the device once
+        try:
+            return self._status_from(self._get_device())
+        except Exception as e:
+            logger.error(f"Error getting status from Cielo thermostat: {e}")
+            return dict(_UNAVAILABLE_STATUS)
+    
     def _trigger_ifttt_webhook(self, event, value1=None, value2=None, value3=None):
         try:
             url = f"{self.ifttt_base_url}/{event}/with/key/{self.ifttt_key}"
@@ -216,11 +275,7 @@ class CieloThermostatAdapter(ThermostatAdapter):
     def get_temperature(self):
         if self.use_direct_api:
             try:
-                url = f"{self.direct_api_base_url}/devices/{self.device_id}"
-                response = requests.get(url, headers=self._get_direct_api_headers())
-                response.raise_for_status()
-                data = response.json()
-                return data.get("temperature")
+                return self._status_from(self._get_device())['temperature']
             except Exception as e:
                 logger.error(f"Error getting temperature from Cielo thermostat: {e}")
                 return None
@@ -257,11 +312,7 @@ class CieloThermostatAdapter(ThermostatAdapter):
     def get_humidity(self):
         if self.use_direct_api:
             try:
-                url = f"{self.direct_api_base_url}/devices/{self.device_id}"
-                response = requests.get(url, headers=self._get_direct_api_headers())
-                response.raise_for_status()
-                data = response.json()
-                return data.get("humidity")
+                return self._status_from(self._get_device())['humidity']
             except Exception as e:
                 logger.error(f"Error getting humidity from Cielo thermostat: {e}")
                 return None
@@ -279,19 +330,7 @@ class CieloThermostatAdapter(ThermostatAdapter):
     def get_mode(self):
         if self.use_direct_api:
             try:
-                url = f"{self.direct_api_base_url}/devices/{self.device_id}"
-                response = requests.get(url, headers=self._get_direct_api_headers())
-                response.raise_for_status()
-                data = response.json()
-                mode = data.get("mode")
-                # Convert Cielo's mode names to our standardized modes
-                mode_mapping = {
-                    "heat": "heat",
-                    "cool": "cool",
-                    "auto": "auto",
-                    "off": "off"
-                }
-                return mode_mapping.get(mode, "unknown")
+                return self._status_from(self._get_device())['mode']
             except Exception as e:
                 logger.error(f"Error getting mode from Cielo thermostat: {e}")
                 return "unknown"
@@ -328,11 +367,7 @@ class CieloThermostatAdapter(ThermostatAdapter):
     def is_online(self):
         if self.use_direct_api:
             try:
-                url = f"{self.direct_api_base_url}/devices/{self.device_id}"
-                response = requests.get(url, headers=self._get_direct_api_headers())
-                response.raise_for_status()
-                data = response.json()
-                return data.get("online", False)
+                return self._status_from(self._get_device())['online']
             except Exception as e:
                 logger.error(f"Error checking online status for Cielo thermostat: {e}")
                 return False
@@ -351,26 +386,56 @@ class CieloThermostatAdapter(ThermostatAdapter):
 class PioneerThermostatAdapter(ThermostatAdapter):
     """Adapter for Pioneer thermostats."""
     
+    # Pioneer's mode names to our standardized modes
+    _MODES = {
+        "heat": "heat",
+        "cool": "cool",
+        "auto": "auto",
+        "off": "off",
+        "dry": "dry",
+        "fan": "fan"
+    }
+    
     def __init__(self, device_id, api_key=None, api_token=None):
         self.device_id = device_id
         self.api_key = api_key or settings.PIONEER_API_KEY
         self.api_token = api_token or settings.PIONEER_API_TOKEN
         self.base_url = "https://api.pioneerminisplit.com/v1"
-        
-    def _get_headers(self):
-        return {
+        self._headers = {
             "Content-Type": "application/json",
             "Authorization": f"Bearer {self.api_token}",
             "X-API-Key": self.api_key
         }
+        
+    def _get_headers(self):
+        return self._headers
+    
+    def _get_device(self):
+        """Fetch the device resource, which carries every field the getters read"""
+        url = f"{self.base_url}/devices/{self.device_id}"
+        response = _SESSION.get(url, headers=self._get_headers())
+        response.raise_for_status()
+        return response.json()
+    
+    def _status_from(self, data):
+        return {
+            'temperature': data.get("current_temperature"),
+            'humidity': data.get("humidity"),
+            'mode': self._MODES.get(data.get("mode"), "unknown"),
+            'online': data.get("online", True)  # Default to True if not specified
+        }
+    
+    def get_status(self):
+        # One GET returns every field, so read the device once
+        try:
+            return self._status_from(self._get_device())
+        except Exception as e:
+            logger.error(f"Error getting status from Pioneer thermostat: {e}")
+            return dict(_UNAVAILABLE_STATUS)
     
     def get_temperature(self):
         try:
-            url = f"{self.base_url}/devices/{self.device_id}"
-            response = requests.get(url, headers=self._get_headers())
-            response.raise_for_status()
-            data = response.json()
-            return data.get("current_temperature")
+            return self._status_from(self._get_device())['temperature']
         except Exception as e:
             logger.error(f"Error getting temperature from Pioneer thermostat: {e}")
             return None
@@ -379,7 +444,7 @@ class PioneerThermostatAdapter(ThermostatAdapter):
         try:
             url = f"{self.base_url}/devices/{self.device_id}/temperature"
             payload = {"temperature": temperature}
-            response = requests.post(url, headers=self._get_headers(), json=payload)
+            response = _SESSION.post(url, headers=self._get_headers(), json=payload)
             response.raise_for_status()
             return True
         except Exception as e:
@@ -388,32 +453,14 @@ class PioneerThermostatAdapter(ThermostatAdapter):
     
     def get_humidity(self):
         try:
-            url = f"{self.base_url}/devices/{self.device_id}"
-            response = requests.get(url, headers=self._get_headers())
-            response.raise_for_status()
-            data = response.json()
-            return data.get("humidity")
+            return self._status_from(self._get_device())['humidity']
         except Exception as e:
             logger.error(f"Error getting humidity from Pioneer thermostat: {e}")
             return None
     
     def get_mode(self):
         try:
-            url = f"{self.base_url}/devices/{self.device_id}"
-            response = requests.get(url, headers=self._get_headers())
-            response.raise_for_status()
-            data = response.json()
-            mode = data.get("mode")
-            # Convert Pioneer's mode names to our standardized modes
-            mode_mapping = {
-                "heat": "heat",
-                "cool": "cool",
-                "auto": "auto",
-                "off": "off",
-                "dry": "dry",
-                "fan": "fan"
-            }
-            return mode_mapping.get(mode, "unknown")
+            return self._status_from(self._get_device())['mode']
         except Exception as e:
             logger.error(f"Error getting mode from Pioneer thermostat: {e}")
             return "unknown"
@@ -422,7 +469,7 @@ class PioneerThermostatAdapter(ThermostatAdapter):
         try:
             url = f"{self.base_url}/devices/{self.device_id}/mode"
             payload = {"mode": mode}
-            response = requests.post(url, headers=self._get_headers(), json=payload)
+            response = _SESSION.post(url, headers=self._get_headers(), json=payload)
             response.raise_for_status()
             return True
         except Exception as e:
@@ -431,11 +478,7 @@ class PioneerThermostatAdapter(ThermostatAdapter):
     
     def is_online(self):
         try:
-            url = f"{self.base_url}/devices/{self.device_id}"
-            response = requests.get(url, headers=self._get_headers())
-            response.raise_for_status()
-            data = response.json()
-            return data.get("online", True)  # Default to True if not specified
+            return self._status_from(self._get_device())['online']
         except Exception as e:
             logger.error(f"Error checking online status for Pioneer thermostat: {e}")
             return False